@@ -21,6 +21,80 @@ class RagConfig:
     chunk_size: int = 900
     chunk_overlap: int = 150
     top_k: int = 5
+    ingest_workers: int = 0  # 0 = one process per core
+    ingest_min_sources: int = 32
+    export_json: bool = False  # also write the legacy rag_index.json for debugging
+    ann_min_chunks: int = 50_000  # build an IVF index from this many chunks
+    ann_nprobe: int = 8
+    hybrid: bool = True  # fuse BM25 with vector rankings when a BM25 index exists
+    rrf_k: int = 60
+    quantization: str = ""  # "int8" or "pq": shortlist from compressed codes, re-rank exactly
+    pq_subspaces: int = 0  # 0 = dimensions // 4
+    rerank_factor: int = 4
+
+
+@dataclass(frozen=True)
+class ResearchConfig:
+    """Source gathering limits for the research node."""
+
+    fetch_concurrency: int = 8
+    per_host_concurrency: int = 2
+    dedupe: bool = True
+    dedupe_threshold: float = 0.9
+    dedupe_min_words: int = 30
+    pipeline_queue: int = 4
+
+
+@dataclass(frozen=True)
+class ScrapeConfig:
+    """Download bounds and extraction mode for page scraping."""
+
+    max_bytes: int = 2 * 1024 * 1024
+    chunk_bytes: int = 16 * 1024
+    streaming: bool = True
+    engine: str = "auto"
+
+
+@dataclass(frozen=True)
+class SearchConfig:
+    """Hedging behaviour for multi-backend search."""
+
+    hedge: bool = True
+    hedge_delay: float = 0.8
+    adaptive_hedge: bool = True
+    min_hedge_delay: float = 0.05
+    max_hedge_delay: float = 3.0
+    merge_hedged: bool = False
+
+
+@dataclass(frozen=True)
+class CacheConfig:
+    """Lifetimes and budgets for the persistent caches."""
+
+    scrape_enabled: bool = True
+    scrape_ttl: float = 7 * 24 * 3600.0
+    scrape_max_bytes: int = 256 * 1024 * 1024
+    negative_ttl: float = 15 * 60.0
+    search_enabled: bool = True
+    search_ttl: float = 24 * 3600.0
+    search_stale_ttl: float = 30 * 24 * 3600.0
+    stale_while_revalidate: bool = True
+    embedding_enabled: bool = True
+    embedding_max_bytes: int = 256 * 1024 * 1024
+    chunk_store_enabled: bool = True  # share chunked sources across sessions
+
+
+@dataclass(frozen=True)
+class MemoryConfig:
+    """Semantic memory embedding, deduplication, retention budgets and event logging."""
+
+    embedding_dimensions: int = 256
+    dedupe_threshold: float = 0.9  # cosine at or above which a memory is merged, not appended
+    max_items: int = 2000  # committed memories kept per type; 0 = unbounded
+    max_bytes: int = 0  # content bytes kept per type; 0 = unbounded
+    type_budgets: tuple[tuple[str, int, int], ...] = (("preference", 200, 0),)  # (type, max_items, max_bytes)
+    half_life_days: float = 30.0  # a memory's retention score halves after this long without a commit
+    event_buffer: int = 0  # episodic events held before a batched write; 0 = write each record
 
 
 @dataclass(frozen=True)
@@ -38,6 +112,11 @@ class Settings:
 
     models: ModelConfig = ModelConfig()
     rag: RagConfig = RagConfig()
+    research: ResearchConfig = ResearchConfig()
+    scrape: ScrapeConfig = ScrapeConfig()
+    search: SearchConfig = SearchConfig()
+    cache: CacheConfig = CacheConfig()
+    memory: MemoryConfig = MemoryConfig()
     planning: PlanningConfig = PlanningConfig()
 
 
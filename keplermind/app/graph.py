@@ -17,9 +17,10 @@ NodeCallable = Callable[[S], S]
 class KeplerMindGraph:
     """A lightweight façade mimicking the future LangGraph orchestration."""
 
-    def __init__(self, *, console: Console | None = None, max_repairs: int = 1) -> None:
+    def __init__(self, *, console: Console | None = None, max_repairs: int = 1, pipelined: bool = False) -> None:
         self.console = console or Console()
         self.max_repairs = max_repairs
+        self.pipelined = pipelined
         self.node_order = [
             "intake",
             "research",
@@ -49,7 +50,11 @@ class KeplerMindGraph:
 
         self.registry: Dict[str, NodeCallable] = {
             "intake": lambda state: nodes.intake.run(state, console=self.console),
-            "research": lambda state: nodes.research.run(state, console=self.console),
+            "research": lambda state: (
+                nodes.pipeline.run(state, console=self.console)
+                if self.pipelined
+                else nodes.research.run(state, console=self.console)
+            ),
             "build_rag": lambda state: nodes.build_rag.run(state, console=self.console),
             "planner": lambda state: nodes.planner.run(state, console=self.console),
             "ask_and_score": lambda state: nodes.ask_and_score.run(state, console=self.console),
@@ -92,6 +97,10 @@ class KeplerMindGraph:
         state: S = dict(initial_state or {})
 
         for name in self.node_order:
+            if name == "build_rag" and self.pipelined:
+                # The pipelined research stage already built the index.
+                continue
+
             if name == "ask_and_score":
                 state = self._invoke(name, state)
 
@@ -124,7 +133,9 @@ class KeplerMindGraph:
         return state
 
 
-def build_graph(*, console: Console | None = None, max_repairs: int = 1) -> KeplerMindGraph:
+def build_graph(
+    *, console: Console | None = None, max_repairs: int = 1, pipelined: bool = False
+) -> KeplerMindGraph:
     """Factory helper used by the CLI entrypoint."""
 
-    return KeplerMindGraph(console=console, max_repairs=max_repairs)
+    return KeplerMindGraph(console=console, max_repairs=max_repairs, pipelined=pipelined)
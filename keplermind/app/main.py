@@ -9,8 +9,10 @@ from typing import Any
 from rich.console import Console
 from rich.table import Table
 
+from .config.settings import settings
 from .graph import build_graph
 from .state import S
+from .tools.search_cache import default_search_cache
 
 LOGO = " ☉  KeplerMind — Discover · Reflect · Illuminate"
 
@@ -23,6 +25,11 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--time", type=int, default=300, help="Time budget in seconds.")
     parser.add_argument("--style", type=str, default="", help="Preferred explanation style.")
     parser.add_argument("--max-repairs", type=int, default=1, help="Maximum allowed reflection repairs.")
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Overlap research fetching with RAG chunking/embedding.",
+    )
     parser.add_argument("--quiet", action="store_true", help="Suppress most console output.")
     parser.add_argument("--debug", action="store_true", help="Enable verbose logging.")
     return parser
@@ -97,7 +104,7 @@ def main(argv: list[str] | None = None) -> S:
         _print_logo(console)
 
     backends = _detect_backends(console)
-    graph = build_graph(console=console, max_repairs=max(args.max_repairs, 0))
+    graph = build_graph(console=console, max_repairs=max(args.max_repairs, 0), pipelined=args.pipeline)
     if not args.quiet:
         graph.print_dag_summary()
 
@@ -115,6 +122,8 @@ def main(argv: list[str] | None = None) -> S:
     if not args.quiet:
         console.print(_summary_table(final_state))
         _print_artifacts(console, final_state.get("artifacts", {}))
+        if settings.cache.search_enabled:
+            console.log(f"Search cache: {default_search_cache().stats.summary()}")
 
     return final_state
 
@@ -3,10 +3,15 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any, Iterable
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Iterable
 
 from . import policies
-from .stores import EpisodicLog, PreferenceStore, SemanticStore
+from .retention import RetentionEngine
+from .stores import EpisodicLog, PersistentSemanticStore, PreferenceStore, SemanticStore
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from ..tools.retrieve import Retriever
 
 
 @dataclass
@@ -14,8 +19,9 @@ class MemoryController:
     """High-level interface encapsulating memory flows."""
 
     episodic_log: EpisodicLog
-    semantic_store: SemanticStore
+    semantic_store: SemanticStore | PersistentSemanticStore
     preference_store: PreferenceStore
+    retention: RetentionEngine | None = None
     pending: list[policies.MemoryCandidate] = field(default_factory=list)
 
     def propose(self, candidates: Iterable[dict[str, Any]]) -> None:
@@ -31,40 +37,99 @@ class MemoryController:
         return list(self.pending)
 
     def commit(self, session_id: str) -> list[str]:
-        """Persist the reviewed candidates and emit episodic events."""
+        """Persist the reviewed candidates and emit episodic events.
+
+        Semantic candidates are written with one bulk ``add_many`` call and
+        every episodic event of the commit with one ``record_many``. With a
+        :class:`RetentionEngine`, every commit is tracked and memories pushed
+        out of their type's budget are deleted and logged as ``evict`` events.
+        """
+
+        documents = [candidate for candidate in self.pending if candidate.type != "preference"]
+        doc_ids = iter(
+            self.semantic_store.add_many(
+                (candidate.content, {"type": candidate.type, **candidate.metadata}) for candidate in documents
+            )
+        )
 
         committed_ids: list[str] = []
+        events: list[tuple[str, str, dict[str, Any]]] = []
         for candidate in self.pending:
             if candidate.type == "preference":
                 key = candidate.metadata.get("key", f"pref_{len(self.preference_store.as_dict()) + 1}")
                 self.preference_store.set(key, candidate.content)
                 committed_ids.append(f"pref:{key}")
             else:
-                doc_id = self.semantic_store.add(candidate.content, metadata={"type": candidate.type, **candidate.metadata})
-                committed_ids.append(doc_id)
-
-            self.episodic_log.record(
-                session=session_id,
-                phase="memorize",
-                payload={
-                    "type": candidate.type,
-                    "score": candidate.score(),
-                    "metadata": candidate.metadata,
-                },
+                committed_ids.append(next(doc_ids))
+
+            events.append(
+                (
+                    session_id,
+                    "memorize",
+                    {"type": candidate.type, "score": candidate.score(), "metadata": candidate.metadata},
+                )
             )
 
+        if self.retention is not None:
+            self.retention.track(
+                (memory_id, candidate.type, candidate.score(), len(candidate.content.encode("utf-8")))
+                for memory_id, candidate in zip(committed_ids, self.pending)
+            )
+            events.extend(self._evict(session_id))
+
+        self.episodic_log.record_many(events)
         self.pending.clear()
         return committed_ids
 
-    def retrieve(self, *, limit: int = 5, query: str | None = None) -> list[dict[str, Any]]:
-        """Fetch memories for downstream use."""
+    def _evict(self, session_id: str) -> list[tuple[str, str, dict[str, Any]]]:
+        assert self.retention is not None
+        evictions = self.retention.evict()
+        preferences = [eviction.key.removeprefix("pref:") for eviction in evictions if eviction.key.startswith("pref:")]
+        documents = [eviction.key for eviction in evictions if not eviction.key.startswith("pref:")]
+        if preferences:
+            self.preference_store.delete(preferences)
+        if documents:
+            self.semantic_store.delete_many(documents)
+        return [
+            (
+                session_id,
+                "evict",
+                {"id": eviction.key, "type": eviction.type, "score": eviction.score, "reason": eviction.reason},
+            )
+            for eviction in evictions
+        ]
+
+    def retrieve(
+        self, *, limit: int = 5, query: str | None = None, retriever: Retriever | None = None
+    ) -> list[dict[str, Any]]:
+        """Fetch memories for downstream use.
+
+        A *query* is ranked against the memory embeddings with one
+        matrix-vector product. With a *retriever* as well, slots the semantic
+        store leaves unfilled are topped up with the closest RAG chunks.
+        """
 
         if query:
-            documents = self.semantic_store.similarity_search(query, top_k=limit)
+            documents = self.semantic_store.vector_search(query, top_k=limit)
         else:
-            documents = list(self.semantic_store.all())[:limit]
+            documents = list(islice(self.semantic_store.all(), limit))
 
-        return [
-            {"id": document.doc_id, "content": document.content, "metadata": document.metadata}
+        results = [
+            {"id": document.doc_id, "content": document.content, "metadata": document.metadata, "count": document.count}
             for document in documents
         ]
+        if query and retriever is not None and len(results) < limit:
+            for hit in retriever.search(query, top_k=limit - len(results)):
+                results.append(
+                    {
+                        "id": str(hit.chunk.get("id", hit.row)),
+                        "content": str(hit.chunk.get("text", "")),
+                        "metadata": {
+                            "type": "rag",
+                            "source": hit.chunk.get("source", ""),
+                            "title": hit.chunk.get("title", ""),
+                            "score": hit.score,
+                        },
+                    }
+                )
+        return results
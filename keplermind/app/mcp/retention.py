@@ -0,0 +1,279 @@
+"""Capacity-bounded retention of committed memories."""
+
+from __future__ import annotations
+
+import math
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Mapping
+
+from ..config.settings import settings
+from .stores import DEFAULT_MEMORY_DIR
+
+_LN2 = math.log(2.0)
+_MIN_SCORE = 1e-6
+
+
+@dataclass(frozen=True)
+class Budget:
+    """Limits for one memory type; ``0`` leaves a dimension unbounded."""
+
+    max_items: int = 0
+    max_bytes: int = 0
+
+    def exceeded(self, items: int, size: int) -> str | None:
+        """Name the limit that *items* entries totalling *size* bytes break, if any."""
+
+        if self.max_items and items > self.max_items:
+            return "items"
+        if self.max_bytes and size > self.max_bytes:
+            return "bytes"
+        return None
+
+
+@dataclass
+class Retained:
+    """Bookkeeping for one committed memory."""
+
+    key: str
+    type: str
+    score: float
+    size: int
+    touched: float
+
+    def decayed_score(self, now: float, half_life: float) -> float:
+        """Policy score halved for every *half_life* seconds since the last commit."""
+
+        return self.score * 0.5 ** (max(0.0, now - self.touched) / half_life)
+
+    def priority(self, half_life: float) -> float:
+        """Heap key ordering entries exactly as :meth:`decayed_score` does at any time.
+
+        ``log(score * 2 ** -((now - touched) / h))`` is this value minus
+        ``now * ln 2 / h``, a shift shared by every entry, so keys never have
+        to be refreshed as time passes.
+        """
+
+        return math.log(max(self.score, _MIN_SCORE)) + self.touched * _LN2 / half_life
+
+
+@dataclass(frozen=True)
+class Eviction:
+    """A memory dropped to bring its type back within budget."""
+
+    key: str
+    type: str
+    score: float
+    reason: str
+
+
+class IndexedHeap:
+    """Binary min-heap of string keys with a position index.
+
+    The index makes :meth:`set` (insert or re-prioritise) and :meth:`remove`
+    ``O(log n)`` for an arbitrary key, which :mod:`heapq` cannot do.
+    """
+
+    def __init__(self) -> None:
+        self._keys: list[str] = []
+        self._priorities: list[float] = []
+        self._positions: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._positions
+
+    def peek(self) -> tuple[str, float]:
+        return self._keys[0], self._priorities[0]
+
+    def set(self, key: str, priority: float) -> None:
+        position = self._positions.get(key)
+        if position is None:
+            self._keys.append(key)
+            self._priorities.append(priority)
+            self._positions[key] = len(self._keys) - 1
+            self._sift_up(len(self._keys) - 1)
+            return
+        previous = self._priorities[position]
+        self._priorities[position] = priority
+        if priority < previous:
+            self._sift_up(position)
+        else:
+            self._sift_down(position)
+
+    def pop(self) -> tuple[str, float]:
+        key, priority = self.peek()
+        self.remove(key)
+        return key, priority
+
+    def remove(self, key: str) -> None:
+        position = self._positions.pop(key)
+        last = len(self._keys) - 1
+        if position != last:
+            self._keys[position] = self._keys[last]
+            self._priorities[position] = self._priorities[last]
+            self._positions[self._keys[position]] = position
+        self._keys.pop()
+        self._priorities.pop()
+        if position < len(self._keys):
+            self._sift_up(position)
+            self._sift_down(position)
+
+    def _swap(self, first: int, second: int) -> None:
+        keys, priorities = self._keys, self._priorities
+        keys[first], keys[second] = keys[second], keys[first]
+        priorities[first], priorities[second] = priorities[second], priorities[first]
+        self._positions[keys[first]] = first
+        self._positions[keys[second]] = second
+
+    def _sift_up(self, position: int) -> None:
+        while position:
+            parent = (position - 1) // 2
+            if self._priorities[position] >= self._priorities[parent]:
+                return
+            self._swap(position, parent)
+            position = parent
+
+    def _sift_down(self, position: int) -> None:
+        count = len(self._keys)
+        while True:
+            smallest = position
+            for child in (2 * position + 1, 2 * position + 2):
+                if child < count and self._priorities[child] < self._priorities[smallest]:
+                    smallest = child
+            if smallest == position:
+                return
+            self._swap(position, smallest)
+            position = smallest
+
+
+def default_budgets() -> dict[str, Budget]:
+    return {memory_type: Budget(items, size) for memory_type, items, size in settings.memory.type_budgets}
+
+
+class RetentionEngine:
+    """Keeps each memory type within its :class:`Budget`.
+
+    Every committed memory is tracked with its policy score
+    (:func:`~keplermind.app.mcp.policies.score_candidate`), its size in
+    bytes and the time it was last committed. The score decays with a
+    half-life, so memories that are never committed again lose out to fresh
+    ones. One :class:`IndexedHeap` per type orders the entries, making each
+    eviction ``O(log n)``. Entries persist in a small SQLite table so budgets
+    hold across sessions; the table is opened on first use.
+    """
+
+    def __init__(
+        self,
+        db_path: Path | str | None = None,
+        *,
+        budgets: Mapping[str, Budget] | None = None,
+        default_budget: Budget | None = None,
+        half_life: float | None = None,
+    ) -> None:
+        self.db_path = Path(db_path) if db_path else DEFAULT_MEMORY_DIR / "retention.sqlite"
+        self.budgets = dict(default_budgets() if budgets is None else budgets)
+        self.default_budget = default_budget or Budget(settings.memory.max_items, settings.memory.max_bytes)
+        self.half_life = half_life or settings.memory.half_life_days * 24 * 3600.0
+        self._conn: sqlite3.Connection | None = None
+        self._entries: dict[str, Retained] = {}
+        self._heaps: dict[str, IndexedHeap] = {}
+        self._sizes: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        self._connection()
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        self._connection()
+        return key in self._entries
+
+    def budget(self, memory_type: str) -> Budget:
+        return self.budgets.get(memory_type, self.default_budget)
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path)
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS retention (
+                    key TEXT PRIMARY KEY,
+                    type TEXT NOT NULL,
+                    score REAL NOT NULL,
+                    size INTEGER NOT NULL,
+                    touched REAL NOT NULL
+                )
+                """
+            )
+            self._conn.commit()
+            for row in self._conn.execute("SELECT key, type, score, size, touched FROM retention"):
+                self._insert(Retained(*row))
+        return self._conn
+
+    def _insert(self, entry: Retained) -> None:
+        previous = self._entries.get(entry.key)
+        if previous is not None and previous.type != entry.type:
+            self._discard(previous)
+            previous = None
+        self._entries[entry.key] = entry
+        self._sizes[entry.type] = self._sizes.get(entry.type, 0) + entry.size - (previous.size if previous else 0)
+        self._heaps.setdefault(entry.type, IndexedHeap()).set(entry.key, entry.priority(self.half_life))
+
+    def _discard(self, entry: Retained) -> None:
+        del self._entries[entry.key]
+        self._sizes[entry.type] -= entry.size
+        heap = self._heaps[entry.type]
+        if entry.key in heap:
+            heap.remove(entry.key)
+
+    def track(self, items: Iterable[tuple[str, str, float, int]], *, now: float | None = None) -> None:
+        """Record ``(key, type, score, size)`` commits.
+
+        A key committed again is refreshed: its clock restarts and it keeps
+        the higher of its old and new scores.
+        """
+
+        now = time.time() if now is None else now
+        conn = self._connection()
+        rows: list[tuple[str, str, float, int, float]] = []
+        for key, memory_type, score, size in items:
+            previous = self._entries.get(key)
+            if previous is not None and previous.type == memory_type:
+                score = max(score, previous.score)
+            entry = Retained(key=key, type=memory_type, score=float(score), size=int(size), touched=now)
+            self._insert(entry)
+            rows.append((entry.key, entry.type, entry.score, entry.size, entry.touched))
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO retention (key, type, score, size, touched) VALUES (?, ?, ?, ?, ?)", rows)
+
+    def evict(self, *, now: float | None = None) -> list[Eviction]:
+        """Drop the lowest decayed-score entries of every type that is over budget."""
+
+        now = time.time() if now is None else now
+        conn = self._connection()
+        evicted: list[Eviction] = []
+        for memory_type, heap in self._heaps.items():
+            budget = self.budget(memory_type)
+            while heap and (reason := budget.exceeded(len(heap), self._sizes[memory_type])):
+                key, _ = heap.peek()
+                entry = self._entries[key]
+                self._discard(entry)
+                evicted.append(Eviction(key, memory_type, round(entry.decayed_score(now, self.half_life), 3), reason))
+        if evicted:
+            with conn:
+                conn.executemany("DELETE FROM retention WHERE key = ?", [(eviction.key,) for eviction in evicted])
+        return evicted
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        self._entries.clear()
+        self._heaps.clear()
+        self._sizes.clear()
+
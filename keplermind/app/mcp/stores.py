@@ -3,16 +3,94 @@
 from __future__ import annotations
 
 import json
+import re
 import sqlite3
+from array import array
+from collections import Counter
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Iterable, Sequence
+from typing import Any, Iterable, Iterator, Sequence
 
+import numpy as np
+
+from ..config.settings import settings
 
 DEFAULT_MEMORY_DIR = Path("keplermind/app/memory")
 DEFAULT_MEMORY_DIR.mkdir(parents=True, exist_ok=True)
 
+_TOKEN = re.compile(r"\w+")
+_MISSING = object()
+DEDUPE_CANDIDATES = 32  # FTS matches scored by cosine when looking for a near-duplicate
+VECTOR_SCAN_ROWS = 4096  # stored embeddings held in memory at once by a vector scan
+
+
+def _tokens(text: str) -> list[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def _match_any(text: str) -> str:
+    """FTS5 query matching documents that share any token with *text*."""
+
+    return " OR ".join(f'"{token}"' for token in dict.fromkeys(_tokens(text)))
+
+
+def _embed(texts: Sequence[str]) -> np.ndarray:
+    # Imported lazily: the tools package itself imports this module.
+    from ..tools.embed import HashingEmbedder
+
+    return HashingEmbedder(dimensions=settings.memory.embedding_dimensions).embed_matrix(list(texts))
+
+
+class _VectorIndex:
+    """Growable ``float32`` matrix of unit memory embeddings, one row per document."""
+
+    def __init__(self, dimensions: int) -> None:
+        self._matrix = np.zeros((0, dimensions), dtype=np.float32)
+        self.size = 0
+
+    @property
+    def vectors(self) -> np.ndarray:
+        return self._matrix[: self.size]
+
+    def append(self, vector: np.ndarray) -> int:
+        if self.size == self._matrix.shape[0]:
+            grown = np.zeros((max(64, 2 * self.size), self._matrix.shape[1]), dtype=np.float32)
+            grown[: self.size] = self.vectors
+            self._matrix = grown
+        self._matrix[self.size] = vector
+        self.size += 1
+        return self.size - 1
+
+    def clear(self, row: int) -> None:
+        """Zero *row*: it then never scores above zero or reaches a dedupe threshold."""
+
+        self._matrix[row] = 0.0
+
+    def nearest(self, vector: np.ndarray, threshold: float = -1.0) -> tuple[int, float]:
+        """Row and cosine of the most similar stored vector (``-1`` when empty).
+
+        A ``threshold`` above 1 can never be reached, so the scan is skipped.
+        """
+
+        if not self.size or threshold > 1.0:
+            return -1, float("-inf")
+        scores = self.vectors @ vector
+        row = int(np.argmax(scores))
+        return row, float(scores[row])
+
+    def top_k(self, vector: np.ndarray, k: int) -> list[tuple[int, float]]:
+        """Rows with a positive score, best first; one matrix-vector product."""
+
+        if not self.size or k <= 0:
+            return []
+        scores = self.vectors @ vector
+        rows = np.flatnonzero(scores > 0)
+        if rows.size > k:
+            rows = rows[np.argpartition(-scores[rows], k - 1)[:k]]
+        rows = rows[np.lexsort((rows, -scores[rows]))]
+        return [(int(row), float(scores[row])) for row in rows]
+
 
 @dataclass
 class EpisodicEvent:
@@ -26,35 +104,79 @@ class EpisodicEvent:
 
 
 class EpisodicLog:
-    """SQLite-backed event log capturing the system lifecycle."""
+    """SQLite-backed event log capturing the system lifecycle.
+
+    The database runs in WAL mode with ``synchronous = NORMAL``, so a commit
+    appends to the write-ahead log without waiting on an fsync. With
+    ``buffer_size`` above zero, :meth:`record` is write-behind: events are
+    held in memory and written in one transaction once the buffer fills, on
+    :meth:`flush`, before any read and on :meth:`close`.
+    """
 
-    def __init__(self, db_path: Path | str | None = None) -> None:
+    def __init__(self, db_path: Path | str | None = None, *, buffer_size: int | None = None) -> None:
         self.db_path = Path(db_path) if db_path else DEFAULT_MEMORY_DIR / "events.sqlite"
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.buffer_size = settings.memory.event_buffer if buffer_size is None else buffer_size
+        self._pending: list[tuple[str, str, str, str]] = []
         self._conn = sqlite3.connect(self.db_path)
-        self._conn.execute(
+        self._conn.executescript(
             """
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = NORMAL;
             CREATE TABLE IF NOT EXISTS events (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 ts TEXT NOT NULL,
                 session TEXT NOT NULL,
                 phase TEXT NOT NULL,
                 payload TEXT NOT NULL
-            )
+            );
             """
         )
         self._conn.commit()
 
-    def record(self, *, session: str, phase: str, payload: dict[str, Any]) -> int:
+    def record(self, *, session: str, phase: str, payload: dict[str, Any]) -> int | None:
+        """Log one event; returns its id, or ``None`` while it is still buffered."""
+
+        if self.buffer_size <= 0:
+            return self.record_many([(session, phase, payload)])[0]
+        timestamp = datetime.utcnow().isoformat(timespec="seconds")
+        self._pending.append((timestamp, session, phase, json.dumps(payload)))
+        if len(self._pending) >= self.buffer_size:
+            self.flush()
+        return None
+
+    def record_many(self, events: Iterable[tuple[str, str, dict[str, Any]]]) -> list[int]:
+        """Write buffered events and every ``(session, phase, payload)`` in one transaction.
+
+        Returns the ids of *events*, in order.
+        """
+
         timestamp = datetime.utcnow().isoformat(timespec="seconds")
+        rows = [(timestamp, session, phase, json.dumps(payload)) for session, phase, payload in events]
+        if not rows:
+            self.flush()
+            return []
+        return self._write(self._pending + rows)[-len(rows) :]
+
+    def flush(self) -> None:
+        """Write any buffered events."""
+
+        if self._pending:
+            self._write(self._pending)
+
+    def _write(self, rows: list[tuple[str, str, str, str]]) -> list[int]:
         with self._conn:
-            cursor = self._conn.execute(
-                "INSERT INTO events (ts, session, phase, payload) VALUES (?, ?, ?, ?)",
-                (timestamp, session, phase, json.dumps(payload)),
-            )
-        return int(cursor.lastrowid)
+            # The write lock is held from here, so every id above the current
+            # maximum belongs to these rows.
+            self._conn.execute("BEGIN IMMEDIATE")
+            (last,) = self._conn.execute("SELECT COALESCE(MAX(id), 0) FROM events").fetchone()
+            self._conn.executemany("INSERT INTO events (ts, session, phase, payload) VALUES (?, ?, ?, ?)", rows)
+            ids = [row[0] for row in self._conn.execute("SELECT id FROM events WHERE id > ? ORDER BY id", (last,))]
+        self._pending = []
+        return ids
 
     def fetch_all(self) -> list[EpisodicEvent]:
+        self.flush()
         cursor = self._conn.execute("SELECT id, ts, session, phase, payload FROM events ORDER BY id ASC")
         events: list[EpisodicEvent] = []
         for row in cursor.fetchall():
@@ -63,6 +185,7 @@ class EpisodicLog:
         return events
 
     def close(self) -> None:
+        self.flush()
         self._conn.close()
 
 
@@ -73,31 +196,368 @@ class SemanticDocument:
     doc_id: str
     content: str
     metadata: dict[str, Any]
+    count: int = 1
 
 
 class SemanticStore:
-    """In-memory semantic store with naive similarity for tests."""
-
-    def __init__(self) -> None:
-        self._documents: list[SemanticDocument] = []
+    """In-memory semantic store ranked by token overlap or embedding similarity.
+
+    An inverted index from lower-cased word tokens to postings (parallel
+    ``int64`` arrays of document positions and term frequencies) is extended
+    on :meth:`add`, so a query only touches documents sharing a token with it.
+    Every document also has a row in a ``float32`` embedding matrix: an added
+    text whose cosine with an existing memory reaches ``dedupe_threshold`` is
+    merged into it instead of appended; a threshold above 1 turns this off.
+
+    Deleted documents leave a tombstone, so positions, ids and postings stay
+    valid; their postings are skipped at query time.
+    """
+
+    def __init__(self, *, dedupe_threshold: float | None = None) -> None:
+        self._documents: list[SemanticDocument | None] = []
+        self._alive = bytearray()
+        self._postings: dict[str, tuple[array, array]] = {}
+        self._vectors = _VectorIndex(settings.memory.embedding_dimensions)
+        self.dedupe_threshold = settings.memory.dedupe_threshold if dedupe_threshold is None else dedupe_threshold
 
     def add(self, content: str, *, metadata: dict[str, Any] | None = None) -> str:
-        doc_id = f"doc_{len(self._documents) + 1}"
-        self._documents.append(SemanticDocument(doc_id=doc_id, content=content, metadata=metadata or {}))
-        return doc_id
+        """Append *content*, or merge it into a near-duplicate; returns the document id."""
+
+        return self.add_many([(content, metadata)])[0]
+
+    def add_many(self, items: Iterable[tuple[str, dict[str, Any] | None]]) -> list[str]:
+        items = list(items)
+        doc_ids: list[str] = []
+        for (content, metadata), vector in zip(items, _embed([content for content, _ in items])):
+            row, score = self._vectors.nearest(vector, self.dedupe_threshold)
+            if score >= self.dedupe_threshold:
+                existing = self._documents[row]
+                assert existing is not None
+                existing.metadata = {**existing.metadata, **(metadata or {})}
+                existing.count += 1
+                doc_ids.append(existing.doc_id)
+                continue
+            position = len(self._documents)
+            doc_id = f"doc_{position + 1}"
+            self._documents.append(SemanticDocument(doc_id=doc_id, content=content, metadata=metadata or {}))
+            self._alive.append(1)
+            self._vectors.append(vector)
+            for token, tf in Counter(_tokens(content)).items():
+                positions, frequencies = self._postings.setdefault(token, (array("q"), array("q")))
+                positions.append(position)
+                frequencies.append(tf)
+            doc_ids.append(doc_id)
+        return doc_ids
+
+    def delete_many(self, doc_ids: Iterable[str]) -> int:
+        """Remove the given documents; unknown ids are ignored. Returns how many were removed."""
+
+        removed = 0
+        for doc_id in doc_ids:
+            position = int(doc_id.rpartition("_")[2]) - 1
+            if 0 <= position < len(self._documents) and self._alive[position]:
+                self._documents[position] = None
+                self._alive[position] = 0
+                self._vectors.clear(position)
+                removed += 1
+        return removed
+
+    def vector_search(self, query: str, *, top_k: int = 5) -> list[SemanticDocument]:
+        """Documents with positive cosine similarity to *query*, best first."""
+
+        return [self._documents[row] for row, _ in self._vectors.top_k(_embed([query])[0], top_k)]  # type: ignore[misc]
 
     def similarity_search(self, query: str, *, top_k: int = 5) -> list[SemanticDocument]:
-        """Very small TF overlap ranking adequate for unit tests."""
+        """Rank by distinct query tokens matched, then by their summed term frequency.
+
+        Ties keep insertion order, and slots left after the matches are
+        filled with unmatched documents in insertion order.
+        """
+
+        postings = [self._postings[token] for token in set(_tokens(query)) if token in self._postings]
+        best = np.empty(0, dtype=np.int64)
+        if postings and top_k > 0:
+            positions = np.concatenate([np.frombuffer(entry[0], dtype=np.int64) for entry in postings])
+            frequencies = np.concatenate([np.frombuffer(entry[1], dtype=np.int64) for entry in postings])
+            # Work stays proportional to the postings touched, not to the store size.
+            best, inverse = np.unique(positions, return_inverse=True)
+            keys = np.bincount(inverse) * (int(frequencies.sum()) + 1) + np.bincount(inverse, weights=frequencies)
+            alive = np.frombuffer(self._alive, dtype=np.bool_)[best]
+            best, keys = best[alive], keys[alive]
+            if best.size > top_k:
+                # Exact top-k: everything above the k-th key, then the earliest
+                # documents tied with it.
+                threshold = np.partition(keys, best.size - top_k)[best.size - top_k]
+                keep = np.flatnonzero(keys > threshold)
+                tied = np.flatnonzero(keys == threshold)[: top_k - keep.size]
+                keep = np.concatenate((keep, tied))
+                best, keys = best[keep], keys[keep]
+            best = best[np.lexsort((best, -keys))]
+
+        ranked = [self._documents[position] for position in best.tolist()]
+        chosen = set(best.tolist())
+        for position, document in enumerate(self._documents):
+            if len(ranked) >= top_k:
+                break
+            if document is not None and position not in chosen:
+                ranked.append(document)
+        return ranked  # type: ignore[return-value]
+
+    def all(self) -> Sequence[SemanticDocument]:
+        return tuple(document for document in self._documents if document is not None)
+
+
+class _DocumentView(Sequence[SemanticDocument]):
+    """Read-only sequence over a :class:`PersistentSemanticStore`, fetched row by row."""
+
+    def __init__(self, store: "PersistentSemanticStore") -> None:
+        self._store = store
+
+    def __len__(self) -> int:
+        return int(self._store._connection().execute("SELECT COUNT(*) FROM documents").fetchone()[0])
+
+    def __getitem__(self, index):  # type: ignore[override]
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        row = (
+            self._store._connection()
+            .execute("SELECT id, content, metadata, count FROM documents ORDER BY id LIMIT 1 OFFSET ?", (index,))
+            .fetchone()
+        )
+        if row is None:
+            raise IndexError(index)
+        return PersistentSemanticStore._document(row)
+
+    def __iter__(self) -> Iterator[SemanticDocument]:
+        cursor = self._store._connection().execute("SELECT id, content, metadata, count FROM documents ORDER BY id")
+        for row in cursor:
+            yield PersistentSemanticStore._document(row)
+
+
+class PersistentSemanticStore:
+    """SQLite FTS5 semantic store that survives across sessions.
+
+    Documents live in a plain table with a JSON ``metadata`` column, mirrored
+    into an external-content FTS5 index by triggers; :meth:`similarity_search`
+    ranks matches with FTS5's ``bm25()``. The database is opened on first use
+    and documents are only materialised as they are read.
+
+    Embeddings are kept as ``float32`` BLOBs. A new text is merged into a
+    near-duplicate (cosine at or above ``dedupe_threshold``), as in
+    :class:`SemanticStore`, but only its ``DEDUPE_CANDIDATES`` best FTS matches
+    are scored; :meth:`vector_search` streams the stored embeddings in blocks
+    of ``VECTOR_SCAN_ROWS``. Rows written before embeddings were stored are
+    skipped by both until :meth:`backfill_embeddings` has run.
+    """
+
+    def __init__(self, db_path: Path | str | None = None, *, dedupe_threshold: float | None = None) -> None:
+        self.db_path = Path(db_path) if db_path else DEFAULT_MEMORY_DIR / "semantic.sqlite"
+        self.dedupe_threshold = settings.memory.dedupe_threshold if dedupe_threshold is None else dedupe_threshold
+        self._conn: sqlite3.Connection | None = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path)
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS documents (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    content TEXT NOT NULL,
+                    metadata TEXT NOT NULL DEFAULT '{}',
+                    created_at TEXT NOT NULL,
+                    count INTEGER NOT NULL DEFAULT 1,
+                    embedding BLOB
+                );
+                CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+                    content, content='documents', content_rowid='id'
+                );
+                CREATE TRIGGER IF NOT EXISTS documents_ai AFTER INSERT ON documents BEGIN
+                    INSERT INTO documents_fts (rowid, content) VALUES (new.id, new.content);
+                END;
+                CREATE TRIGGER IF NOT EXISTS documents_ad AFTER DELETE ON documents BEGIN
+                    INSERT INTO documents_fts (documents_fts, rowid, content) VALUES ('delete', old.id, old.content);
+                END;
+                CREATE TRIGGER IF NOT EXISTS documents_au AFTER UPDATE OF content ON documents BEGIN
+                    INSERT INTO documents_fts (documents_fts, rowid, content) VALUES ('delete', old.id, old.content);
+                    INSERT INTO documents_fts (rowid, content) VALUES (new.id, new.content);
+                END;
+                """
+            )
+            # Stores written before embeddings were kept lack the vector columns.
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(documents)")}
+            if "count" not in columns:
+                self._conn.execute("ALTER TABLE documents ADD COLUMN count INTEGER NOT NULL DEFAULT 1")
+            if "embedding" not in columns:
+                self._conn.execute("ALTER TABLE documents ADD COLUMN embedding BLOB")
+            self._conn.commit()
+        return self._conn
+
+    def backfill_embeddings(self, *, batch_size: int = 256) -> int:
+        """Embed rows stored without an embedding, one committed batch at a time.
+
+        A migration step for stores written before embeddings were kept; returns
+        how many rows were embedded.
+        """
+
+        conn = self._connection()
+        embedded = 0
+        while True:
+            missing = conn.execute(
+                "SELECT id, content FROM documents WHERE embedding IS NULL ORDER BY id LIMIT ?", (batch_size,)
+            ).fetchall()
+            if not missing:
+                return embedded
+            vectors = _embed([content for _, content in missing])
+            with conn:
+                conn.executemany(
+                    "UPDATE documents SET embedding = ? WHERE id = ?",
+                    [(vector.tobytes(), doc_id) for (doc_id, _), vector in zip(missing, vectors)],
+                )
+            embedded += len(missing)
+
+    @staticmethod
+    def _embeddings(rows: Sequence[tuple[int, bytes]]) -> tuple[np.ndarray, np.ndarray]:
+        """Split ``(id, embedding)`` rows into an id array and a ``float32`` matrix."""
+
+        width = settings.memory.embedding_dimensions * 4
+        rows = [row for row in rows if len(row[1]) == width]
+        ids = np.fromiter((doc_id for doc_id, _ in rows), dtype=np.int64, count=len(rows))
+        matrix = np.frombuffer(b"".join(blob for _, blob in rows), dtype=np.float32)
+        return ids, matrix.reshape(len(rows), settings.memory.embedding_dimensions)
+
+    def _duplicate_of(self, conn: sqlite3.Connection, content: str, vector: np.ndarray) -> int | None:
+        """Id of the stored near-duplicate of *content*, looked for among its best FTS matches."""
+
+        terms = _match_any(content)
+        if self.dedupe_threshold > 1.0 or not terms:
+            return None
+        ids, matrix = self._embeddings(
+            conn.execute(
+                "SELECT d.id, d.embedding FROM documents_fts JOIN documents AS d ON d.id = documents_fts.rowid "
+                "WHERE documents_fts MATCH ? AND d.embedding IS NOT NULL ORDER BY bm25(documents_fts) LIMIT ?",
+                (terms, DEDUPE_CANDIDATES),
+            ).fetchall()
+        )
+        if not ids.size:
+            return None
+        scores = matrix @ vector
+        best = np.lexsort((ids, -scores))[0]
+        return int(ids[best]) if scores[best] >= self.dedupe_threshold else None
+
+    @staticmethod
+    def _document(row: Sequence[Any]) -> SemanticDocument:
+        return SemanticDocument(
+            doc_id=f"doc_{row[0]}", content=row[1], metadata=json.loads(row[2]) if row[2] else {}, count=row[3]
+        )
+
+    def add(self, content: str, *, metadata: dict[str, Any] | None = None) -> str:
+        return self.add_many([(content, metadata)])[0]
+
+    def add_many(self, items: Iterable[tuple[str, dict[str, Any] | None]]) -> list[str]:
+        """Insert or merge every ``(content, metadata)`` pair in a single transaction.
+
+        Rows inserted earlier in the batch are already in the FTS index, so a
+        batch also deduplicates against itself.
+        """
 
-        def _score(text: str) -> int:
-            query_tokens = set(query.lower().split())
-            return sum(1 for token in query_tokens if token in text.lower())
+        items = list(items)
+        if not items:
+            return []
+        timestamp = datetime.utcnow().isoformat(timespec="seconds")
+        conn = self._connection()
+        doc_ids: list[str] = []
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            for (content, metadata), vector in zip(items, _embed([content for content, _ in items])):
+                doc_id = self._duplicate_of(conn, content, vector)
+                if doc_id is None:
+                    doc_id = conn.execute(
+                        "INSERT INTO documents (content, metadata, created_at, count, embedding) VALUES (?, ?, ?, 1, ?)",
+                        (content, json.dumps(metadata or {}), timestamp, vector.tobytes()),
+                    ).lastrowid
+                else:
+                    (stored,) = conn.execute("SELECT metadata FROM documents WHERE id = ?", (doc_id,)).fetchone()
+                    conn.execute(
+                        "UPDATE documents SET metadata = ?, count = count + 1 WHERE id = ?",
+                        (json.dumps({**(json.loads(stored) if stored else {}), **(metadata or {})}), doc_id),
+                    )
+                doc_ids.append(f"doc_{doc_id}")
+        return doc_ids
+
+    def delete_many(self, doc_ids: Iterable[str]) -> int:
+        """Remove the given documents in one transaction. Returns how many were removed."""
+
+        ids = [int(doc_id.rpartition("_")[2]) for doc_id in doc_ids]
+        if not ids:
+            return 0
+        conn = self._connection()
+        with conn:
+            # rowcount, unlike total_changes, leaves out the FTS trigger writes.
+            removed = conn.executemany("DELETE FROM documents WHERE id = ?", [(doc_id,) for doc_id in ids]).rowcount
+        return removed
+
+    def vector_search(self, query: str, *, top_k: int = 5) -> list[SemanticDocument]:
+        """Documents with positive cosine similarity to *query*, best first."""
+
+        if top_k <= 0:
+            return []
+        vector = _embed([query])[0]
+        best_ids = np.empty(0, dtype=np.int64)
+        best_scores = np.empty(0, dtype=np.float32)
+        cursor = self._connection().execute(
+            "SELECT id, embedding FROM documents WHERE embedding IS NOT NULL ORDER BY id"
+        )
+        while rows := cursor.fetchmany(VECTOR_SCAN_ROWS):
+            ids, matrix = self._embeddings(rows)
+            scores = matrix @ vector
+            positive = scores > 0
+            best_ids = np.concatenate((best_ids, ids[positive]))
+            best_scores = np.concatenate((best_scores, scores[positive]))
+            order = np.lexsort((best_ids, -best_scores))[:top_k]
+            best_ids, best_scores = best_ids[order], best_scores[order]
+        if not best_ids.size:
+            return []
+        ids = best_ids.tolist()
+        marks = ", ".join("?" for _ in ids)
+        rows = self._connection().execute(
+            f"SELECT id, content, metadata, count FROM documents WHERE id IN ({marks})", ids
+        ).fetchall()
+        by_id = {row[0]: row for row in rows}
+        return [self._document(by_id[doc_id]) for doc_id in ids if doc_id in by_id]
 
-        ranked = sorted(self._documents, key=lambda doc: _score(doc.content), reverse=True)
-        return ranked[:top_k]
+    def similarity_search(self, query: str, *, top_k: int = 5) -> list[SemanticDocument]:
+        """Rank matches with BM25; leftover slots take the oldest unmatched documents."""
+
+        if top_k <= 0:
+            return []
+        conn = self._connection()
+        terms = _match_any(query)
+        rows: list[Any] = []
+        if terms:
+            rows = conn.execute(
+                "SELECT d.id, d.content, d.metadata, d.count FROM documents_fts JOIN documents AS d ON d.id = documents_fts.rowid "
+                "WHERE documents_fts MATCH ? ORDER BY bm25(documents_fts), d.id LIMIT ?",
+                (terms, top_k),
+            ).fetchall()
+        if len(rows) < top_k:
+            seen = [row[0] for row in rows]
+            marks = ", ".join("?" for _ in seen)
+            rows += conn.execute(
+                f"SELECT id, content, metadata, count FROM documents WHERE id NOT IN ({marks}) ORDER BY id LIMIT ?",
+                (*seen, top_k - len(rows)),
+            ).fetchall()
+        return [self._document(row) for row in rows]
 
     def all(self) -> Sequence[SemanticDocument]:
-        return tuple(self._documents)
+        return _DocumentView(self)
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
 
 
 class PreferenceStore:
@@ -123,6 +583,14 @@ class PreferenceStore:
             self._cache[key] = value
         self._flush()
 
+    def delete(self, keys: Iterable[str]) -> int:
+        """Drop *keys* with a single write; returns how many were present."""
+
+        removed = sum(self._cache.pop(key, _MISSING) is not _MISSING for key in keys)
+        if removed:
+            self._flush()
+        return removed
+
     def as_dict(self) -> dict[str, Any]:
         return dict(self._cache)
 
@@ -6,6 +6,7 @@ from . import (
     explain,
     intake,
     memorize,
+    pipeline,
     planner,
     profile,
     reflect_and_repair,
@@ -20,6 +21,7 @@ __all__ = [
     "explain",
     "intake",
     "memorize",
+    "pipeline",
     "planner",
     "profile",
     "reflect_and_repair",
@@ -11,6 +11,7 @@ from rich.console import Console
 from ..config.settings import settings
 from ..mcp.priors import PriorsRepository, SkillPrior, plan_questions
 from ..state import QAResult, S
+from ..tools.retrieve import Retriever
 
 PROMPTS_DIR = Path(__file__).resolve().parent.parent / "prompts"
 SCORING_GUIDE = (PROMPTS_DIR / "scoring_critic.md").read_text(encoding="utf-8").strip()
@@ -119,6 +120,11 @@ def run(state: S, *, console: Console | None = None) -> S:
         )
         questions.append(question)
 
+    retriever = Retriever.from_state(hydrated)
+    if retriever is not None and len(retriever) and questions:
+        for pair, hits in zip(qa_pairs, retriever.search_many(questions)):
+            pair["evidence"] = [str(hit.chunk.get("id", "")) for hit in hits]
+
     hydrated["questions"] = questions
     hydrated["qa"] = qa_pairs
     hydrated["priors"] = repo.as_dict()
@@ -2,63 +2,373 @@
 
 from __future__ import annotations
 
-import json
+import hashlib
+import shutil
+from typing import Iterable, Iterator
 
+import numpy as np
 from rich.console import Console
 
 from ..config.settings import settings
 from ..state import S
+from ..tools.ann import IVFIndex
 from ..tools.artifacts import ensure_session_output_dir, register_artifact
-from ..tools.chunk import chunk_text
+from ..tools.bm25 import BM25Builder
+from ..tools.chunk_store import ChunkStore, default_chunk_store
 from ..tools.embed import DeterministicEmbedder
+from ..tools.embed_cache import CachedEmbedder, EmbeddingCache, default_embedding_cache
+from ..tools.ingest import (
+    IngestedDocument,
+    IngestJob,
+    chunk_offsets,
+    default_workers,
+    ingest_document,
+    iter_ingest,
+    pool_embedder,
+)
+from ..tools.quantize import QuantizedVectors, quantize
+from ..tools.rag_index import RagIndex, RagIndexError
+from ..tools.retrieve import ANN_DIRECTORY, LEXICAL_DIRECTORY, QUANTIZED_DIRECTORY
 
+Embedder = DeterministicEmbedder | CachedEmbedder
 
-def run(state: S, *, console: Console | None = None) -> S:
-    console = console or Console()
-    hydrated: S = dict(state)
 
-    sources = hydrated.get("sources", [])
+def make_embedder(cache: EmbeddingCache | None = None) -> Embedder:
+    """Return the session embedder, backed by the persistent cache when enabled."""
+
     embedder = DeterministicEmbedder()
+    if cache is None and settings.cache.embedding_enabled:
+        cache = default_embedding_cache()
+    return embedder if cache is None else CachedEmbedder(embedder, cache)
 
-    chunks: list[dict[str, object]] = []
-    for source_index, source in enumerate(sources, start=1):
+
+def open_chunk_store(store: ChunkStore | None = None) -> ChunkStore | None:
+    """Return *store*, or the shared cross-session store when it is enabled."""
+
+    if store is None and settings.cache.chunk_store_enabled:
+        store = default_chunk_store()
+    return store
+
+
+def source_key(source: dict[str, object]) -> str:
+    """Stable key for a source derived from its content, independent of its position."""
+
+    content = str(source.get("content", ""))
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+
+
+def assign_keys(sources: Iterable[dict[str, object]], seen: dict[str, int] | None = None) -> Iterator[str]:
+    """Yield a unique key per source; repeated content gets a ``-n`` suffix."""
+
+    seen = {} if seen is None else seen
+    for source in sources:
+        key = source_key(source)
+        count = seen.get(key, 0)
+        seen[key] = count + 1
+        yield key if count == 0 else f"{key}-{count}"
+
+
+def _base_key(key: str) -> str:
+    return key.split("-", 1)[0]
+
+
+def stored_chunks(
+    store: ChunkStore, meta: dict[str, object], keys: Iterable[str]
+) -> dict[str, list[dict[str, object]]]:
+    """Look *keys* up in the chunk store, re-keying records for repeated sources."""
+
+    keys = list(keys)
+    found = store.get_sources(meta, {_base_key(key) for key in keys})
+    grouped: dict[str, list[dict[str, object]]] = {}
+    for key in keys:
+        records = found.get(_base_key(key))
+        if records:
+            grouped[key] = [
+                {**record, "id": f"{key}_{row}", "source_key": key} for row, record in enumerate(records)
+            ]
+    return grouped
+
+
+def _store_built(store: ChunkStore, meta: dict[str, object], built: dict[str, list[dict[str, object]]]) -> None:
+    # Repeats of a source share its content, so only the first copy is stored.
+    store.put_sources(meta, {key: records for key, records in built.items() if key == _base_key(key) and records})
+
+
+def index_meta(embedder: Embedder) -> dict[str, object]:
+    """Parameters that must match for chunks of a previous build to be reused."""
+
+    return {
+        "chunk_size": settings.rag.chunk_size,
+        "chunk_overlap": settings.rag.chunk_overlap,
+        "embedder": embedder.name,
+        "embedder_version": embedder.version,
+        "dimensions": embedder.dimensions,
+    }
+
+
+def previous_chunks(
+    state: S, embedder: Embedder, *, store: ChunkStore | None = None
+) -> dict[str, list[dict[str, object]]]:
+    """Group the chunks of the last build by source key, when they are reusable.
+
+    The in-memory ``state["rag"]`` is preferred; then the chunk ids it
+    references are resolved through *store*; otherwise the registered
+    ``rag_index`` artifact (binary or legacy JSON) is opened. Builds made with different chunking
+    or embedder parameters are ignored.
+    """
+
+    rag = state.get("rag") or {}
+    meta = index_meta(embedder)
+    if rag.get("chunks") is not None and rag.get("embeddings") is not None:
+        index = RagIndex(chunks=rag["chunks"], embeddings=rag["embeddings"], meta=rag.get("meta") or {})
+    elif store is not None and rag.get("chunk_ids") and rag.get("meta") == meta:
+        keys = dict.fromkeys(str(chunk_id).rsplit("_", 1)[0] for chunk_id in rag["chunk_ids"])
+        return stored_chunks(store, meta, keys)
+    else:
+        artifact = state.get("artifacts", {}).get("rag_index")
+        if not artifact or not artifact.get("path"):
+            return {}
+        try:
+            index = RagIndex.load(artifact["path"])
+        except (OSError, RagIndexError):
+            return {}
+    if index.meta != meta or not len(index):
+        return {}
+
+    grouped: dict[str, list[dict[str, object]]] = {}
+    for chunk in index.records():
+        key = chunk.get("source_key")
+        if key:
+            grouped.setdefault(str(key), []).append(chunk)
+    return grouped
+
+
+def _records(key: str, source: dict[str, object], document: IngestedDocument) -> list[dict[str, object]]:
+    return [
+        {
+            "id": f"{key}_{row}",
+            "source_key": key,
+            "source": source.get("url", ""),
+            "title": source.get("title", ""),
+            "text": document.chunk(row),
+            "start": int(document.offsets[row, 0]),
+            "end": int(document.offsets[row, 1]),
+            "embedding": document.vectors[row],
+        }
+        for row in range(len(document))
+    ]
+
+
+def _reuse(source: dict[str, object], chunks: list[dict[str, object]]) -> list[dict[str, object]]:
+    # Content is unchanged; only the citation fields may have moved on.
+    return [{**chunk, "source": source.get("url", ""), "title": source.get("title", "")} for chunk in chunks]
+
+
+def chunk_source(
+    key: str,
+    source: dict[str, object],
+    embedder: Embedder,
+    *,
+    previous: dict[str, list[dict[str, object]]] | None = None,
+    store: ChunkStore | None = None,
+) -> list[dict[str, object]]:
+    """Chunk and embed one research source, reusing ``previous[key]`` when present.
+
+    With a *store*, chunks another session built from the same content are
+    reused too, and freshly built ones are added to it.
+    """
+
+    if previous and key in previous:
+        return _reuse(source, previous[key])
+    meta = index_meta(embedder)
+    if store is not None:
+        stored = stored_chunks(store, meta, [key])
+        if key in stored:
+            return _reuse(source, stored[key])
+    content = str(source.get("content", ""))
+    if not content.strip():
+        return []
+    document = ingest_document(
+        IngestJob(text=content),
+        chunk_size=settings.rag.chunk_size,
+        overlap=settings.rag.chunk_overlap,
+        embedder=embedder,
+    )
+    records = _records(key, source, document)
+    if store is not None:
+        _store_built(store, meta, {key: records})
+    return records
+
+
+def _chunk_sources_in_pool(
+    keyed: list[tuple[str, dict[str, object]]], embedder: Embedder, *, workers: int
+) -> dict[str, list[dict[str, object]]]:
+    """Fan sources out to worker processes and return their chunks by key.
+
+    Workers rebuild the inner embedder from its name and dimensions; when
+    they cannot (see ``pool_embedder``) nothing is built here and the caller
+    chunks serially. With a cache, every chunk is looked up first: workers
+    embed only the missing rows, and sources with no misses never reach the
+    pool. Fresh vectors are written through so later sessions hit them.
+    """
+
+    inner = embedder.embedder if isinstance(embedder, CachedEmbedder) else embedder
+    name = pool_embedder(inner)
+    if name is None:
+        return {}
+
+    cached: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+    jobs: list[tuple[str, dict[str, object], IngestJob]] = []
+    built: dict[str, list[dict[str, object]]] = {}
+    for key, source in keyed:
         content = str(source.get("content", ""))
-        if not content.strip():
+        if not isinstance(embedder, CachedEmbedder):
+            jobs.append((key, source, IngestJob(text=content)))
             continue
-        prefix = f"src{source_index}"
-        windows = chunk_text(
-            content,
-            chunk_size=settings.rag.chunk_size,
-            overlap=settings.rag.chunk_overlap,
-            prefix=prefix,
-        )
-        for window in windows:
-            embedding = embedder.embed(window.text)
-            chunks.append(
-                {
-                    "id": window.id,
-                    "source": source.get("url", ""),
-                    "title": source.get("title", ""),
-                    "text": window.text,
-                    "start": window.start,
-                    "end": window.end,
-                    "embedding": embedding,
-                }
+        offsets = chunk_offsets(content, chunk_size=settings.rag.chunk_size, overlap=settings.rag.chunk_overlap)
+        found, vectors = embedder.cache.get_many(embedder.space, [content[start:end] for _, _, start, end in offsets])
+        embedder.hits += int(found.sum())
+        if found.all():
+            document = IngestedDocument(
+                title="",
+                text=content,
+                word_count=int(offsets[-1, 1]) if len(offsets) else 0,
+                offsets=offsets,
+                vectors=vectors,
             )
+            built[key] = _records(key, source, document)
+            continue
+        cached[key] = (found, vectors)
+        jobs.append((key, source, IngestJob(text=content, skip=tuple(np.flatnonzero(found).tolist()))))
+
+    documents = iter_ingest(
+        [job for _, _, job in jobs],
+        chunk_size=settings.rag.chunk_size,
+        overlap=settings.rag.chunk_overlap,
+        dimensions=inner.dimensions,
+        embedder=name,
+        workers=workers,
+    )
+    for (key, source, _), document in zip(jobs, documents):
+        if key in cached:
+            found, vectors = cached[key]
+            missing = np.flatnonzero(~found)
+            embedder.misses += len(missing)
+            document.vectors[found] = vectors[found]
+            embedder.cache.put_many(embedder.space, [document.chunk(row) for row in missing], document.vectors[missing])
+        built[key] = _records(key, source, document)
+    return built
+
+
+def publish(state: S, chunks: list[dict[str, object]], *, meta: dict[str, object], console: Console) -> None:
+    """Write *chunks* as a memory-mapped index and store the loaded index on *state*.
 
-    hydrated["rag"] = {"chunks": chunks, "vector_ready": bool(chunks)}
+    The BM25 postings are collected in the same pass that assembles the
+    embedding matrix and saved beside it under ``bm25/``.
+    """
 
-    output_dir = ensure_session_output_dir(hydrated)
-    rag_path = output_dir / "rag_index.json"
-    rag_payload = {"meta": {"chunk_size": settings.rag.chunk_size}, "chunks": chunks}
-    rag_path.write_text(json.dumps(rag_payload, indent=2), encoding="utf-8")
+    lexical_builder = BM25Builder()
+    index = RagIndex.from_records(chunks, meta=meta, dimensions=int(meta["dimensions"]), lexical=lexical_builder)
+    output_dir = ensure_session_output_dir(state)
+    manifest_path = index.save(output_dir / "rag_index")
+    loaded = RagIndex.load(manifest_path)
+    lexical = lexical_builder.build()
+    lexical.save(manifest_path.parent / LEXICAL_DIRECTORY)
+
+    ann_dir = manifest_path.parent / ANN_DIRECTORY
+    ann: IVFIndex | None = None
+    if len(loaded) >= settings.rag.ann_min_chunks:
+        ann = IVFIndex.build(loaded.embeddings, nprobe=settings.rag.ann_nprobe)
+        ann.save(ann_dir)
+        console.log(f"Built IVF index with {ann.nlist} lists over {len(ann)} chunks.")
+    else:
+        shutil.rmtree(ann_dir, ignore_errors=True)
+
+    quantized_dir = manifest_path.parent / QUANTIZED_DIRECTORY
+    quantized: QuantizedVectors | None = None
+    if settings.rag.quantization and len(loaded):
+        quantized = quantize(loaded.embeddings, settings.rag.quantization, subspaces=settings.rag.pq_subspaces or None)
+        quantized.save(quantized_dir)
+    else:
+        shutil.rmtree(quantized_dir, ignore_errors=True)
+
+    state["rag"] = {
+        "chunks": loaded.chunks,
+        "embeddings": loaded.embeddings,
+        "vector_ready": bool(chunks),
+        "meta": loaded.meta,
+        "ann": ann,
+        "bm25": lexical,
+        "quantized": quantized,
+        "chunk_ids": [str(chunk["id"]) for chunk in loaded.chunks],
+    }
     register_artifact(
-        hydrated,
+        state,
         "rag_index",
-        path=rag_path,
-        description="Vector-ready document chunks.",
+        path=manifest_path,
+        description="Vector-ready document chunks (embeddings.npy + chunks.jsonl).",
         kind="json",
     )
+    if settings.rag.export_json:
+        json_path = index.export_json(output_dir / "rag_index.json")
+        register_artifact(
+            state,
+            "rag_index_json",
+            path=json_path,
+            description="Debug export of the RAG index as a single JSON file.",
+            kind="json",
+        )
 
     console.log("RAG builder produced %d chunks", len(chunks))
+
+
+def run(
+    state: S,
+    *,
+    console: Console | None = None,
+    embedding_cache: EmbeddingCache | None = None,
+    chunk_store: ChunkStore | None = None,
+) -> S:
+    console = console or Console()
+    hydrated: S = dict(state)
+
+    sources = hydrated.get("sources", [])
+    embedder = make_embedder(embedding_cache)
+    store = open_chunk_store(chunk_store)
+    meta = index_meta(embedder)
+
+    previous = previous_chunks(hydrated, embedder, store=store)
+    keyed = list(zip(assign_keys(sources), sources))
+    stale = [(key, source) for key, source in keyed if key not in previous]
+    reused = len(keyed) - len(stale)
+    shared: dict[str, list[dict[str, object]]] = {}
+    if store is not None and stale:
+        shared = stored_chunks(store, meta, [key for key, _ in stale])
+        stale = [(key, source) for key, source in stale if key not in shared]
+
+    workers = settings.rag.ingest_workers or default_workers()
+    built: dict[str, list[dict[str, object]]] = {}
+    if workers > 1 and len(stale) >= settings.rag.ingest_min_sources:
+        built = _chunk_sources_in_pool(stale, embedder, workers=workers)
+
+    chunks: list[dict[str, object]] = []
+    for key, source in keyed:
+        if key in previous:
+            chunks.extend(_reuse(source, previous[key]))
+        elif key in shared:
+            chunks.extend(_reuse(source, shared[key]))
+        else:
+            if key not in built:
+                built[key] = chunk_source(key, source, embedder)
+            chunks.extend(built[key])
+    if store is not None and built:
+        _store_built(store, meta, built)
+
+    if previous:
+        console.log(f"RAG builder reused {reused} of {len(keyed)} sources from the previous index.")
+    if shared:
+        console.log(f"RAG builder reused {len(shared)} source(s) from the shared chunk store.")
+    if isinstance(embedder, CachedEmbedder) and (embedder.hits or embedder.misses):
+        console.log(f"Embedding cache: {embedder.hits} hit(s) · {embedder.misses} miss(es)")
+    publish(hydrated, chunks, meta=meta, console=console)
     return hydrated
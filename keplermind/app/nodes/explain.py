@@ -10,13 +10,29 @@ from rich.console import Console
 from ..state import S
 from ..tools.artifacts import ensure_session_output_dir, register_artifact
 from ..tools.citations import merge_citations
+from ..tools.retrieve import Hit, Retriever
 
 PROMPTS_DIR = Path(__file__).resolve().parent.parent / "prompts"
 LIGHT_TEMPLATE = (PROMPTS_DIR / "explain_light.md").read_text(encoding="utf-8").strip()
 DEEP_TEMPLATE = (PROMPTS_DIR / "explain_deep.md").read_text(encoding="utf-8").strip()
 
 
-def _render_explanation(skill: dict[str, object], sources: list[dict[str, object]]) -> tuple[str, str]:
+def _skill_query(skill: dict[str, object]) -> str:
+    return f"{skill.get('name', 'Skill')} {skill.get('summary', '')}".strip()
+
+
+def _cited_titles(hits: list[Hit], *, limit: int = 3) -> list[str]:
+    titles: list[str] = []
+    for hit in hits:
+        title = str(hit.chunk.get("title", "source"))
+        if title not in titles:
+            titles.append(title)
+    return titles[:limit]
+
+
+def _render_explanation(
+    skill: dict[str, object], sources: list[dict[str, object]], hits: list[Hit] | None = None
+) -> tuple[str, str]:
     name = str(skill.get("name", "Skill"))
     gap = float(skill.get("gap", 0.0))
     summary = str(skill.get("summary", "")).strip()
@@ -24,7 +40,10 @@ def _render_explanation(skill: dict[str, object], sources: list[dict[str, object
     body = template.format(skill=name)
     if summary:
         body += f"\n\nReflection: {summary}"
-    citation_tokens = [str(source.get("title", "source")) for source in sources][:3]
+    if hits:
+        citation_tokens = _cited_titles(hits)
+    else:
+        citation_tokens = [str(source.get("title", "source")) for source in sources][:3]
     citations = merge_citations(citation_tokens)
     return name, f"{body}\n\nSources {citations}"
 
@@ -38,8 +57,14 @@ def run(state: S, *, console: Console | None = None) -> S:
     skills = profile.get("skills", [])
     sources = hydrated.get("sources", [])
 
-    for skill in skills:
-        name, message = _render_explanation(skill, sources)
+    retriever = Retriever.from_state(hydrated)
+    if retriever is not None and len(retriever):
+        retrieved = retriever.search_many([_skill_query(skill) for skill in skills], diversity=0.3)
+    else:
+        retrieved = [[] for _ in skills]
+
+    for skill, hits in zip(skills, retrieved):
+        name, message = _render_explanation(skill, sources, hits)
         explanations[name] = message
 
     hydrated["explanations"] = explanations
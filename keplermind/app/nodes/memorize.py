@@ -2,22 +2,27 @@
 
 from __future__ import annotations
 
+import atexit
 import json
 from datetime import datetime
 
 from rich.console import Console
 
 from ..mcp.controller import MemoryController
-from ..mcp.stores import EpisodicLog, PreferenceStore, SemanticStore
+from ..mcp.retention import RetentionEngine
+from ..mcp.stores import EpisodicLog, PersistentSemanticStore, PreferenceStore
 from ..state import S
 from ..tools.artifacts import ensure_session_output_dir, register_artifact
 
 
 MEMORY_CONTROLLER = MemoryController(
     episodic_log=EpisodicLog(),
-    semantic_store=SemanticStore(),
+    semantic_store=PersistentSemanticStore(),
     preference_store=PreferenceStore(),
+    retention=RetentionEngine(),
 )
+# Buffered events (``settings.memory.event_buffer``) would otherwise be lost on exit.
+atexit.register(MEMORY_CONTROLLER.episodic_log.close)
 
 
 def _base_candidates(state: S, timestamp: str) -> list[dict[str, object]]:
@@ -87,6 +92,7 @@ def run(state: S, *, console: Console | None = None) -> S:
     MEMORY_CONTROLLER.propose(candidates)
     reviewed = MEMORY_CONTROLLER.review(limit=10)
     committed_ids = MEMORY_CONTROLLER.commit(hydrated.get("session_id", "session"))
+    MEMORY_CONTROLLER.episodic_log.flush()
 
     hydrated["mem_candidates"] = [
         {
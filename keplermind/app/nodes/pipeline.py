@@ -0,0 +1,110 @@
+"""Pipelined research → build_rag stage overlapping fetching with indexing."""
+
+from __future__ import annotations
+
+import queue
+import threading
+
+from rich.console import Console
+
+from ..config.settings import settings
+from ..state import S
+from ..tools.chunk_store import ChunkStore
+from ..tools.embed_cache import EmbeddingCache
+from ..tools.scrape import FetchFn
+from ..tools.scrape_cache import ScrapeCache
+from ..tools.search_cache import SearchCache
+from . import build_rag, research
+
+_DONE = object()
+
+
+def run(
+    state: S,
+    *,
+    console: Console | None = None,
+    fetcher: FetchFn | None = None,
+    cache: ScrapeCache | None = None,
+    search_cache: SearchCache | None = None,
+    embedding_cache: EmbeddingCache | None = None,
+    chunk_store: ChunkStore | None = None,
+    max_sources: int | None = None,
+    target_words: int | None = None,
+    queue_size: int | None = None,
+) -> S:
+    """Run research and RAG building as a producer/consumer pipeline.
+
+    A background thread searches lazily and scrapes concurrently, pushing
+    sources (in search order) onto a bounded queue; this thread chunks and
+    embeds each one as it arrives. Without early-stop limits the resulting
+    ``sources``, ``notes`` and ``rag`` equal a batch ``research`` →
+    ``build_rag`` run.
+    """
+
+    console = console or Console()
+    hydrated: S = dict(state)
+
+    handoff: queue.Queue[object] = queue.Queue(maxsize=queue_size or settings.research.pipeline_queue)
+    stop = threading.Event()
+    failure: list[BaseException] = []
+
+    def _offer(item: object) -> bool:
+        """Block until *item* is queued, giving up once the consumer has stopped."""
+
+        while not stop.is_set():
+            try:
+                handoff.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce() -> None:
+        stream = research.stream_sources(
+            hydrated,
+            fetcher=fetcher,
+            cache=cache,
+            search_cache=search_cache,
+            max_sources=max_sources,
+            target_words=target_words,
+        )
+        try:
+            for item in stream:
+                if not _offer(item):
+                    break
+        except BaseException as exc:  # pragma: no cover - surfaced in the consumer
+            failure.append(exc)
+        finally:
+            stream.close()
+            _offer(_DONE)
+
+    producer = threading.Thread(target=_produce, name="research-producer", daemon=True)
+    producer.start()
+
+    embedder = build_rag.make_embedder(embedding_cache)
+    store = build_rag.open_chunk_store(chunk_store)
+    previous = build_rag.previous_chunks(hydrated, embedder, store=store)
+    seen_keys: dict[str, int] = {}
+    sources: list[dict[str, object]] = []
+    notes: list[str] = []
+    chunks: list[dict[str, object]] = []
+    try:
+        while True:
+            item = handoff.get()
+            if item is _DONE:
+                break
+            source, note = item  # type: ignore[misc]
+            sources.append(source)
+            notes.append(note)
+            key = next(build_rag.assign_keys([source], seen_keys))
+            chunks.extend(build_rag.chunk_source(key, source, embedder, previous=previous, store=store))
+    finally:
+        stop.set()
+        producer.join()
+
+    if failure:
+        raise failure[0]
+
+    research.publish(hydrated, sources, notes, console=console)
+    build_rag.publish(hydrated, chunks, meta=build_rag.index_meta(embedder), console=console)
+    return hydrated
@@ -5,14 +5,18 @@ from __future__ import annotations
 import json
 from datetime import datetime
 from pathlib import Path
+from typing import Iterable, Iterator
 
 from rich.console import Console
 
 from ..config.settings import settings
 from ..state import S
 from ..tools.artifacts import ensure_session_output_dir, register_artifact
-from ..tools.scrape import scrape
-from ..tools.search import search
+from ..tools.dedupe import NearDuplicateFilter
+from ..tools.scrape import FetchFn, ScrapeResult, iter_scrape
+from ..tools.scrape_cache import ScrapeCache, default_scrape_cache
+from ..tools.search import SearchResult, iter_search, search
+from ..tools.search_cache import SearchCache, default_search_cache
 
 PROMPTS_DIR = Path(__file__).resolve().parent.parent / "prompts"
 HALLUCINATION_GUARD = (PROMPTS_DIR / "hallucination_guard.md").read_text(encoding="utf-8").strip()
@@ -26,35 +30,72 @@ def _summarise(text: str, *, limit: int = 80) -> str:
     return excerpt if len(words) <= limit else f"{excerpt} …"
 
 
-def run(state: S, *, console: Console | None = None) -> S:
-    console = console or Console()
-    hydrated: S = dict(state)
+def _max_results() -> int:
+    return max(MIN_RESULTS, settings.rag.top_k + 3)
 
-    topic = hydrated.get("topic", "Unknown Topic")
-    backend_pref = hydrated.get("search_backend")
 
-    results = search(
-        topic,
-        max_results=max(MIN_RESULTS, settings.rag.top_k + 3),
-        backend_preference=backend_pref,
+def _note(index: int, result: SearchResult, document: ScrapeResult, guard_hint: str) -> str:
+    return (
+        f"[{index}] {result.title}\n"
+        f"Summary: {_summarise(document.text)}\n"
+        f"Guard: {guard_hint} — {HALLUCINATION_GUARD.splitlines()[0]}"
     )
 
+
+def iter_sources(
+    results: Iterable[SearchResult],
+    *,
+    fetcher: FetchFn | None = None,
+    cache: ScrapeCache | None = None,
+    fetch_concurrency: int | None = None,
+    per_host_concurrency: int | None = None,
+    max_sources: int | None = None,
+    target_words: int | None = None,
+) -> Iterator[tuple[dict[str, object], str]]:
+    """Scrape *results* and yield ``(source, note)`` pairs in search order.
+
+    Near-duplicates are dropped as they arrive; their URLs are appended to the
+    ``merged_urls`` of the source already yielded for the original. Iteration
+    stops early once ``max_sources`` sources or ``target_words`` words have
+    been collected, cancelling fetches that have not started.
+    """
+
     timestamp = datetime.utcnow().isoformat(timespec="seconds")
-    sources: list[dict[str, object]] = []
-    notes: list[str] = []
+    seen: list[SearchResult] = []
+
+    def _targets() -> Iterator[tuple[str, str | None]]:
+        for result in results:
+            seen.append(result)
+            yield result.url, result.snippet
 
-    for index, result in enumerate(results, start=1):
-        document = scrape(result.url, fallback_text=result.snippet)
-        summary = _summarise(document.text)
-        guard_hint = "pass" if document.word_count >= 40 else "review"
-        note = (
-            f"[{index}] {result.title}\n"
-            f"Summary: {summary}\n"
-            f"Guard: {guard_hint} — {HALLUCINATION_GUARD.splitlines()[0]}"
+    detector = (
+        NearDuplicateFilter(
+            threshold=settings.research.dedupe_threshold,
+            min_words=settings.research.dedupe_min_words,
         )
-        notes.append(note)
-        sources.append(
-            {
+        if settings.research.dedupe
+        else None
+    )
+    documents = iter_scrape(
+        _targets(),
+        fetcher=fetcher,
+        cache=cache,
+        max_workers=fetch_concurrency or settings.research.fetch_concurrency,
+        per_host=per_host_concurrency or settings.research.per_host_concurrency,
+    )
+
+    kept: dict[int, dict[str, object]] = {}
+    words = 0
+    try:
+        for position, document in enumerate(documents):
+            result = seen[position]
+            canonical = detector.check(position, document.text) if detector else None
+            if canonical is not None:
+                kept[canonical].setdefault("merged_urls", []).append(result.url)  # type: ignore[union-attr]
+                continue
+
+            guard_hint = "pass" if document.word_count >= 40 else "review"
+            source: dict[str, object] = {
                 "title": result.title,
                 "url": result.url,
                 "snippet": result.snippet,
@@ -64,25 +105,118 @@ def run(state: S, *, console: Console | None = None) -> S:
                 "retrieved_at": timestamp,
                 "guard": guard_hint,
             }
-        )
+            kept[position] = source
+            yield source, _note(len(kept), result, document, guard_hint)
+
+            words += document.word_count
+            if (max_sources and len(kept) >= max_sources) or (target_words and words >= target_words):
+                break
+    finally:
+        documents.close()
+
+
+def stream_sources(
+    state: S,
+    *,
+    fetcher: FetchFn | None = None,
+    cache: ScrapeCache | None = None,
+    search_cache: SearchCache | None = None,
+    fetch_concurrency: int | None = None,
+    per_host_concurrency: int | None = None,
+    max_sources: int | None = None,
+    target_words: int | None = None,
+) -> Iterator[tuple[dict[str, object], str]]:
+    """Streaming counterpart of :func:`run`: search lazily and yield sources as they are ready."""
+
+    if search_cache is None and settings.cache.search_enabled:
+        search_cache = default_search_cache()
+    if cache is None and settings.cache.scrape_enabled:
+        cache = default_scrape_cache()
+
+    results = iter_search(
+        state.get("topic", "Unknown Topic"),
+        max_results=_max_results(),
+        backend_preference=state.get("search_backend"),
+        cache=search_cache,
+    )
+    yield from iter_sources(
+        results,
+        fetcher=fetcher,
+        cache=cache,
+        fetch_concurrency=fetch_concurrency,
+        per_host_concurrency=per_host_concurrency,
+        max_sources=max_sources,
+        target_words=target_words,
+    )
+
 
-    hydrated["sources"] = sources
-    hydrated["notes"] = notes
+def publish(state: S, sources: list[dict[str, object]], notes: list[str], *, console: Console) -> None:
+    """Store gathered sources on *state* and write ``bibliography.json``."""
 
-    output_dir = ensure_session_output_dir(hydrated)
+    state["sources"] = sources
+    state["notes"] = notes
+
+    output_dir = ensure_session_output_dir(state)
     bibliography_path = output_dir / "bibliography.json"
     bibliography_path.write_text(json.dumps(sources, indent=2), encoding="utf-8")
     register_artifact(
-        hydrated,
+        state,
         "bibliography",
         path=bibliography_path,
         description="Collected research sources with metadata.",
         kind="json",
     )
 
+    merged = sum(len(source.get("merged_urls", [])) for source in sources)  # type: ignore[arg-type]
+    if merged:
+        console.log(f"Merged {merged} near-duplicate sources into their originals.")
     console.log(
         "Research gathered %d sources using %s backend.",
         len(sources),
         sources[0]["backend"] if sources else "unknown",
     )
+
+
+def run(
+    state: S,
+    *,
+    console: Console | None = None,
+    fetcher: FetchFn | None = None,
+    cache: ScrapeCache | None = None,
+    search_cache: SearchCache | None = None,
+    fetch_concurrency: int | None = None,
+    per_host_concurrency: int | None = None,
+) -> S:
+    console = console or Console()
+    hydrated: S = dict(state)
+
+    topic = hydrated.get("topic", "Unknown Topic")
+    backend_pref = hydrated.get("search_backend")
+
+    if search_cache is None and settings.cache.search_enabled:
+        search_cache = default_search_cache()
+
+    results = search(
+        topic,
+        max_results=_max_results(),
+        backend_preference=backend_pref,
+        cache=search_cache,
+    )
+
+    if cache is None and settings.cache.scrape_enabled:
+        cache = default_scrape_cache()
+
+    sources: list[dict[str, object]] = []
+    notes: list[str] = []
+    for source, note in iter_sources(
+        results,
+        fetcher=fetcher,
+        cache=cache,
+        fetch_concurrency=fetch_concurrency,
+        per_host_concurrency=per_host_concurrency,
+    ):
+        sources.append(source)
+        notes.append(note)
+
+    publish(hydrated, sources, notes, console=console)
     return hydrated
@@ -1,13 +1,44 @@
 """Utility subpackage exports."""
 
-from . import artifacts, citations, chunk, embed, scrape, search
+from . import (
+    ann,
+    artifacts,
+    bm25,
+    chunk,
+    chunk_store,
+    citations,
+    dedupe,
+    embed,
+    embed_cache,
+    fetch,
+    ingest,
+    quantize,
+    rag_index,
+    retrieve,
+    scrape,
+    scrape_cache,
+    search,
+    search_cache,
+)
 
 __all__ = [
+    "ann",
     "artifacts",
+    "bm25",
     "citations",
     "chunk",
+    "chunk_store",
+    "dedupe",
     "embed",
+    "embed_cache",
+    "fetch",
+    "ingest",
+    "quantize",
+    "rag_index",
+    "retrieve",
     "scrape",
+    "scrape_cache",
     "search",
+    "search_cache",
 ]
 
@@ -0,0 +1,228 @@
+"""Approximate nearest-neighbour search: a pure NumPy IVF index."""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+from pathlib import Path
+
+import numpy as np
+
+FORMAT = "keplermind-ivf"
+FORMAT_VERSION = 1
+ASSIGN_BLOCK = 8192
+
+
+def _normalise(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32)
+
+
+def _nearest(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Index of the most similar centroid for every row, computed in blocks."""
+
+    assignment = np.empty(vectors.shape[0], dtype=np.int32)
+    for start in range(0, vectors.shape[0], ASSIGN_BLOCK):
+        block = vectors[start : start + ASSIGN_BLOCK]
+        assignment[start : start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+    return assignment
+
+
+def spherical_kmeans(vectors: np.ndarray, k: int, *, iterations: int = 12, seed: int = 0) -> np.ndarray:
+    """Cluster unit vectors by cosine similarity and return ``(k, d)`` unit centroids."""
+
+    rng = np.random.default_rng(seed)
+    k = min(k, vectors.shape[0])
+    centroids = vectors[rng.choice(vectors.shape[0], size=k, replace=False)].astype(np.float32)
+    for _ in range(iterations):
+        assignment = _nearest(vectors, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, vectors)
+        counts = np.bincount(assignment, minlength=k)
+        empty = counts == 0
+        if empty.any():
+            # Re-seed starved clusters with random points so every list is used.
+            sums[empty] = vectors[rng.choice(vectors.shape[0], size=int(empty.sum()), replace=False)]
+        centroids = _normalise(sums)
+    return centroids
+
+
+class IVFIndex:
+    """Inverted-file index: a k-means coarse quantizer over cosine similarity.
+
+    Vectors are stored contiguously, grouped by their nearest centroid, with
+    ``offsets[c]:offsets[c + 1]`` delimiting list ``c``. A query scans only
+    the ``nprobe`` lists whose centroids it is closest to; raising ``nprobe``
+    trades latency for recall. :meth:`add` appends without retraining and the
+    lists are regrouped lazily before the next search.
+    """
+
+    def __init__(self, centroids: np.ndarray, *, nprobe: int = 8) -> None:
+        self.centroids = _normalise(np.asarray(centroids, dtype=np.float32))
+        self.nprobe = nprobe
+        dimensions = self.centroids.shape[1]
+        self._vectors = np.empty((0, dimensions), dtype=np.float32)
+        self._ids = np.empty(0, dtype=np.int64)
+        self._lists = np.empty(0, dtype=np.int32)
+        self._offsets = np.zeros(self.nlist + 1, dtype=np.int64)
+        self._dirty = False
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+    @classmethod
+    def build(
+        cls,
+        vectors: np.ndarray,
+        *,
+        nlist: int | None = None,
+        nprobe: int = 8,
+        train_size: int | None = None,
+        seed: int = 0,
+    ) -> "IVFIndex":
+        """Train a quantizer on (a sample of) *vectors* and index all of them.
+
+        ``nlist`` defaults to ``4 * sqrt(n)``; training uses at most
+        ``train_size`` (default ``64 * nlist``) sampled vectors.
+        """
+
+        vectors = _normalise(np.asarray(vectors, dtype=np.float32))
+        count = vectors.shape[0]
+        if count == 0:
+            raise ValueError("Cannot build an IVF index from zero vectors.")
+        nlist = nlist or max(1, int(4 * math.sqrt(count)))
+        sample_size = min(count, train_size or 64 * nlist)
+        rng = np.random.default_rng(seed)
+        sample = vectors if sample_size == count else vectors[rng.choice(count, size=sample_size, replace=False)]
+        index = cls(spherical_kmeans(sample, nlist, seed=seed), nprobe=nprobe)
+        index.add(vectors)
+        return index
+
+    @property
+    def nlist(self) -> int:
+        return int(self.centroids.shape[0])
+
+    @property
+    def dimensions(self) -> int:
+        return int(self.centroids.shape[1])
+
+    def __len__(self) -> int:
+        return int(self._ids.shape[0])
+
+    def add(self, vectors: np.ndarray, ids: np.ndarray | None = None) -> None:
+        """Append *vectors* (ids default to consecutive row numbers)."""
+
+        vectors = _normalise(np.atleast_2d(np.asarray(vectors, dtype=np.float32)))
+        if ids is None:
+            ids = np.arange(len(self), len(self) + vectors.shape[0], dtype=np.int64)
+        ids = np.asarray(ids, dtype=np.int64)
+        if ids.shape[0] != vectors.shape[0]:
+            raise ValueError("Expected one id per vector.")
+        self._vectors = np.concatenate((self._vectors, vectors))
+        self._ids = np.concatenate((self._ids, ids))
+        self._lists = np.concatenate((self._lists, _nearest(vectors, self.centroids)))
+        self._dirty = True
+
+    def _regroup(self) -> None:
+        if not self._dirty:
+            return
+        order = np.argsort(self._lists, kind="stable")
+        self._vectors = self._vectors[order]
+        self._ids = self._ids[order]
+        self._lists = self._lists[order]
+        counts = np.bincount(self._lists, minlength=self.nlist)
+        self._offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+        self._dirty = False
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+    def search(
+        self, queries: np.ndarray, *, top_k: int, nprobe: int | None = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Return ``(ids, scores)`` of shape ``(m, top_k)``, best first.
+
+        Rows with fewer than ``top_k`` candidates are padded with id ``-1``
+        and score ``-inf``.
+        """
+
+        self._regroup()
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        probes = min(nprobe or self.nprobe, self.nlist)
+        ids = np.full((queries.shape[0], top_k), -1, dtype=np.int64)
+        scores = np.full((queries.shape[0], top_k), -np.inf, dtype=np.float32)
+
+        coarse = queries @ self.centroids.T
+        if probes < self.nlist:
+            probed = np.argpartition(-coarse, probes - 1, axis=1)[:, :probes]
+        else:
+            probed = np.broadcast_to(np.arange(self.nlist), coarse.shape)
+        for row, (query, lists) in enumerate(zip(queries, probed)):
+            ranges = [(self._offsets[c], self._offsets[c + 1]) for c in lists]
+            rows = np.concatenate([np.arange(start, end) for start, end in ranges if end > start] or [np.empty(0, np.int64)])
+            if rows.size == 0:
+                continue
+            candidate_scores = self._vectors[rows] @ query
+            k = min(top_k, rows.size)
+            best = np.argpartition(-candidate_scores, k - 1)[:k] if k < rows.size else np.arange(rows.size)
+            best = best[np.argsort(-candidate_scores[best], kind="stable")]
+            ids[row, :k] = self._ids[rows[best]]
+            scores[row, :k] = candidate_scores[best]
+        return ids, scores
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    def save(self, directory: Path | str) -> Path:
+        """Write the index into *directory* (arrays as ``.npy``) and return its manifest."""
+
+        self._regroup()
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name, array in (
+            ("centroids", self.centroids),
+            ("vectors", self._vectors),
+            ("ids", self._ids),
+            ("offsets", self._offsets),
+        ):
+            staged = directory / f".{name}.npy.tmp"
+            with staged.open("wb") as handle:
+                np.save(handle, array)
+            os.replace(staged, directory / f"{name}.npy")
+        manifest = directory / "manifest.json"
+        manifest.write_text(
+            json.dumps(
+                {
+                    "format": FORMAT,
+                    "version": FORMAT_VERSION,
+                    "nlist": self.nlist,
+                    "nprobe": self.nprobe,
+                    "dimensions": self.dimensions,
+                    "count": len(self),
+                },
+                indent=2,
+            ),
+            encoding="utf-8",
+        )
+        return manifest
+
+    @classmethod
+    def load(cls, directory: Path | str, *, mmap: bool = True) -> "IVFIndex":
+        """Open a saved index; the vector store is memory-mapped unless ``mmap`` is off."""
+
+        directory = Path(directory)
+        manifest = json.loads((directory / "manifest.json").read_text(encoding="utf-8"))
+        if manifest.get("format") != FORMAT or manifest.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported IVF index in {directory}.")
+        mode = "r" if mmap else None
+        index = cls(np.load(directory / "centroids.npy"), nprobe=int(manifest["nprobe"]))
+        index._vectors = np.load(directory / "vectors.npy", mmap_mode=mode)
+        index._ids = np.load(directory / "ids.npy")
+        index._offsets = np.load(directory / "offsets.npy")
+        index._lists = np.repeat(np.arange(index.nlist, dtype=np.int32), np.diff(index._offsets))
+        return index
+
+
+__all__ = ["IVFIndex", "spherical_kmeans"]
@@ -0,0 +1,188 @@
+"""BM25 inverted index with compact CSR posting arrays."""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Iterable, Sequence
+
+import numpy as np
+
+FORMAT = "keplermind-bm25"
+FORMAT_VERSION = 1
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Lower-cased word tokens; underscores are kept so identifiers stay whole."""
+
+    return _TOKEN.findall(text.lower())
+
+
+class BM25Builder:
+    """Accumulates documents one at a time and freezes them into a :class:`BM25Index`.
+
+    Postings are buffered as flat ``(term_id, doc_id, tf)`` integer lists and
+    only sorted into per-term runs once, in :meth:`build`.
+    """
+
+    def __init__(self) -> None:
+        self._vocabulary: dict[str, int] = {}
+        self._terms: list[int] = []
+        self._docs: list[int] = []
+        self._tfs: list[int] = []
+        self._lengths: list[int] = []
+
+    def add(self, text: str) -> int:
+        """Index *text* as the next document and return its id."""
+
+        doc_id = len(self._lengths)
+        tokens = tokenize(text)
+        self._lengths.append(len(tokens))
+        counts = Counter(tokens)
+        vocabulary = self._vocabulary
+        self._terms.extend([vocabulary.setdefault(term, len(vocabulary)) for term in counts])
+        self._docs.extend([doc_id] * len(counts))
+        self._tfs.extend(counts.values())
+        return doc_id
+
+    def build(self, *, k1: float = 1.2, b: float = 0.75) -> "BM25Index":
+        terms = np.array(self._terms, dtype=np.int64)
+        order = np.argsort(terms, kind="stable")
+        counts = np.bincount(terms, minlength=len(self._vocabulary))
+        return BM25Index(
+            vocabulary=list(self._vocabulary),
+            offsets=np.concatenate(([0], np.cumsum(counts))).astype(np.int64),
+            doc_ids=np.array(self._docs, dtype=np.int32)[order],
+            tfs=np.array(self._tfs, dtype=np.int32)[order],
+            doc_lengths=np.array(self._lengths, dtype=np.int32),
+            k1=k1,
+            b=b,
+        )
+
+
+class BM25Index:
+    """Okapi BM25 over a CSR inverted index.
+
+    Term ``t`` owns ``doc_ids[offsets[t]:offsets[t + 1]]`` (ascending) and the
+    matching ``tfs``. Scoring accumulates into one dense ``float32`` array per
+    query, so each query term costs a single vectorised scatter-add.
+    """
+
+    def __init__(
+        self,
+        *,
+        vocabulary: Sequence[str],
+        offsets: np.ndarray,
+        doc_ids: np.ndarray,
+        tfs: np.ndarray,
+        doc_lengths: np.ndarray,
+        k1: float = 1.2,
+        b: float = 0.75,
+    ) -> None:
+        self.vocabulary = {term: index for index, term in enumerate(vocabulary)}
+        self.offsets = offsets
+        self.doc_ids = doc_ids
+        self.tfs = tfs
+        self.doc_lengths = doc_lengths
+        self.k1 = k1
+        self.b = b
+        count = len(doc_lengths)
+        self.average_length = float(doc_lengths.mean()) if count else 0.0
+        frequencies = np.diff(offsets).astype(np.float64)
+        self.idf = np.log1p((count - frequencies + 0.5) / (frequencies + 0.5)).astype(np.float32)
+        self._norm = (k1 * (1 - b + b * doc_lengths / (self.average_length or 1.0))).astype(np.float32)
+
+    @classmethod
+    def from_texts(cls, texts: Iterable[str], *, k1: float = 1.2, b: float = 0.75) -> "BM25Index":
+        builder = BM25Builder()
+        for text in texts:
+            builder.add(text)
+        return builder.build(k1=k1, b=b)
+
+    def __len__(self) -> int:
+        return int(self.doc_lengths.shape[0])
+
+    def scores(self, query: str) -> np.ndarray:
+        """Dense BM25 scores of every document for *query*."""
+
+        totals = np.zeros(len(self), dtype=np.float32)
+        for term, repeats in Counter(tokenize(query)).items():
+            term_id = self.vocabulary.get(term)
+            if term_id is None:
+                continue
+            start, end = int(self.offsets[term_id]), int(self.offsets[term_id + 1])
+            docs = self.doc_ids[start:end]
+            tf = self.tfs[start:end].astype(np.float32)
+            totals[docs] += repeats * self.idf[term_id] * tf * (self.k1 + 1) / (tf + self._norm[docs])
+        return totals
+
+    def search(self, query: str, *, top_k: int) -> tuple[np.ndarray, np.ndarray]:
+        """Return ``(doc_ids, scores)`` of matching documents, best first (at most ``top_k``)."""
+
+        totals = self.scores(query)
+        matched = np.flatnonzero(totals > 0)
+        if matched.size > top_k:
+            matched = matched[np.argpartition(-totals[matched], top_k - 1)[:top_k]]
+        ranked = matched[np.argsort(-totals[matched], kind="stable")]
+        return ranked, totals[ranked]
+
+    def search_many(self, queries: Sequence[str], *, top_k: int) -> list[tuple[np.ndarray, np.ndarray]]:
+        return [self.search(query, top_k=top_k) for query in queries]
+
+    def save(self, directory: Path | str) -> Path:
+        """Write posting arrays as ``.npy`` files plus a manifest holding the vocabulary."""
+
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name in ("offsets", "doc_ids", "tfs", "doc_lengths"):
+            staged = directory / f".{name}.npy.tmp"
+            with staged.open("wb") as handle:
+                np.save(handle, getattr(self, name))
+            os.replace(staged, directory / f"{name}.npy")
+        manifest = directory / "manifest.json"
+        manifest.write_text(
+            json.dumps(
+                {
+                    "format": FORMAT,
+                    "version": FORMAT_VERSION,
+                    "k1": self.k1,
+                    "b": self.b,
+                    "vocabulary": list(self.vocabulary),
+                }
+            ),
+            encoding="utf-8",
+        )
+        return manifest
+
+    @classmethod
+    def load(cls, directory: Path | str, *, mmap: bool = True) -> "BM25Index":
+        directory = Path(directory)
+        manifest = json.loads((directory / "manifest.json").read_text(encoding="utf-8"))
+        if manifest.get("format") != FORMAT or manifest.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported BM25 index in {directory}.")
+        mode = "r" if mmap else None
+        arrays = {name: np.load(directory / f"{name}.npy", mmap_mode=mode) for name in ("offsets", "doc_ids", "tfs")}
+        return cls(
+            vocabulary=manifest["vocabulary"],
+            doc_lengths=np.load(directory / "doc_lengths.npy"),
+            k1=float(manifest["k1"]),
+            b=float(manifest["b"]),
+            **arrays,
+        )
+
+
+def reciprocal_rank_fusion(rankings: Iterable[Sequence[int]], *, k: int = 60) -> list[tuple[int, float]]:
+    """Fuse ranked id lists: each id scores ``sum(1 / (k + rank))`` over the lists it appears in."""
+
+    fused: dict[int, float] = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, start=1):
+            fused[int(item)] = fused.get(int(item), 0.0) + 1.0 / (k + rank)
+    return sorted(fused.items(), key=lambda pair: (-pair[1], pair[0]))
+
+
+__all__ = ["BM25Builder", "BM25Index", "reciprocal_rank_fusion", "tokenize"]
@@ -3,7 +3,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Iterable
+from typing import Iterable, Iterator
+
+import numpy as np
+
+SCAN_BLOCK = 1 << 16
+# Code points ``str.split()`` treats as separators; the highest is U+3000.
+_SEPARATORS = np.array([chr(code).isspace() for code in range(0x3001)], dtype=bool)
 
 
 @dataclass(frozen=True)
@@ -16,38 +22,128 @@ class Chunk:
     end: int
 
 
-def chunk_text(
+@dataclass(frozen=True)
+class ChunkSpan:
+    """A window over ``source`` described by offsets; ``text`` is sliced on demand.
+
+    ``start``/``end`` are character offsets into ``source``; ``word_start``/
+    ``word_end`` count whitespace-delimited words.
+    """
+
+    id: str
+    source: str
+    start: int
+    end: int
+    word_start: int
+    word_end: int
+
+    @property
+    def text(self) -> str:
+        return self.source[self.start : self.end]
+
+
+def _word_bounds(text: str, *, block: int = SCAN_BLOCK) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """Yield ``(starts, ends)`` character offsets of the words in *text*, block by block.
+
+    Each block is classified with NumPy, so only one block's worth of code
+    points is materialised at a time. A word cut by a block edge is carried
+    over and reported with the block in which it ends.
+    """
+
+    carried: int | None = None
+    for offset in range(0, len(text), block):
+        codes = np.frombuffer(text[offset : offset + block].encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+        separator = np.zeros(codes.size, dtype=bool)
+        known = codes < _SEPARATORS.size
+        separator[known] = _SEPARATORS[codes[known]]
+        edges = np.diff((~separator).astype(np.int8), prepend=np.int8(0), append=np.int8(0))
+        starts = np.flatnonzero(edges == 1) + offset
+        ends = np.flatnonzero(edges == -1) + offset
+
+        if carried is not None:
+            if starts.size and starts[0] == offset:
+                starts[0] = carried
+            else:
+                starts = np.concatenate(([carried], starts))
+                ends = np.concatenate(([offset], ends))
+            carried = None
+        if not separator[-1]:
+            carried = int(starts[-1])
+            starts, ends = starts[:-1], ends[:-1]
+        yield starts, ends
+
+    if carried is not None:
+        yield np.array([carried]), np.array([len(text)])
+
+
+def iter_chunks(
     text: str,
     *,
     chunk_size: int,
     overlap: int,
     prefix: str,
-) -> list[Chunk]:
-    """Split *text* into overlapping chunks using whitespace boundaries."""
+) -> Iterator[ChunkSpan]:
+    """Lazily yield overlapping windows of *text* in a single pass over its words.
+
+    Only the word offsets of the current window (plus one scan block) are
+    held in memory, and no window text is copied until :attr:`ChunkSpan.text`
+    is read. Windows cover the same words as :func:`chunk_text`.
+    """
 
     if chunk_size <= overlap:
         raise ValueError("chunk_size must be greater than overlap")
 
-    words = text.split()
-    if not words:
-        return []
-
     step = chunk_size - overlap
-    chunks: list[Chunk] = []
-
-    index = 0
+    starts = np.empty(0, dtype=np.int64)
+    ends = np.empty(0, dtype=np.int64)
+    base = 0  # word index of starts[0]
+    first = 0  # word index where the next window begins
     counter = 0
-    while index < len(words):
-        window = words[index : index + chunk_size]
-        chunk_text = " ".join(window)
-        start = index
-        end = min(len(words), index + chunk_size)
-        chunk_id = f"{prefix}_{counter}"
-        chunks.append(Chunk(id=chunk_id, text=chunk_text, start=start, end=end))
+
+    def _span(word_end: int) -> ChunkSpan:
+        return ChunkSpan(
+            id=f"{prefix}_{counter}",
+            source=text,
+            start=int(starts[first - base]),
+            end=int(ends[word_end - base - 1]),
+            word_start=first,
+            word_end=word_end,
+        )
+
+    for block_starts, block_ends in _word_bounds(text):
+        starts = np.concatenate((starts, block_starts))
+        ends = np.concatenate((ends, block_ends))
+        while first + chunk_size <= base + starts.size:
+            yield _span(first + chunk_size)
+            counter += 1
+            first += step
+        drop = first - base
+        starts, ends, base = starts[drop:], ends[drop:], first
+
+    total = base + starts.size
+    while first < total:
+        yield _span(total)
         counter += 1
-        index += step
+        first += step
+
+
+def chunk_text(
+    text: str,
+    *,
+    chunk_size: int,
+    overlap: int,
+    prefix: str,
+) -> list[Chunk]:
+    """Split *text* into overlapping chunks using whitespace boundaries.
+
+    Chunk text is whitespace-normalised and ``start``/``end`` are word
+    indices; use :func:`iter_chunks` for character offsets without copies.
+    """
 
-    return chunks
+    return [
+        Chunk(id=span.id, text=" ".join(span.text.split()), start=span.word_start, end=span.word_end)
+        for span in iter_chunks(text, chunk_size=chunk_size, overlap=overlap, prefix=prefix)
+    ]
 
 
 def flatten_texts(texts: Iterable[str]) -> str:
@@ -56,5 +152,5 @@ def flatten_texts(texts: Iterable[str]) -> str:
     return "\n\n".join(part.strip() for part in texts if part.strip())
 
 
-__all__ = ["Chunk", "chunk_text", "flatten_texts"]
+__all__ = ["Chunk", "ChunkSpan", "chunk_text", "flatten_texts", "iter_chunks"]
 
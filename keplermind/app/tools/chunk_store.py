@@ -0,0 +1,170 @@
+"""Cross-session SQLite store of chunked and embedded sources."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterable, Mapping, Sequence
+
+import numpy as np
+
+from ..mcp.stores import DEFAULT_MEMORY_DIR
+
+LOOKUP_BATCH = 500
+
+
+def space_key(meta: Mapping[str, Any]) -> str:
+    """Digest of the chunking and embedder parameters; chunks are only shared within one space."""
+
+    return hashlib.sha256(json.dumps(dict(meta), sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+class ChunkStore:
+    """SQLite table of chunks shared by every session.
+
+    Rows are keyed by the parameter space (:func:`space_key`) and the chunk id
+    ``{source_key}_{row}``, where ``source_key`` hashes the source content, so
+    a session researching an overlapping topic finds the chunks another session
+    already built. Vectors are ``float32`` BLOBs; text, source URL and a hash
+    of the chunk text sit alongside.
+    """
+
+    def __init__(self, path: Path | str | None = None) -> None:
+        self.path = Path(path) if path else DEFAULT_MEMORY_DIR / "chunks.sqlite"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript(
+            """
+            PRAGMA journal_mode = WAL;
+            CREATE TABLE IF NOT EXISTS chunks (
+                space TEXT NOT NULL,
+                id TEXT NOT NULL,
+                source_key TEXT NOT NULL,
+                row INTEGER NOT NULL,
+                source TEXT NOT NULL,
+                title TEXT NOT NULL,
+                text TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                start INTEGER NOT NULL,
+                "end" INTEGER NOT NULL,
+                dimensions INTEGER NOT NULL,
+                vector BLOB NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (space, id)
+            );
+            CREATE INDEX IF NOT EXISTS chunks_by_source ON chunks (space, source_key, row);
+            """
+        )
+        self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0])
+
+    @staticmethod
+    def _record(row: Sequence[Any]) -> dict[str, Any]:
+        chunk_id, source_key, source, title, text, start, end, vector = row
+        return {
+            "id": chunk_id,
+            "source_key": source_key,
+            "source": source,
+            "title": title,
+            "text": text,
+            "start": start,
+            "end": end,
+            "embedding": np.frombuffer(vector, dtype=np.float32),
+        }
+
+    def _select(self, space: str, column: str, values: Sequence[str]) -> list[dict[str, Any]]:
+        records: list[dict[str, Any]] = []
+        with self._lock:
+            for offset in range(0, len(values), LOOKUP_BATCH):
+                batch = values[offset : offset + LOOKUP_BATCH]
+                marks = ", ".join("?" for _ in batch)
+                cursor = self._conn.execute(
+                    f'SELECT id, source_key, source, title, text, start, "end", vector FROM chunks '
+                    f"WHERE space = ? AND {column} IN ({marks}) ORDER BY source_key, row",
+                    (space, *batch),
+                )
+                records.extend(self._record(row) for row in cursor.fetchall())
+        return records
+
+    def get_sources(self, meta: Mapping[str, Any], keys: Iterable[str]) -> dict[str, list[dict[str, Any]]]:
+        """Return the stored chunk records of each known source key, in row order."""
+
+        grouped: dict[str, list[dict[str, Any]]] = {}
+        for record in self._select(space_key(meta), "source_key", sorted(set(keys))):
+            grouped.setdefault(record["source_key"], []).append(record)
+        return grouped
+
+    def get_chunks(self, meta: Mapping[str, Any], ids: Sequence[str]) -> list[dict[str, Any]]:
+        """Return the records for *ids* in the order given; unknown ids are skipped."""
+
+        found = {record["id"]: record for record in self._select(space_key(meta), "id", sorted(set(ids)))}
+        return [found[chunk_id] for chunk_id in ids if chunk_id in found]
+
+    def put_sources(self, meta: Mapping[str, Any], grouped: Mapping[str, Sequence[Mapping[str, Any]]]) -> int:
+        """Insert every source's records in one transaction; existing chunks are kept.
+
+        Returns the number of rows written.
+        """
+
+        space = space_key(meta)
+        now = time.time()
+        rows = [
+            (
+                space,
+                f"{key}_{row}",
+                key,
+                row,
+                str(record.get("source", "")),
+                str(record.get("title", "")),
+                str(record["text"]),
+                text_hash(str(record["text"])),
+                int(record["start"]),
+                int(record["end"]),
+                len(record["embedding"]),
+                np.ascontiguousarray(record["embedding"], dtype=np.float32).tobytes(),
+                now,
+            )
+            for key, records in grouped.items()
+            for row, record in enumerate(records)
+        ]
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO chunks (space, id, source_key, row, source, title, text, content_hash, "
+                'start, "end", dimensions, vector, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                rows,
+            )
+            return self._conn.total_changes - before
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_default_store: ChunkStore | None = None
+_default_lock = threading.Lock()
+
+
+def default_chunk_store() -> ChunkStore:
+    """Return the shared store under the memory directory, opening it on first use."""
+
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = ChunkStore()
+        return _default_store
+
+
+__all__ = ["ChunkStore", "default_chunk_store", "space_key", "text_hash"]
@@ -0,0 +1,120 @@
+"""Near-duplicate detection for scraped sources via SimHash and LSH banding."""
+
+from __future__ import annotations
+
+import hashlib
+from collections import defaultdict
+from typing import Sequence
+
+import numpy as np
+
+SIGNATURE_BITS = 64
+
+
+def simhash(text: str, *, shingle_size: int = 3) -> int:
+    """Return a 64-bit SimHash over lower-cased word shingles of *text*."""
+
+    words = text.lower().split()
+    if not words:
+        return 0
+    width = min(shingle_size, len(words))
+    shingles = (" ".join(words[index : index + width]) for index in range(len(words) - width + 1))
+    count = len(words) - width + 1
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(item.encode("utf-8"), digest_size=8).digest(), "little") for item in shingles),
+        dtype=np.uint64,
+        count=count,
+    )
+    bits = np.unpackbits(hashes.view(np.uint8).reshape(count, 8), axis=1, bitorder="little")
+    votes = bits.sum(axis=0, dtype=np.int64) * 2 - count
+    packed = np.packbits(votes > 0, bitorder="little")
+    return int(packed.view("<u8")[0])
+
+
+def similarity(left: int, right: int) -> float:
+    """Fraction of matching signature bits."""
+
+    return 1.0 - (left ^ right).bit_count() / SIGNATURE_BITS
+
+
+class SimHashIndex:
+    """LSH index over SimHash signatures.
+
+    Signatures are cut into ``max_distance + 1`` bands; by the pigeonhole
+    principle two signatures within ``max_distance`` bits agree exactly on at
+    least one band, so only documents sharing a band bucket are compared.
+    """
+
+    def __init__(self, *, max_distance: int) -> None:
+        self.max_distance = max_distance
+        self._signatures: dict[int, int] = {}
+        self._buckets: dict[tuple[int, int], list[int]] = defaultdict(list)
+        bands = max_distance + 1
+        edges = [round(index * SIGNATURE_BITS / bands) for index in range(bands + 1)]
+        self._bands = [(start, (1 << (end - start)) - 1) for start, end in zip(edges, edges[1:])]
+
+    def _keys(self, signature: int) -> list[tuple[int, int]]:
+        return [(band, (signature >> start) & mask) for band, (start, mask) in enumerate(self._bands)]
+
+    def query(self, signature: int) -> list[int]:
+        """Return ids of indexed documents within ``max_distance`` bits."""
+
+        seen: set[int] = set()
+        matches: list[int] = []
+        for key in self._keys(signature):
+            for doc_id in self._buckets.get(key, ()):
+                if doc_id in seen:
+                    continue
+                seen.add(doc_id)
+                if (self._signatures[doc_id] ^ signature).bit_count() <= self.max_distance:
+                    matches.append(doc_id)
+        return sorted(matches)
+
+    def add(self, doc_id: int, signature: int) -> None:
+        self._signatures[doc_id] = signature
+        for key in self._keys(signature):
+            self._buckets[key].append(doc_id)
+
+
+class NearDuplicateFilter:
+    """Incremental filter: feed texts in order, get back the earlier text each copies.
+
+    Texts shorter than ``min_words`` are never merged: a handful of words is
+    too little evidence for SimHash to separate paraphrase from coincidence.
+    """
+
+    def __init__(self, *, threshold: float = 0.9, min_words: int = 30) -> None:
+        self.min_words = min_words
+        self._index = SimHashIndex(max_distance=int((1.0 - threshold) * SIGNATURE_BITS))
+
+    def check(self, position: int, text: str) -> int | None:
+        """Return the position *text* duplicates, or register it and return ``None``."""
+
+        if len(text.split()) < self.min_words:
+            return None
+        signature = simhash(text)
+        matches = self._index.query(signature)
+        if matches:
+            return matches[0]
+        self._index.add(position, signature)
+        return None
+
+
+def find_near_duplicates(
+    texts: Sequence[str],
+    *,
+    threshold: float = 0.9,
+    min_words: int = 30,
+) -> dict[int, int]:
+    """Map the index of each near-duplicate text to the earliest text it copies."""
+
+    detector = NearDuplicateFilter(threshold=threshold, min_words=min_words)
+    duplicates: dict[int, int] = {}
+    for position, text in enumerate(texts):
+        canonical = detector.check(position, text)
+        if canonical is not None:
+            duplicates[position] = canonical
+    return duplicates
+
+
+__all__ = ["NearDuplicateFilter", "SimHashIndex", "find_near_duplicates", "similarity", "simhash"]
@@ -3,31 +3,98 @@
 from __future__ import annotations
 
 import hashlib
-import math
+import re
+from collections import Counter
 from dataclasses import dataclass
+from typing import ClassVar, Sequence
 
+import numpy as np
 
-def _hash_to_unit_vector(payload: str, *, dimensions: int = 12) -> list[float]:
-    digest = hashlib.sha256(payload.encode("utf-8")).digest()
-    floats = [int.from_bytes(digest[i : i + 4], "big", signed=False) for i in range(0, 48, 4)]
-    floats = floats[:dimensions]
-    vector = [value / 2**32 for value in floats]
-    norm = math.sqrt(sum(component**2 for component in vector)) or 1.0
-    return [round(component / norm, 6) for component in vector]
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+_WORD = re.compile(r"\w+")
+
+
+def _seeds(texts: Sequence[str]) -> np.ndarray:
+    """One 64-bit BLAKE2b seed per text; the only per-text Python work."""
+
+    return np.fromiter(
+        (int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little") for text in texts),
+        dtype=np.uint64,
+        count=len(texts),
+    )
+
+
+def _expand(seeds: np.ndarray, dimensions: int) -> np.ndarray:
+    """Stretch each seed into ``dimensions`` uniform values in ``[0, 1)`` with SplitMix64."""
+
+    steps = np.arange(1, dimensions + 1, dtype=np.uint64) * _GOLDEN
+    with np.errstate(over="ignore"):
+        state = seeds[:, None] + steps[None, :]
+        state ^= state >> np.uint64(30)
+        state *= _MIX_1
+        state ^= state >> np.uint64(27)
+        state *= _MIX_2
+        state ^= state >> np.uint64(31)
+    # The top 24 bits are exactly representable in float32.
+    return (state >> np.uint64(40)).astype(np.float32) * np.float32(2.0**-24)
 
 
 @dataclass
 class DeterministicEmbedder:
-    """Minimal embedder producing reproducible vectors."""
+    """Minimal embedder producing reproducible unit vectors of any dimension."""
+
+    name: ClassVar[str] = "deterministic"
+    version: ClassVar[str] = "2"
 
     dimensions: int = 12
 
+    def embed_matrix(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed *texts* into a C-contiguous ``float32`` matrix of shape ``(n, dimensions)``."""
+
+        matrix = _expand(_seeds(texts), self.dimensions)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        matrix /= norms
+        return np.ascontiguousarray(matrix)
+
     def embed(self, text: str) -> list[float]:
-        return _hash_to_unit_vector(text, dimensions=self.dimensions)
+        return self.embed_batch([text])[0]
 
     def embed_batch(self, texts: list[str]) -> list[list[float]]:
-        return [_hash_to_unit_vector(text, dimensions=self.dimensions) for text in texts]
+        # JSON-friendly lists keep the historical six-decimal precision.
+        return np.round(self.embed_matrix(texts).astype(np.float64), 6).tolist()
+
+
+@dataclass
+class HashingEmbedder:
+    """Feature-hashed bag of words: texts sharing words get similar unit vectors.
+
+    Each distinct lower-cased word adds ``±(1 + log tf)`` to the bucket its
+    BLAKE2b seed selects; the seed's top bit picks the sign so collisions
+    tend to cancel. Texts without words embed to the zero vector.
+    """
+
+    name: ClassVar[str] = "hashing"
+    version: ClassVar[str] = "1"
+
+    dimensions: int = 256
 
+    def embed_matrix(self, texts: Sequence[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            counts = Counter(_WORD.findall(text.lower()))
+            if not counts:
+                continue
+            seeds = _seeds(list(counts))
+            weights = 1.0 + np.log(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))
+            signs = np.where(seeds >> np.uint64(63), np.float32(-1.0), np.float32(1.0))
+            np.add.at(matrix[row], (seeds % np.uint64(self.dimensions)).astype(np.intp), signs * weights)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        matrix /= norms
+        return matrix
 
-__all__ = ["DeterministicEmbedder"]
 
+__all__ = ["DeterministicEmbedder", "HashingEmbedder"]
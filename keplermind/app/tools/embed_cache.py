@@ -0,0 +1,320 @@
+"""Persistent embedding cache: memory-mapped vectors behind a SQLite key index."""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Protocol, Sequence
+
+import numpy as np
+
+from ..config.settings import settings
+from ..mcp.stores import DEFAULT_MEMORY_DIR
+
+INITIAL_ROWS = 1024
+_SQL_BATCH = 500
+
+
+class Embedder(Protocol):
+    name: str
+    version: str
+    dimensions: int
+
+    def embed_matrix(self, texts: Sequence[str]) -> np.ndarray: ...
+
+
+@dataclass(frozen=True)
+class EmbeddingSpace:
+    """Identity of an embedding model; vectors from different spaces never mix."""
+
+    name: str
+    version: str
+    dimensions: int
+
+    @classmethod
+    def of(cls, embedder: Embedder) -> "EmbeddingSpace":
+        return cls(embedder.name, embedder.version, embedder.dimensions)
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}-{self.version}-{self.dimensions}"
+
+
+def text_digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Vectors keyed by ``(embedder name, version, dimensions, sha256(text))``.
+
+    Each embedding space owns a ``float32`` row file that is memory-mapped and
+    grown by doubling; ``index.sqlite`` maps text digests to row slots. When the
+    cached vectors exceed ``max_bytes`` the least recently used rows are
+    dropped and their slots recycled, so the row files stop growing once the
+    budget is reached.
+    """
+
+    def __init__(self, root: Path | str | None = None, *, max_bytes: int | None = None) -> None:
+        self.root = Path(root) if root else DEFAULT_MEMORY_DIR / "embedding_cache"
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = settings.cache.embedding_max_bytes if max_bytes is None else max_bytes
+        self._lock = threading.Lock()
+        self._maps: dict[str, np.memmap] = {}
+        self._conn = sqlite3.connect(self.root / "index.sqlite", check_same_thread=False)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS vectors (
+                space TEXT NOT NULL,
+                digest TEXT NOT NULL,
+                slot INTEGER NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (space, digest)
+            );
+            CREATE INDEX IF NOT EXISTS vectors_lru ON vectors (accessed_at);
+            CREATE TABLE IF NOT EXISTS spaces (
+                space TEXT PRIMARY KEY,
+                dimensions INTEGER NOT NULL,
+                next_slot INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS free_slots (
+                space TEXT NOT NULL,
+                slot INTEGER NOT NULL,
+                PRIMARY KEY (space, slot)
+            );
+            """
+        )
+        self._conn.commit()
+
+    # ------------------------------------------------------------------
+    # Batch API
+    # ------------------------------------------------------------------
+    def get_many(self, space: EmbeddingSpace, texts: Sequence[str]) -> tuple[np.ndarray, np.ndarray]:
+        """Look up *texts* in one pass.
+
+        Returns ``(found, vectors)``: a boolean mask and an ``(n, dimensions)``
+        ``float32`` matrix whose rows are only meaningful where ``found`` is set.
+        """
+
+        digests = [text_digest(text) for text in texts]
+        found = np.zeros(len(texts), dtype=bool)
+        vectors = np.zeros((len(texts), space.dimensions), dtype=np.float32)
+        if not digests:
+            return found, vectors
+
+        with self._lock:
+            slots = self._lookup(space.key, sorted(set(digests)))
+            if slots:
+                with self._conn:
+                    self._conn.executemany(
+                        "UPDATE vectors SET accessed_at = ? WHERE space = ? AND digest = ?",
+                        [(time.time(), space.key, digest) for digest in slots],
+                    )
+                # Another process may have grown the row file since it was mapped.
+                rows = self._rows(space, minimum=max(slots.values()) + 1)
+                for position, digest in enumerate(digests):
+                    slot = slots.get(digest)
+                    if slot is not None:
+                        found[position] = True
+                        vectors[position] = rows[slot]
+        return found, vectors
+
+    def put_many(self, space: EmbeddingSpace, texts: Sequence[str], vectors: np.ndarray) -> None:
+        """Store one row of *vectors* per text, skipping digests already cached."""
+
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.shape != (len(texts), space.dimensions):
+            raise ValueError(f"Expected a ({len(texts)}, {space.dimensions}) matrix, got {vectors.shape}.")
+        pending: dict[str, int] = {}
+        for position, text in enumerate(texts):
+            pending.setdefault(text_digest(text), position)
+
+        with self._lock:
+            with self._conn:
+                # Holding the write lock from the digest check to the insert keeps
+                # processes sharing the cache from claiming the same slots.
+                self._conn.execute("BEGIN IMMEDIATE")
+                existing = self._lookup(space.key, sorted(pending))
+                fresh = [(digest, position) for digest, position in pending.items() if digest not in existing]
+                if not fresh:
+                    return
+                slots = self._allocate(space, len(fresh))
+                rows = self._rows(space, minimum=int(slots.max()) + 1)
+                rows[slots] = vectors[[position for _, position in fresh]]
+                # Vectors reach disk before the index points at them.
+                rows.flush()
+                now = time.time()
+                self._conn.executemany(
+                    "INSERT INTO vectors (space, digest, slot, accessed_at) VALUES (?, ?, ?, ?)",
+                    [(space.key, digest, int(slot), now) for (digest, _), slot in zip(fresh, slots)],
+                )
+            self._evict()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM vectors").fetchone()[0])
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._total_bytes()
+
+    def close(self) -> None:
+        with self._lock:
+            for rows in self._maps.values():
+                rows.flush()
+            self._maps.clear()
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _lookup(self, space_key: str, digests: list[str]) -> dict[str, int]:
+        slots: dict[str, int] = {}
+        for start in range(0, len(digests), _SQL_BATCH):
+            batch = digests[start : start + _SQL_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            for digest, slot in self._conn.execute(
+                f"SELECT digest, slot FROM vectors WHERE space = ? AND digest IN ({placeholders})",
+                (space_key, *batch),
+            ):
+                slots[digest] = int(slot)
+        return slots
+
+    def _path(self, space: EmbeddingSpace) -> Path:
+        return self.root / f"{space.key}.f32"
+
+    def _rows(self, space: EmbeddingSpace, *, minimum: int = 0) -> np.memmap:
+        """Return the memory map for *space*, growing the file to hold ``minimum`` rows."""
+
+        rows = self._maps.get(space.key)
+        path = self._path(space)
+        row_bytes = space.dimensions * 4
+        current = path.stat().st_size // row_bytes if path.exists() else 0
+        if rows is not None and rows.shape[0] >= minimum:
+            return rows
+
+        capacity = max(current, INITIAL_ROWS)
+        while capacity < minimum:
+            capacity *= 2
+        if capacity != current:
+            if rows is not None:
+                rows.flush()
+            with path.open("ab") as handle:
+                handle.truncate(capacity * row_bytes)
+        rows = np.memmap(path, dtype=np.float32, mode="r+", shape=(capacity, space.dimensions))
+        self._maps[space.key] = rows
+        return rows
+
+    def _allocate(self, space: EmbeddingSpace, count: int) -> np.ndarray:
+        """Claim *count* row slots; the caller holds an immediate transaction."""
+
+        self._conn.execute(
+            "INSERT OR IGNORE INTO spaces (space, dimensions) VALUES (?, ?)", (space.key, space.dimensions)
+        )
+        reused = [
+            int(row[0])
+            for row in self._conn.execute(
+                "SELECT slot FROM free_slots WHERE space = ? ORDER BY slot LIMIT ?", (space.key, count)
+            )
+        ]
+        if reused:
+            self._conn.executemany(
+                "DELETE FROM free_slots WHERE space = ? AND slot = ?", [(space.key, slot) for slot in reused]
+            )
+        next_slot = int(self._conn.execute("SELECT next_slot FROM spaces WHERE space = ?", (space.key,)).fetchone()[0])
+        extra = count - len(reused)
+        self._conn.execute("UPDATE spaces SET next_slot = ? WHERE space = ?", (next_slot + extra, space.key))
+        self._rows(space, minimum=next_slot + extra)
+        return np.array(reused + list(range(next_slot, next_slot + extra)), dtype=np.int64)
+
+    def _total_bytes(self) -> int:
+        row = self._conn.execute(
+            "SELECT COALESCE(SUM(spaces.dimensions * 4), 0) FROM vectors JOIN spaces USING (space)"
+        ).fetchone()
+        return int(row[0])
+
+    def _evict(self) -> None:
+        if self._total_bytes() <= self.max_bytes:
+            return
+        with self._conn:
+            # Re-read under the write lock so two processes never free the same slot twice.
+            self._conn.execute("BEGIN IMMEDIATE")
+            total = self._total_bytes()
+            rows = self._conn.execute(
+                """
+                SELECT vectors.space, vectors.digest, vectors.slot, spaces.dimensions
+                FROM vectors JOIN spaces USING (space)
+                ORDER BY vectors.accessed_at ASC
+                """
+            ).fetchall()
+            evicted: list[tuple[str, str, int]] = []
+            for space_key, digest, slot, dimensions in rows:
+                if total <= self.max_bytes:
+                    break
+                evicted.append((space_key, digest, int(slot)))
+                total -= int(dimensions) * 4
+            self._conn.executemany(
+                "DELETE FROM vectors WHERE space = ? AND digest = ?", [(space, digest) for space, digest, _ in evicted]
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO free_slots (space, slot) VALUES (?, ?)",
+                [(space, slot) for space, _, slot in evicted],
+            )
+
+
+class CachedEmbedder:
+    """Wrap an embedder so only texts missing from *cache* are embedded."""
+
+    def __init__(self, embedder: Embedder, cache: EmbeddingCache) -> None:
+        self.embedder = embedder
+        self.cache = cache
+        self.space = EmbeddingSpace.of(embedder)
+        self.name = embedder.name
+        self.version = embedder.version
+        self.dimensions = embedder.dimensions
+        self.hits = 0
+        self.misses = 0
+
+    def embed_matrix(self, texts: Sequence[str]) -> np.ndarray:
+        found, vectors = self.cache.get_many(self.space, texts)
+        missing = np.flatnonzero(~found)
+        self.hits += len(texts) - len(missing)
+        self.misses += len(missing)
+        if len(missing):
+            pending = [texts[index] for index in missing]
+            computed = self.embedder.embed_matrix(pending)
+            vectors[missing] = computed
+            self.cache.put_many(self.space, pending, computed)
+        return vectors
+
+    def embed(self, text: str) -> list[float]:
+        return self.embed_batch([text])[0]
+
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        return np.round(self.embed_matrix(texts).astype(np.float64), 6).tolist()
+
+
+_default_cache: EmbeddingCache | None = None
+_default_lock = threading.Lock()
+
+
+def default_embedding_cache() -> EmbeddingCache:
+    """Return the shared cache under the memory directory, opening it on first use."""
+
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = EmbeddingCache()
+        return _default_cache
+
+
+__all__ = [
+    "CachedEmbedder",
+    "EmbeddingCache",
+    "EmbeddingSpace",
+    "default_embedding_cache",
+    "text_digest",
+]
@@ -0,0 +1,234 @@
+"""Pooled HTTP fetcher with conditional GET revalidation."""
+
+from __future__ import annotations
+
+import codecs
+import itertools
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Iterator
+
+from ..config.settings import settings
+
+try:  # pragma: no cover - optional dependency
+    import requests
+    from requests.adapters import HTTPAdapter
+    from requests.compat import chardet
+except ImportError:  # pragma: no cover - fallback path
+    requests = None  # type: ignore[assignment]
+    HTTPAdapter = None  # type: ignore[assignment,misc]
+    chardet = None
+
+try:  # pragma: no cover - optional dependency handling
+    import brotli
+except ImportError:  # pragma: no cover - fallback path
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None  # type: ignore[assignment]
+
+
+USER_AGENT = "KeplerMind/0.1"
+HTML_CONTENT_TYPES = {"text/html", "application/xhtml+xml", "text/plain"}
+SNIFF_BYTES = 8192
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([a-z0-9_:.-]+)""", re.IGNORECASE)
+
+
+class FetchError(RuntimeError):
+    """Raised when the HTTP stack is unavailable or a response is unusable."""
+
+
+class UnsupportedContent(FetchError):
+    """Raised when the response headers announce a non-HTML payload."""
+
+
+def _known(encoding: str | None) -> str | None:
+    if not encoding:
+        return None
+    try:
+        return codecs.lookup(encoding).name
+    except LookupError:
+        return None
+
+
+def sniff_encoding(head: bytes) -> str:
+    """Guess the encoding of a body served without a header charset.
+
+    Checks for a byte-order mark, then a ``<meta charset>`` declaration in
+    *head*, then the same detector ``requests`` uses for ``apparent_encoding``,
+    falling back to UTF-8.
+    """
+
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding
+    declared = _META_CHARSET.search(head)
+    if declared is not None:
+        encoding = _known(declared.group(1).decode("ascii"))
+        # A declaration readable as ASCII cannot really be UTF-16/32.
+        if encoding is not None and not encoding.startswith(("utf-16", "utf-32")):
+            return encoding
+    if chardet is not None and head:
+        detected = _known(chardet.detect(head).get("encoding"))
+        # An ASCII-only prefix says nothing about later bytes; UTF-8 is a superset.
+        if detected is not None and detected != "ascii":
+            return detected
+    return "utf-8"
+
+
+@dataclass(frozen=True)
+class _CachedPage:
+    text: str
+    etag: str | None
+    last_modified: str | None
+
+
+class HttpFetcher:
+    """Callable ``FetchFn`` backed by a keep-alive ``requests.Session``.
+
+    Pages that carried an ``ETag`` or ``Last-Modified`` header are remembered
+    (up to ``max_cached_pages``) and revalidated with ``If-None-Match`` /
+    ``If-Modified-Since``; a ``304`` response reuses the remembered body.
+
+    Bodies are streamed: non-HTML content types are rejected from the headers
+    before any of the body is read, and reading stops after ``max_bytes``.
+    Without a header charset the first ``SNIFF_BYTES`` are buffered and
+    passed to ``sniff_encoding`` before decoding starts.
+    """
+
+    def __init__(
+        self,
+        *,
+        timeout: float = 10.0,
+        pool_connections: int = 16,
+        pool_maxsize: int = 16,
+        max_cached_pages: int = 256,
+        max_bytes: int | None = None,
+        chunk_bytes: int | None = None,
+        session: requests.Session | None = None,
+    ) -> None:
+        if requests is None:
+            raise FetchError("requests library is not available in the environment")
+        self.timeout = timeout
+        self.max_cached_pages = max_cached_pages
+        self.max_bytes = settings.scrape.max_bytes if max_bytes is None else max_bytes
+        self.chunk_bytes = settings.scrape.chunk_bytes if chunk_bytes is None else chunk_bytes
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        encodings = "gzip, deflate, br" if brotli is not None else "gzip, deflate"
+        self.session.headers.update({"Accept-Encoding": encodings, "User-Agent": USER_AGENT})
+        self._pages: OrderedDict[str, _CachedPage] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __call__(self, url: str) -> str:
+        return "".join(self.stream(url))
+
+    def stream(self, url: str) -> Iterator[str]:
+        """Yield the decoded body of *url* piece by piece as it arrives."""
+
+        cached = self._lookup(url)
+        headers: dict[str, str] = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        with self.session.get(url, headers=headers, timeout=self.timeout, stream=True) as response:
+            if response.status_code == 304 and cached is not None:
+                yield cached.text
+                return
+            response.raise_for_status()
+
+            content_type = response.headers.get("Content-Type", "")
+            media_type = content_type.split(";", 1)[0].strip().lower()
+            if media_type and media_type not in HTML_CONTENT_TYPES:
+                raise UnsupportedContent(f"{url} serves {media_type}, not HTML")
+            blocks = response.iter_content(chunk_size=self.chunk_bytes)
+            head: list[bytes] = []
+            if "charset=" in content_type.lower():
+                encoding = response.encoding
+            else:
+                sniffed = 0
+                for block in blocks:
+                    head.append(block)
+                    sniffed += len(block)
+                    if sniffed >= SNIFF_BYTES:
+                        break
+                encoding = sniff_encoding(b"".join(head)[: self.max_bytes])
+            try:
+                decoder = codecs.getincrementaldecoder(encoding or "utf-8")(errors="replace")
+            except LookupError:
+                decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            keep = bool(etag or last_modified)
+            pieces: list[str] = []
+            received = 0
+            truncated = False
+            for block in itertools.chain(head, blocks):
+                if received + len(block) > self.max_bytes:
+                    block = block[: self.max_bytes - received]
+                    truncated = True
+                received += len(block)
+                piece = decoder.decode(block)
+                if piece:
+                    if keep:
+                        pieces.append(piece)
+                    yield piece
+                if truncated:
+                    break
+            tail = decoder.decode(b"", final=True)
+            if tail:
+                if keep:
+                    pieces.append(tail)
+                yield tail
+
+        if keep and not truncated:
+            self._remember(url, _CachedPage(text="".join(pieces), etag=etag, last_modified=last_modified))
+
+    def close(self) -> None:
+        self.session.close()
+
+    def _lookup(self, url: str) -> _CachedPage | None:
+        with self._lock:
+            page = self._pages.get(url)
+            if page is not None:
+                self._pages.move_to_end(url)
+            return page
+
+    def _remember(self, url: str, page: _CachedPage) -> None:
+        with self._lock:
+            self._pages[url] = page
+            self._pages.move_to_end(url)
+            while len(self._pages) > self.max_cached_pages:
+                self._pages.popitem(last=False)
+
+
+_default_fetcher: HttpFetcher | None = None
+_default_lock = threading.Lock()
+
+
+def default_fetcher() -> HttpFetcher:
+    """Return the process-wide shared fetcher, creating it on first use."""
+
+    global _default_fetcher
+    with _default_lock:
+        if _default_fetcher is None:
+            _default_fetcher = HttpFetcher()
+        return _default_fetcher
+
+
+__all__ = ["FetchError", "HttpFetcher", "UnsupportedContent", "default_fetcher", "sniff_encoding"]
@@ -0,0 +1,144 @@
+"""Process-pool ingestion: extract → chunk → embed documents off the main core."""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Iterator, Protocol, Sequence
+
+import numpy as np
+
+from .chunk import iter_chunks
+from .embed import DeterministicEmbedder, HashingEmbedder
+from .scrape import extract_text
+
+# Embedders a worker process can rebuild from ``(name, dimensions)`` alone.
+POOL_EMBEDDERS = {cls.name: cls for cls in (DeterministicEmbedder, HashingEmbedder)}
+
+
+class _Embedder(Protocol):
+    name: str
+    version: str
+    dimensions: int
+
+    def embed_matrix(self, texts: Sequence[str]) -> np.ndarray: ...
+
+
+@dataclass(frozen=True)
+class IngestJob:
+    """One document to ingest: plain ``text``, or raw ``html`` to extract first.
+
+    ``skip`` lists chunk rows whose vectors the caller already holds; they
+    are not embedded and come back as zero rows.
+    """
+
+    text: str | None = None
+    html: str | None = None
+    engine: str | None = None
+    skip: tuple[int, ...] = ()
+
+
+@dataclass(frozen=True)
+class IngestedDocument:
+    """Compact ingestion result that pickles as a few flat buffers.
+
+    ``offsets`` rows are ``(word_start, word_end, char_start, char_end)``;
+    character offsets index into ``text``, so each chunk is a slice rather
+    than a separately shipped string.
+    """
+
+    title: str
+    text: str
+    word_count: int
+    offsets: np.ndarray
+    vectors: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.offsets.shape[0])
+
+    def chunk(self, row: int) -> str:
+        return self.text[int(self.offsets[row, 2]) : int(self.offsets[row, 3])]
+
+
+def chunk_offsets(text: str, *, chunk_size: int, overlap: int) -> np.ndarray:
+    """Return the ``(word_start, word_end, char_start, char_end)`` rows of *text*'s chunks."""
+
+    spans = iter_chunks(text, chunk_size=chunk_size, overlap=overlap, prefix="")
+    rows = [(span.word_start, span.word_end, span.start, span.end) for span in spans]
+    return np.array(rows, dtype=np.int64).reshape(-1, 4)
+
+
+def ingest_document(job: IngestJob, *, chunk_size: int, overlap: int, embedder: _Embedder) -> IngestedDocument:
+    """Extract, window and embed a single document in the current process."""
+
+    title = ""
+    raw = job.text or ""
+    if job.html is not None:
+        title, raw = extract_text(job.html, engine=job.engine)
+
+    offsets = chunk_offsets(raw, chunk_size=chunk_size, overlap=overlap)
+    vectors = np.zeros((len(offsets), embedder.dimensions), dtype=np.float32)
+    rows = np.setdiff1d(np.arange(len(offsets)), np.asarray(job.skip, dtype=np.int64))
+    if len(rows):
+        vectors[rows] = embedder.embed_matrix([raw[offsets[row, 2] : offsets[row, 3]] for row in rows])
+    word_count = int(offsets[-1, 1]) if len(offsets) else 0
+    return IngestedDocument(title=title, text=raw, word_count=word_count, offsets=offsets, vectors=vectors)
+
+
+def pool_embedder(embedder: _Embedder) -> str | None:
+    """Name under which workers can rebuild *embedder*, or ``None`` if they cannot."""
+
+    cls = POOL_EMBEDDERS.get(embedder.name)
+    return embedder.name if cls is not None and cls.version == embedder.version else None
+
+
+def _worker(job: IngestJob, *, chunk_size: int, overlap: int, embedder: str, dimensions: int) -> IngestedDocument:
+    return ingest_document(job, chunk_size=chunk_size, overlap=overlap, embedder=POOL_EMBEDDERS[embedder](dimensions))
+
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+def iter_ingest(
+    jobs: Sequence[IngestJob],
+    *,
+    chunk_size: int,
+    overlap: int,
+    dimensions: int = 12,
+    embedder: str = DeterministicEmbedder.name,
+    workers: int | None = None,
+) -> Iterator[IngestedDocument]:
+    """Yield one :class:`IngestedDocument` per job, in job order.
+
+    With more than one worker the jobs are fanned out to a
+    ``ProcessPoolExecutor`` in batches; each worker builds its own instance
+    of the ``POOL_EMBEDDERS`` entry named *embedder*, so only job payloads and
+    compact results cross process boundaries.
+    """
+
+    workers = default_workers() if workers is None else workers
+    task = partial(_worker, chunk_size=chunk_size, overlap=overlap, embedder=embedder, dimensions=dimensions)
+    if workers <= 1 or len(jobs) <= 1:
+        for job in jobs:
+            yield task(job)
+        return
+
+    workers = min(workers, len(jobs))
+    batch = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(task, jobs, chunksize=batch)
+
+
+__all__ = [
+    "POOL_EMBEDDERS",
+    "IngestJob",
+    "IngestedDocument",
+    "chunk_offsets",
+    "default_workers",
+    "ingest_document",
+    "iter_ingest",
+    "pool_embedder",
+]
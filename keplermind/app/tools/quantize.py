@@ -0,0 +1,305 @@
+"""Quantized embedding storage: per-vector int8 and product quantization."""
+
+from __future__ import annotations
+
+import json
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import ClassVar
+
+import numpy as np
+
+FORMAT = "keplermind-quantized"
+FORMAT_VERSION = 1
+SCORE_BLOCK = 65536
+
+
+def _best(scores: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    k = min(k, scores.shape[1])
+    picked = np.argpartition(-scores, k - 1, axis=1)[:, :k] if k < scores.shape[1] else np.argsort(-scores, axis=1)
+    values = np.take_along_axis(scores, picked, axis=1)
+    order = np.argsort(-values, axis=1, kind="stable")
+    return np.take_along_axis(picked, order, axis=1), np.take_along_axis(values, order, axis=1)
+
+
+def _kmeans(vectors: np.ndarray, k: int, *, iterations: int, rng: np.random.Generator) -> np.ndarray:
+    """Plain Lloyd k-means under squared Euclidean distance."""
+
+    centroids = vectors[rng.choice(vectors.shape[0], size=k, replace=False)].copy()
+    for _ in range(iterations):
+        # ||x||² is constant per row, so it does not affect the argmin.
+        assignment = np.argmin((centroids**2).sum(axis=1) - 2 * vectors @ centroids.T, axis=1)
+        counts = np.bincount(assignment, minlength=k)
+        filled = counts > 0
+        for column in range(vectors.shape[1]):
+            sums = np.bincount(assignment, weights=vectors[:, column], minlength=k)
+            centroids[filled, column] = sums[filled] / counts[filled]
+    return centroids
+
+
+class QuantizedVectors(ABC):
+    """Compressed rows supporting asymmetric inner-product search.
+
+    Stored vectors are quantized but queries stay in ``float32`` (asymmetric
+    distance computation), and :meth:`search` can re-rank a shortlist against
+    the exact vectors, which may be a memory-mapped matrix left on disk.
+    """
+
+    kind: ClassVar[str]
+    codes: np.ndarray
+
+    def __init__(self, dimensions: int) -> None:
+        self.dimensions = dimensions
+
+    def __len__(self) -> int:
+        return int(self.codes.shape[0])
+
+    @property
+    def nbytes(self) -> int:
+        """Resident size of the compressed store."""
+
+        return sum(int(array.nbytes) for array in self._arrays().values())
+
+    @abstractmethod
+    def _arrays(self) -> dict[str, np.ndarray]:
+        """Named arrays persisted by :meth:`save`."""
+
+    @abstractmethod
+    def add(self, vectors: np.ndarray) -> None:
+        """Quantize and append *vectors*."""
+
+    @abstractmethod
+    def approximate_scores(self, queries: np.ndarray, start: int, end: int) -> np.ndarray:
+        """Estimated inner products of *queries* with rows ``start:end``."""
+
+    def search(
+        self,
+        queries: np.ndarray,
+        *,
+        top_k: int,
+        exact: np.ndarray | None = None,
+        rerank: int | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Return ``(ids, scores)`` of shape ``(m, top_k)``, best first.
+
+        With ``exact`` (the full-precision rows), ``rerank`` candidates
+        (default ``4 * top_k``) are shortlisted from the codes and re-scored
+        exactly; only those rows of ``exact`` are read.
+        """
+
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        if not len(self) or top_k <= 0:
+            empty = np.zeros((queries.shape[0], 0))
+            return empty.astype(np.int64), empty.astype(np.float32)
+        shortlist = top_k if exact is None else max(top_k, rerank or 4 * top_k)
+        best_ids: np.ndarray | None = None
+        best_scores: np.ndarray | None = None
+        for start in range(0, len(self), SCORE_BLOCK):
+            end = min(start + SCORE_BLOCK, len(self))
+            ids, scores = _best(self.approximate_scores(queries, start, end), shortlist)
+            ids = ids + start
+            if best_ids is not None:
+                ids = np.concatenate((best_ids, ids), axis=1)
+                scores = np.concatenate((best_scores, scores), axis=1)
+                picked, scores = _best(scores, shortlist)
+                ids = np.take_along_axis(ids, picked, axis=1)
+            best_ids, best_scores = ids, scores
+        assert best_ids is not None and best_scores is not None
+        if exact is None:
+            return best_ids, best_scores
+
+        candidates = np.asarray(exact[best_ids.ravel()], dtype=np.float32).reshape(*best_ids.shape, -1)
+        picked, values = _best(np.einsum("mkd,md->mk", candidates, queries), top_k)
+        return np.take_along_axis(best_ids, picked, axis=1), values
+
+    def save(self, directory: Path | str) -> Path:
+        """Write the codes as ``.npy`` arrays plus a manifest and return its path."""
+
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name, array in self._arrays().items():
+            staged = directory / f".{name}.npy.tmp"
+            with staged.open("wb") as handle:
+                np.save(handle, array)
+            os.replace(staged, directory / f"{name}.npy")
+        manifest = directory / "manifest.json"
+        manifest.write_text(
+            json.dumps(
+                {
+                    "format": FORMAT,
+                    "version": FORMAT_VERSION,
+                    "kind": self.kind,
+                    "dimensions": self.dimensions,
+                    "count": len(self),
+                },
+                indent=2,
+            ),
+            encoding="utf-8",
+        )
+        return manifest
+
+
+class Int8Vectors(QuantizedVectors):
+    """Scalar quantization: one ``int8`` per component and a ``float32`` scale per row.
+
+    Each row is divided by ``max(|x|) / 127`` before rounding, so a row costs
+    ``d + 4`` bytes instead of ``4 * d``.
+    """
+
+    kind = "int8"
+
+    def __init__(self, dimensions: int) -> None:
+        super().__init__(dimensions)
+        self.codes = np.empty((0, dimensions), dtype=np.int8)
+        self.scales = np.empty(0, dtype=np.float32)
+
+    def _arrays(self) -> dict[str, np.ndarray]:
+        return {"codes": self.codes, "scales": self.scales}
+
+    @classmethod
+    def from_vectors(cls, vectors: np.ndarray) -> "Int8Vectors":
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        store = cls(int(vectors.shape[1]))
+        store.add(vectors)
+        return store
+
+    def add(self, vectors: np.ndarray) -> None:
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        scales = np.abs(vectors).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        codes = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+        self.codes = np.concatenate((self.codes, codes))
+        self.scales = np.concatenate((self.scales, scales.astype(np.float32)))
+
+    def decode(self) -> np.ndarray:
+        return self.codes.astype(np.float32) * self.scales[:, None]
+
+    def approximate_scores(self, queries: np.ndarray, start: int, end: int) -> np.ndarray:
+        return (queries @ self.codes[start:end].T.astype(np.float32)) * self.scales[start:end]
+
+
+class PQVectors(QuantizedVectors):
+    """Product quantization: ``subspaces`` one-byte codes per row.
+
+    Rows are split into ``subspaces`` equal slices, each encoded as the id of
+    its nearest centroid in a per-slice codebook. A query builds a
+    ``(subspaces, centroids)`` lookup table of partial inner products once and
+    then scores every row with table lookups. Codes are kept subspace-major,
+    ``(subspaces, n)``, so each lookup gathers from one contiguous run.
+    """
+
+    kind = "pq"
+
+    def __init__(self, codebooks: np.ndarray) -> None:
+        subspaces, _, width = codebooks.shape
+        super().__init__(int(subspaces * width))
+        self.codebooks = np.asarray(codebooks, dtype=np.float32)
+        self.codes = np.empty((subspaces, 0), dtype=np.uint8)
+
+    def __len__(self) -> int:
+        return int(self.codes.shape[1])
+
+    @property
+    def subspaces(self) -> int:
+        return int(self.codebooks.shape[0])
+
+    def _arrays(self) -> dict[str, np.ndarray]:
+        return {"codes": self.codes, "codebooks": self.codebooks}
+
+    @classmethod
+    def train(
+        cls,
+        vectors: np.ndarray,
+        *,
+        subspaces: int,
+        centroids: int = 256,
+        iterations: int = 12,
+        train_size: int = 16384,
+        seed: int = 0,
+    ) -> "PQVectors":
+        """Learn one k-means codebook per slice from (a sample of) *vectors*."""
+
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        count, dimensions = vectors.shape
+        if count == 0:
+            raise ValueError("Cannot train a product quantizer on zero vectors.")
+        if dimensions % subspaces:
+            raise ValueError(f"{dimensions} dimensions do not split into {subspaces} subspaces.")
+        if not 1 <= centroids <= 256:
+            raise ValueError("Product quantizer codes are one byte: use at most 256 centroids.")
+        rng = np.random.default_rng(seed)
+        sample = vectors if count <= train_size else vectors[rng.choice(count, size=train_size, replace=False)]
+        k = min(centroids, sample.shape[0])
+        width = dimensions // subspaces
+        codebooks = np.stack(
+            [
+                _kmeans(sample[:, part * width : (part + 1) * width], k, iterations=iterations, rng=rng)
+                for part in range(subspaces)
+            ]
+        )
+        return cls(codebooks)
+
+    @classmethod
+    def from_vectors(cls, vectors: np.ndarray, *, subspaces: int, **options: int) -> "PQVectors":
+        store = cls.train(vectors, subspaces=subspaces, **options)
+        store.add(vectors)
+        return store
+
+    def add(self, vectors: np.ndarray) -> None:
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        width = self.codebooks.shape[2]
+        codes = np.empty((self.subspaces, vectors.shape[0]), dtype=np.uint8)
+        for start in range(0, vectors.shape[0], SCORE_BLOCK):
+            block = vectors[start : start + SCORE_BLOCK]
+            for part, codebook in enumerate(self.codebooks):
+                piece = block[:, part * width : (part + 1) * width]
+                distances = (codebook**2).sum(axis=1) - 2 * piece @ codebook.T
+                codes[part, start : start + len(block)] = np.argmin(distances, axis=1)
+        self.codes = np.concatenate((self.codes, codes), axis=1)
+
+    def decode(self) -> np.ndarray:
+        parts = [codebook[codes] for codebook, codes in zip(self.codebooks, self.codes)]
+        return np.concatenate(parts, axis=1)
+
+    def approximate_scores(self, queries: np.ndarray, start: int, end: int) -> np.ndarray:
+        width = self.codebooks.shape[2]
+        tables = np.einsum("msw,skw->msk", queries.reshape(queries.shape[0], self.subspaces, width), self.codebooks)
+        scores = np.zeros((queries.shape[0], end - start), dtype=np.float32)
+        for part in range(self.subspaces):
+            scores += np.take(tables[:, part], self.codes[part, start:end], axis=1)
+        return scores
+
+
+def quantize(vectors: np.ndarray, kind: str, *, subspaces: int | None = None) -> QuantizedVectors:
+    """Build an ``"int8"`` or ``"pq"`` store over *vectors*."""
+
+    if kind == Int8Vectors.kind:
+        return Int8Vectors.from_vectors(vectors)
+    if kind == PQVectors.kind:
+        dimensions = int(np.atleast_2d(vectors).shape[1])
+        return PQVectors.from_vectors(vectors, subspaces=subspaces or max(1, dimensions // 4))
+    raise ValueError(f"Unknown quantization {kind!r}; expected 'int8' or 'pq'.")
+
+
+def load_quantized(directory: Path | str, *, mmap: bool = True) -> QuantizedVectors:
+    """Open a store written by :meth:`QuantizedVectors.save`."""
+
+    directory = Path(directory)
+    manifest = json.loads((directory / "manifest.json").read_text(encoding="utf-8"))
+    if manifest.get("format") != FORMAT or manifest.get("version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported quantized store in {directory}.")
+    mode = "r" if mmap else None
+    store: QuantizedVectors
+    if manifest.get("kind") == Int8Vectors.kind:
+        store = Int8Vectors(int(manifest["dimensions"]))
+        store.scales = np.load(directory / "scales.npy", mmap_mode=mode)
+    elif manifest.get("kind") == PQVectors.kind:
+        store = PQVectors(np.load(directory / "codebooks.npy"))
+    else:
+        raise ValueError(f"Unknown quantized store kind in {directory}.")
+    store.codes = np.load(directory / "codes.npy", mmap_mode=mode)
+    return store
+
+
+__all__ = ["Int8Vectors", "PQVectors", "QuantizedVectors", "load_quantized", "quantize"]
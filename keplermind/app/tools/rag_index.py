@@ -0,0 +1,157 @@
+"""Binary on-disk RAG index: memory-mapped embeddings plus a JSONL chunk sidecar."""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .bm25 import BM25Builder
+
+FORMAT = "keplermind-rag"
+FORMAT_VERSION = 1
+MANIFEST = "manifest.json"
+EMBEDDINGS = "embeddings.npy"
+CHUNKS = "chunks.jsonl"
+
+
+class RagIndexError(RuntimeError):
+    """Raised when an index directory is missing or malformed."""
+
+
+@dataclass
+class RagIndex:
+    """Chunk metadata alongside an ``(n, dimensions)`` ``float32`` embedding matrix.
+
+    On disk an index is a directory holding ``manifest.json`` (chunking and
+    embedder parameters), ``embeddings.npy`` and ``chunks.jsonl`` with one
+    metadata object per matrix row. :meth:`load` memory-maps the matrix, so
+    opening even a large index costs only the metadata parse.
+    """
+
+    chunks: list[dict[str, Any]]
+    embeddings: np.ndarray
+    meta: dict[str, Any] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        if self.embeddings.ndim != 2 or self.embeddings.shape[0] != len(self.chunks):
+            raise RagIndexError(
+                f"Expected one embedding row per chunk, got {self.embeddings.shape} for {len(self.chunks)} chunks."
+            )
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    @property
+    def dimensions(self) -> int:
+        return int(self.embeddings.shape[1])
+
+    @classmethod
+    def from_records(
+        cls,
+        records: list[dict[str, Any]],
+        *,
+        meta: dict[str, Any],
+        dimensions: int,
+        lexical: "BM25Builder | None" = None,
+    ) -> "RagIndex":
+        """Split in-memory chunk records (each carrying an ``embedding``) into metadata and a matrix.
+
+        When a ``lexical`` builder is given, each record's text is fed to it in
+        the same pass, so its document ids line up with the matrix rows.
+        """
+
+        chunks: list[dict[str, Any]] = []
+        embeddings = np.zeros((len(records), dimensions), dtype=np.float32)
+        for row, record in enumerate(records):
+            chunks.append({key: value for key, value in record.items() if key != "embedding"})
+            embeddings[row] = record["embedding"]
+            if lexical is not None:
+                lexical.add(str(record.get("text", "")))
+        return cls(chunks=chunks, embeddings=embeddings, meta=dict(meta))
+
+    def records(self) -> list[dict[str, Any]]:
+        """Inverse of :meth:`from_records`; embedding rows are views into the matrix."""
+
+        return [{**chunk, "embedding": self.embeddings[row]} for row, chunk in enumerate(self.chunks)]
+
+    def save(self, directory: Path | str) -> Path:
+        """Write the index into *directory* and return the manifest path.
+
+        Files are written beside their targets and renamed into place, so
+        matrices still memory-mapped from a previous save stay valid, and the
+        manifest goes last so readers never see it next to half-written data.
+        """
+
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        staged = directory / f".{EMBEDDINGS}.tmp"
+        with staged.open("wb") as handle:
+            np.save(handle, np.ascontiguousarray(self.embeddings, dtype=np.float32))
+        os.replace(staged, directory / EMBEDDINGS)
+        staged = directory / f".{CHUNKS}.tmp"
+        with staged.open("w", encoding="utf-8") as handle:
+            for chunk in self.chunks:
+                handle.write(json.dumps(chunk, ensure_ascii=False) + "\n")
+        os.replace(staged, directory / CHUNKS)
+        manifest = {
+            **self.meta,
+            "format": FORMAT,
+            "version": FORMAT_VERSION,
+            "count": len(self.chunks),
+            "dtype": "float32",
+        }
+        manifest.setdefault("dimensions", self.dimensions)
+        manifest_path = directory / MANIFEST
+        manifest_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        return manifest_path
+
+    @classmethod
+    def load(cls, path: Path | str, *, mmap: bool = True) -> "RagIndex":
+        """Open an index from its directory, its manifest, or a legacy ``rag_index.json``."""
+
+        path = Path(path)
+        if path.suffix == ".json" and path.name != MANIFEST:
+            return cls.load_json(path)
+        directory = path.parent if path.name == MANIFEST else path
+        try:
+            manifest = json.loads((directory / MANIFEST).read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            raise RagIndexError(f"Cannot read RAG index manifest in {directory}: {exc}") from exc
+        if manifest.get("format") != FORMAT or manifest.get("version") != FORMAT_VERSION:
+            raise RagIndexError(f"Unsupported RAG index format in {directory}.")
+
+        embeddings = np.load(directory / EMBEDDINGS, mmap_mode="r" if mmap else None)
+        with (directory / CHUNKS).open("r", encoding="utf-8") as handle:
+            chunks = [json.loads(line) for line in handle if line.strip()]
+        meta = {key: value for key, value in manifest.items() if key not in {"format", "version", "count", "dtype"}}
+        return cls(chunks=chunks, embeddings=embeddings, meta=meta)
+
+    def export_json(self, path: Path | str) -> Path:
+        """Write the legacy single-file ``rag_index.json`` layout, for debugging."""
+
+        path = Path(path)
+        records = [
+            {**chunk, "embedding": [round(float(value), 6) for value in self.embeddings[row]]}
+            for row, chunk in enumerate(self.chunks)
+        ]
+        path.write_text(json.dumps({"meta": self.meta, "chunks": records}, indent=2), encoding="utf-8")
+        return path
+
+    @classmethod
+    def load_json(cls, path: Path | str) -> "RagIndex":
+        try:
+            payload = json.loads(Path(path).read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            raise RagIndexError(f"Cannot read RAG index {path}: {exc}") from exc
+        records = payload.get("chunks") or []
+        dimensions = len(records[0]["embedding"]) if records else 0
+        return cls.from_records(records, meta=payload.get("meta") or {}, dimensions=dimensions)
+
+
+__all__ = ["RagIndex", "RagIndexError"]
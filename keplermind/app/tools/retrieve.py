@@ -0,0 +1,302 @@
+"""Top-k vector and hybrid (vector + BM25) retrieval over the RAG index."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Mapping, Protocol, Sequence
+
+import numpy as np
+
+from ..config.settings import settings
+from .ann import IVFIndex
+from .bm25 import BM25Index, reciprocal_rank_fusion
+from .embed import DeterministicEmbedder
+from .quantize import QuantizedVectors, load_quantized
+from .rag_index import RagIndex, RagIndexError
+
+ANN_DIRECTORY = "ivf"
+LEXICAL_DIRECTORY = "bm25"
+QUANTIZED_DIRECTORY = "quantized"
+
+QUERY_BLOCK = 256
+
+
+class _Embedder(Protocol):
+    def embed_matrix(self, texts: Sequence[str]) -> np.ndarray: ...
+
+
+@dataclass(frozen=True)
+class Hit:
+    """A retrieved chunk with its row in the embedding matrix.
+
+    ``score`` is the cosine similarity, or the fused RRF score for hybrid search.
+    """
+
+    row: int
+    score: float
+    chunk: Mapping[str, Any]
+
+
+def select_top_k(scores: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """Return ``(indices, values)`` of the ``k`` largest scores per row, best first.
+
+    ``argpartition`` selects the candidates in linear time; only those ``k``
+    are then sorted.
+    """
+
+    k = min(k, scores.shape[1])
+    if k < scores.shape[1]:
+        picked = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        picked = np.broadcast_to(np.arange(scores.shape[1]), scores.shape).copy()
+    values = np.take_along_axis(scores, picked, axis=1)
+    order = np.argsort(-values, axis=1, kind="stable")
+    return np.take_along_axis(picked, order, axis=1), np.take_along_axis(values, order, axis=1)
+
+
+def mmr(
+    query: np.ndarray,
+    candidates: np.ndarray,
+    vectors: np.ndarray,
+    *,
+    k: int,
+    diversity: float,
+) -> list[int]:
+    """Maximal marginal relevance: greedily trade query similarity for novelty.
+
+    *candidates* are row ids into *vectors*; ``diversity`` of 0 reproduces the
+    plain ranking and 1 ignores the query after the first pick.
+    """
+
+    pool = vectors[candidates]
+    relevance = pool @ query
+    redundancy = np.full(len(candidates), -np.inf, dtype=np.float32)
+    chosen: list[int] = []
+    available = np.ones(len(candidates), dtype=bool)
+    for _ in range(min(k, len(candidates))):
+        penalty = np.where(np.isfinite(redundancy), redundancy, 0.0)
+        objective = (1.0 - diversity) * relevance - diversity * penalty
+        objective[~available] = -np.inf
+        best = int(np.argmax(objective))
+        chosen.append(best)
+        available[best] = False
+        redundancy = np.maximum(redundancy, pool @ pool[best])
+    return [int(candidates[index]) for index in chosen]
+
+
+def _sidecar(index_path: Path | str, name: str) -> Path | None:
+    path = Path(index_path)
+    directory = (path.parent if path.is_file() else path) / name
+    return directory if (directory / "manifest.json").exists() else None
+
+
+def load_ann(index_path: Path | str) -> IVFIndex | None:
+    """Open the IVF index saved next to a RAG index, if one was built."""
+
+    directory = _sidecar(index_path, ANN_DIRECTORY)
+    if directory is None:
+        return None
+    try:
+        return IVFIndex.load(directory)
+    except (OSError, ValueError):
+        return None
+
+
+def load_quantized_sidecar(index_path: Path | str) -> QuantizedVectors | None:
+    """Open the quantized codes saved next to a RAG index, if present."""
+
+    directory = _sidecar(index_path, QUANTIZED_DIRECTORY)
+    if directory is None:
+        return None
+    try:
+        return load_quantized(directory)
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def load_bm25(index_path: Path | str) -> BM25Index | None:
+    """Open the BM25 postings saved next to a RAG index, if present."""
+
+    directory = _sidecar(index_path, LEXICAL_DIRECTORY)
+    if directory is None:
+        return None
+    try:
+        return BM25Index.load(directory)
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+class Retriever:
+    """Cosine top-k search over an ``(n, d)`` matrix of unit-norm chunk embeddings.
+
+    A batch of queries is scored with a single matrix multiply per block of
+    ``QUERY_BLOCK`` queries, so latency is dominated by one BLAS call. When an
+    :class:`~keplermind.app.tools.ann.IVFIndex` over the same rows is given,
+    candidates come from it instead, probing ``nprobe`` lists per query.
+
+    With a :class:`~keplermind.app.tools.bm25.BM25Index` over the same rows,
+    :meth:`search_many` runs hybrid search: the vector and BM25 rankings are
+    merged with reciprocal-rank fusion.
+
+    With :class:`~keplermind.app.tools.quantize.QuantizedVectors` (and no
+    IVF index), candidates are shortlisted from the compressed codes and only
+    the shortlisted rows of ``embeddings`` are read for exact re-ranking, so a
+    memory-mapped matrix stays mostly on disk.
+    """
+
+    def __init__(
+        self,
+        embeddings: np.ndarray,
+        chunks: Sequence[Mapping[str, Any]],
+        *,
+        embedder: _Embedder | None = None,
+        ann: IVFIndex | None = None,
+        nprobe: int | None = None,
+        bm25: BM25Index | None = None,
+        quantized: QuantizedVectors | None = None,
+    ) -> None:
+        if embeddings.shape[0] != len(chunks):
+            raise ValueError("Expected one embedding row per chunk.")
+        self.embeddings = embeddings
+        self.chunks = chunks
+        self.embedder = embedder or DeterministicEmbedder(dimensions=int(embeddings.shape[1]) or 12)
+        self.ann = ann
+        self.nprobe = nprobe
+        if bm25 is not None and len(bm25) != len(chunks):
+            raise ValueError("Expected one BM25 document per chunk.")
+        self.bm25 = bm25
+        if quantized is not None and len(quantized) != len(chunks):
+            raise ValueError("Expected one quantized code per chunk.")
+        self.quantized = quantized
+
+    @classmethod
+    def from_state(cls, state: Mapping[str, Any], *, embedder: _Embedder | None = None) -> "Retriever | None":
+        """Build a retriever from ``state["rag"]`` or the ``rag_index`` artifact, if any."""
+
+        rag = state.get("rag") or {}
+        if rag.get("embeddings") is not None and rag.get("chunks") is not None:
+            return cls(
+                rag["embeddings"],
+                rag["chunks"],
+                embedder=embedder,
+                ann=rag.get("ann"),
+                bm25=rag.get("bm25"),
+                quantized=rag.get("quantized"),
+            )
+        artifact = (state.get("artifacts") or {}).get("rag_index")
+        if not artifact or not artifact.get("path"):
+            return None
+        try:
+            index = RagIndex.load(artifact["path"])
+        except (OSError, RagIndexError):
+            return None
+        return cls(
+            index.embeddings,
+            index.chunks,
+            embedder=embedder,
+            ann=load_ann(artifact["path"]),
+            bm25=load_bm25(artifact["path"]),
+            quantized=load_quantized_sidecar(artifact["path"]),
+        )
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    def search_vectors(
+        self,
+        queries: np.ndarray,
+        *,
+        top_k: int | None = None,
+        diversity: float | None = None,
+        fetch_k: int | None = None,
+    ) -> list[list[Hit]]:
+        """Return the best chunks for each row of *queries* (an ``(m, d)`` matrix).
+
+        With ``diversity`` set, ``fetch_k`` candidates (default ``4 * top_k``)
+        are re-ranked with :func:`mmr`.
+        """
+
+        k = settings.rag.top_k if top_k is None else top_k
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        if not len(self) or k <= 0:
+            return [[] for _ in range(queries.shape[0])]
+
+        pool = k if diversity is None else max(k, fetch_k or 4 * k)
+        hits: list[list[Hit]] = []
+        for start in range(0, queries.shape[0], QUERY_BLOCK):
+            block = queries[start : start + QUERY_BLOCK]
+            if self.ann is not None:
+                indices, values = self.ann.search(block, top_k=pool, nprobe=self.nprobe)
+            elif self.quantized is not None:
+                indices, values = self.quantized.search(
+                    block, top_k=pool, exact=self.embeddings, rerank=pool * settings.rag.rerank_factor
+                )
+            else:
+                indices, values = select_top_k(block @ self.embeddings.T, pool)
+            for offset, (rows, row_scores) in enumerate(zip(indices, values)):
+                found = rows >= 0
+                rows, row_scores = rows[found], row_scores[found]
+                if diversity is not None:
+                    chosen = mmr(block[offset], rows, self.embeddings, k=k, diversity=diversity)
+                    lookup = dict(zip(rows.tolist(), row_scores.tolist()))
+                    ranked = [(row, lookup[row]) for row in chosen]
+                else:
+                    ranked = list(zip(rows.tolist(), row_scores.tolist()))
+                hits.append([Hit(row=row, score=float(score), chunk=self.chunks[row]) for row, score in ranked])
+        return hits
+
+    def search_hybrid(
+        self,
+        queries: Sequence[str],
+        vectors: np.ndarray,
+        *,
+        top_k: int | None = None,
+        diversity: float | None = None,
+        fetch_k: int | None = None,
+    ) -> list[list[Hit]]:
+        """Fuse the vector and BM25 rankings of each query with reciprocal-rank fusion.
+
+        Each ranker contributes ``fetch_k`` candidates (default ``4 * top_k``);
+        with ``diversity`` set the fused pool is re-ranked with :func:`mmr`.
+        """
+
+        if self.bm25 is None:
+            raise ValueError("Hybrid search needs a BM25 index.")
+        k = settings.rag.top_k if top_k is None else top_k
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        if not len(self) or k <= 0:
+            return [[] for _ in queries]
+
+        pool = max(k, fetch_k or 4 * k)
+        dense = self.search_vectors(vectors, top_k=pool)
+        hits: list[list[Hit]] = []
+        for query, vector, dense_hits in zip(queries, vectors, dense):
+            lexical, _ = self.bm25.search(query, top_k=pool)
+            fused = reciprocal_rank_fusion([[hit.row for hit in dense_hits], lexical], k=settings.rag.rrf_k)
+            if diversity is not None and fused:
+                lookup = dict(fused)
+                rows = np.array([row for row, _ in fused], dtype=np.int64)
+                fused = [(row, lookup[row]) for row in mmr(vector, rows, self.embeddings, k=k, diversity=diversity)]
+            hits.append([Hit(row=row, score=score, chunk=self.chunks[row]) for row, score in fused[:k]])
+        return hits
+
+    def search_many(self, queries: Sequence[str], *, hybrid: bool | None = None, **options: Any) -> list[list[Hit]]:
+        """Embed *queries* in one batch and search them together.
+
+        Hybrid search is used when a BM25 index is attached, unless ``hybrid``
+        (default ``settings.rag.hybrid``) turns it off.
+        """
+
+        if not queries:
+            return []
+        vectors = self.embedder.embed_matrix(list(queries))
+        if self.bm25 is not None and (settings.rag.hybrid if hybrid is None else hybrid):
+            return self.search_hybrid(queries, vectors, **options)
+        return self.search_vectors(vectors, **options)
+
+    def search(self, query: str, **options: Any) -> list[Hit]:
+        return self.search_many([query], **options)[0]
+
+
+__all__ = ["Hit", "Retriever", "load_ann", "load_bm25", "load_quantized_sidecar", "mmr", "select_top_k"]
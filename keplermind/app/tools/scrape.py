@@ -3,9 +3,19 @@
 from __future__ import annotations
 
 import re
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from html.parser import HTMLParser
-from typing import Callable
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, Sequence
+from urllib.parse import urlsplit
+
+from ..config.settings import settings
+from .fetch import HttpFetcher, default_fetcher
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .scrape_cache import ScrapeCache
 
 try:  # pragma: no cover - optional dependency
     import requests
@@ -17,6 +27,11 @@ try:  # pragma: no cover - optional dependency handling
 except ImportError:  # pragma: no cover - fallback path
     Document = None  # type: ignore[assignment]
 
+try:  # pragma: no cover - optional dependency handling
+    from lxml import etree
+except ImportError:  # pragma: no cover - fallback path
+    etree = None  # type: ignore[assignment]
+
 
 FetchFn = Callable[[str], str]
 
@@ -36,9 +51,7 @@ class ScrapeResult:
 def _default_fetch(url: str) -> str:
     if requests is None:
         raise ScrapeError("requests library is not available in the environment")
-    response = requests.get(url, timeout=10)
-    response.raise_for_status()
-    return response.text
+    return default_fetcher()(url)
 
 
 class _PlainTextExtractor(HTMLParser):
@@ -54,6 +67,159 @@ class _PlainTextExtractor(HTMLParser):
         return " ".join(self.parts)
 
 
+RAW_TEXT_TAGS = frozenset({"script", "style", "noscript", "template"})
+BOILERPLATE_TAGS = frozenset({"nav", "footer"})
+ENGINES = ("auto", "lxml", "html.parser", "readability")
+
+
+class _TextCollector:
+    """Single-pass text builder shared by the incremental extraction engines.
+
+    It doubles as an lxml parser target (``start``/``end``/``data``/``close``).
+    Text between two tag events is buffered before splitting so that words cut
+    in half by a network chunk boundary are stitched back together.
+    """
+
+    def __init__(self, skip_tags: frozenset[str]) -> None:
+        self.skip_tags = skip_tags
+        self.words: list[str] = []
+        self.title_words: list[str] = []
+        self._pending: list[str] = []
+        self._skip_depth = 0
+        self._in_title = False
+
+    def start(self, tag: str, attrib: object = None) -> None:
+        self._flush()
+        tag = tag.lower()
+        if tag in self.skip_tags:
+            self._skip_depth += 1
+        elif tag == "title":
+            self._in_title = True
+
+    def end(self, tag: str) -> None:
+        self._flush()
+        tag = tag.lower()
+        if tag in self.skip_tags:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag == "title":
+            self._in_title = False
+
+    def data(self, data: str) -> None:
+        if not self._skip_depth:
+            self._pending.append(data)
+
+    def close(self) -> None:
+        self._flush()
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        words = "".join(self._pending).split()
+        self._pending.clear()
+        (self.title_words if self._in_title else self.words).extend(words)
+
+
+class _HtmlParserExtractor(HTMLParser):
+    """Pure-Python engine; only raw-text elements are skipped because
+    ``HTMLParser`` does not repair unclosed structural tags."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.collector = _TextCollector(RAW_TEXT_TAGS)
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self.collector.start(tag)
+
+    def handle_endtag(self, tag: str) -> None:
+        self.collector.end(tag)
+
+    def handle_data(self, data: str) -> None:
+        self.collector.data(data)
+
+    def close(self) -> None:
+        super().close()
+        self.collector.close()
+
+    def title(self) -> str:
+        return " ".join(self.collector.title_words)
+
+    def text(self) -> str:
+        return " ".join(self.collector.words)
+
+
+class _LxmlExtractor:
+    """libxml2-backed engine that also drops navigation and footer subtrees."""
+
+    def __init__(self) -> None:
+        self.collector = _TextCollector(RAW_TEXT_TAGS | BOILERPLATE_TAGS)
+        self._parser = etree.HTMLParser(target=self.collector, remove_comments=True)
+        self._fed = False
+
+    def feed(self, data: str) -> None:
+        if data:
+            self._parser.feed(data)
+            self._fed = True
+
+    def close(self) -> None:
+        if self._fed:
+            self._parser.close()
+
+    def title(self) -> str:
+        return " ".join(self.collector.title_words)
+
+    def text(self) -> str:
+        return " ".join(self.collector.words)
+
+
+def _resolve_engine(engine: str | None) -> str:
+    choice = (engine or settings.scrape.engine).lower()
+    if choice not in ENGINES:
+        raise ValueError(f"Unknown extraction engine '{choice}'; expected one of {ENGINES}")
+    if choice in ("auto", "readability") and Document is not None:
+        return "readability"
+    if choice in ("auto", "lxml", "readability"):
+        return "lxml" if etree is not None else "html.parser"
+    return choice
+
+
+def _make_extractor(engine: str) -> _HtmlParserExtractor | _LxmlExtractor:
+    return _LxmlExtractor() if engine == "lxml" else _HtmlParserExtractor()
+
+
+def _stream_extract(url: str, fetcher: HttpFetcher, *, engine: str | None = None) -> tuple[str, str, str]:
+    """Download *url* and extract text while the body is still arriving.
+
+    Returns ``(raw_html, title, text)``; the raw markup is bounded by the
+    fetcher's byte cap and kept only so the scrape cache can store it. The
+    readability engine needs the whole document, so it runs after download.
+    """
+
+    resolved = _resolve_engine(engine)
+    raw_parts: list[str] = []
+    if resolved == "readability":
+        raw_parts.extend(fetcher.stream(url))
+        raw_html = "".join(raw_parts)
+        title, text = extract_text(raw_html, engine=resolved)
+        return raw_html, title, text
+
+    extractor = _make_extractor(resolved)
+    for piece in fetcher.stream(url):
+        raw_parts.append(piece)
+        extractor.feed(piece)
+    extractor.close()
+    return "".join(raw_parts), extractor.title(), extractor.text()
+
+
+def _streaming_fetcher(fetcher: FetchFn | None) -> HttpFetcher | None:
+    if not settings.scrape.streaming:
+        return None
+    if isinstance(fetcher, HttpFetcher):
+        return fetcher
+    if fetcher is None and requests is not None:
+        return default_fetcher()
+    return None
+
+
 def _to_text(markup: str) -> str:
     parser = _PlainTextExtractor()
     parser.feed(markup)
@@ -61,18 +227,23 @@ def _to_text(markup: str) -> str:
     return parser.text()
 
 
-def _extract_text(raw_html: str) -> tuple[str, str]:
-    if Document is not None:
-        try:
-            doc = Document(raw_html)
-            title = doc.short_title() or "Untitled"
-            summary_html = doc.summary()
-            text_content = _to_text(summary_html)
-        except Exception:  # pragma: no cover - defensive fallback
-            title, text_content = "Untitled", ""
-    else:
-        title = "Untitled"
-        text_content = _to_text(raw_html)
+def extract_text(raw_html: str, *, engine: str | None = None) -> tuple[str, str]:
+    """Return ``(title, text)`` for *raw_html* using the chosen extraction engine."""
+
+    resolved = _resolve_engine(engine)
+    if resolved != "readability":
+        extractor = _make_extractor(resolved)
+        extractor.feed(raw_html)
+        extractor.close()
+        return extractor.title() or "Untitled", extractor.text()
+
+    try:
+        doc = Document(raw_html)
+        title = doc.short_title() or "Untitled"
+        summary_html = doc.summary()
+        text_content = _to_text(summary_html)
+    except Exception:  # pragma: no cover - defensive fallback
+        title, text_content = "Untitled", ""
 
     cleaned = re.sub(r"\s+", " ", text_content or "").strip()
     return title, cleaned
@@ -84,26 +255,139 @@ def scrape(
     fetcher: FetchFn | None = None,
     html_override: str | None = None,
     fallback_text: str | None = None,
+    cache: ScrapeCache | None = None,
+    engine: str | None = None,
 ) -> ScrapeResult:
-    """Fetch a URL and return a readability-optimised text payload."""
+    """Fetch a URL and return a readability-optimised text payload.
+
+    When a ``cache`` is supplied, fresh entries are returned without touching
+    the network, successful fetches are stored with their raw markup, and
+    URLs that failed recently are not retried until the negative TTL expires.
+
+    With ``settings.scrape.streaming`` on and an ``HttpFetcher`` (or the default
+    one) doing the download, text is extracted incrementally while the body
+    streams in. ``engine`` picks the extractor (see ``ENGINES``); ``"auto"``
+    keeps readability's main-content extraction when it is installed and
+    otherwise uses the lxml fast path, then ``html.parser``.
+    """
+
+    use_cache = cache is not None and html_override is None
+    resolved = _resolve_engine(engine)
+    if use_cache:
+        cached = cache.get(url, engine=resolved)
+        if cached is not None:
+            return cached
 
     raw_html = html_override
+    extracted: tuple[str, str] | None = None
+    fetched = False
     if raw_html is None:
-        fetch = fetcher or _default_fetch
+        failure = cache.recent_failure(url) if use_cache else None
         try:
-            raw_html = fetch(url)
+            if failure is not None:
+                raise ScrapeError(failure)
+            streamer = _streaming_fetcher(fetcher)
+            if streamer is not None:
+                raw_html, streamed_title, streamed_text = _stream_extract(url, streamer, engine=engine)
+                extracted = (streamed_title, streamed_text)
+            else:
+                fetch = fetcher or _default_fetch
+                raw_html = fetch(url)
+            fetched = True
         except Exception as exc:  # pragma: no cover - network dependent
+            if use_cache and failure is None:
+                cache.mark_failed(url, str(exc))
             if fallback_text is None:
                 raise ScrapeError(f"Failed to retrieve {url}: {exc}") from exc
             raw_html = f"<html><body><p>{fallback_text}</p></body></html>"
+            extracted = None
 
-    title, text = _extract_text(raw_html)
+    title, text = extracted if extracted else extract_text(raw_html, engine=engine)
     if not text and fallback_text:
         text = fallback_text.strip()
 
     word_count = len(text.split())
-    return ScrapeResult(url=url, title=title or "Untitled", text=text, word_count=word_count)
+    result = ScrapeResult(url=url, title=title or "Untitled", text=text, word_count=word_count)
+    if use_cache and fetched:
+        cache.put(url, result, raw_html, engine=resolved)
+    return result
+
+
+class _HostLimiter:
+    """Hand out one bounded semaphore per host so no site sees too many requests."""
+
+    def __init__(self, limit: int) -> None:
+        self.limit = max(1, limit)
+        self._lock = threading.Lock()
+        self._semaphores: dict[str, threading.BoundedSemaphore] = {}
+
+    def for_url(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).hostname or ""
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.limit)
+                self._semaphores[host] = semaphore
+            return semaphore
+
+
+def iter_scrape(
+    targets: Iterable[tuple[str, str | None]],
+    *,
+    fetcher: FetchFn | None = None,
+    max_workers: int = 8,
+    per_host: int = 2,
+    cache: ScrapeCache | None = None,
+) -> Iterator[ScrapeResult]:
+    """Scrape ``(url, fallback_text)`` pairs lazily, yielding results in input order.
+
+    *targets* is consumed only as fast as worker slots free up, so it may be
+    a generator fed by a streaming search. Each result is yielded as soon as
+    it and everything before it have finished. Closing the iterator early
+    cancels fetches that have not started yet.
+    """
+
+    limiter = _HostLimiter(per_host)
+
+    def _task(url: str, fallback: str | None) -> ScrapeResult:
+        with limiter.for_url(url):
+            return scrape(url, fetcher=fetcher, fallback_text=fallback, cache=cache)
+
+    pool = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="scrape")
+    pending: deque[Future[ScrapeResult]] = deque()
+    window = max(1, max_workers) * 2
+    try:
+        for url, fallback in targets:
+            pending.append(pool.submit(_task, url, fallback))
+            while pending and (pending[0].done() or len(pending) >= window):
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def scrape_many(
+    targets: Sequence[tuple[str, str | None]],
+    *,
+    fetcher: FetchFn | None = None,
+    max_workers: int = 1,
+    per_host: int = 2,
+    cache: ScrapeCache | None = None,
+) -> list[ScrapeResult]:
+    """Scrape ``(url, fallback_text)`` pairs, returning results in input order.
+
+    With ``max_workers`` of 1 the URLs are fetched sequentially; otherwise a
+    thread pool is used and at most ``per_host`` requests hit the same host at
+    once. The first failure is re-raised just like a sequential loop would.
+    """
+
+    if max_workers <= 1 or len(targets) <= 1:
+        return [
+            scrape(url, fetcher=fetcher, fallback_text=fallback, cache=cache) for url, fallback in targets
+        ]
+    return list(iter_scrape(targets, fetcher=fetcher, max_workers=max_workers, per_host=per_host, cache=cache))
 
 
-__all__ = ["scrape", "ScrapeResult", "ScrapeError"]
+__all__ = ["FetchFn", "extract_text", "iter_scrape", "scrape", "scrape_many", "ScrapeResult", "ScrapeError"]
 
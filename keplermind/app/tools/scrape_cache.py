@@ -0,0 +1,310 @@
+"""Persistent on-disk cache for scraped documents."""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from ..config.settings import settings
+from ..mcp.stores import DEFAULT_MEMORY_DIR
+from .scrape import ScrapeResult
+
+TRACKING_PREFIXES = ("utm_",)
+TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "ref"}
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def canonical_url(url: str) -> str:
+    """Normalise *url* so trivially different spellings share a cache entry."""
+
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    )
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+
+def cache_key(url: str) -> str:
+    return hashlib.sha256(canonical_url(url).encode("utf-8")).hexdigest()
+
+
+class ScrapeCache:
+    """Content-addressed scrape cache with TTLs, LRU eviction and negative entries.
+
+    Extracted ``ScrapeResult`` fields live in a SQLite index keyed by the
+    canonical URL hash, tagged with the extraction engine that produced them;
+    raw HTML is gzip-compressed into ``blobs/`` under the SHA-256 of the body,
+    so mirrors serving identical markup share one file. Each blob's size is
+    counted once against ``max_bytes`` and the file is deleted when the last
+    entry referencing it goes.
+    """
+
+    def __init__(
+        self,
+        root: Path | str | None = None,
+        *,
+        ttl: float | None = None,
+        negative_ttl: float | None = None,
+        max_bytes: int | None = None,
+    ) -> None:
+        self.root = Path(root) if root else DEFAULT_MEMORY_DIR / "scrape_cache"
+        self.blob_dir = self.root / "blobs"
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl = settings.cache.scrape_ttl if ttl is None else ttl
+        self.negative_ttl = settings.cache.negative_ttl if negative_ttl is None else negative_ttl
+        self.max_bytes = settings.cache.scrape_max_bytes if max_bytes is None else max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.root / "index.sqlite", check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                title TEXT,
+                text TEXT,
+                word_count INTEGER,
+                html_hash TEXT,
+                engine TEXT,
+                size INTEGER NOT NULL DEFAULT 0,
+                failed INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS blobs (html_hash TEXT PRIMARY KEY, size INTEGER NOT NULL, refs INTEGER NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_lru ON entries (accessed_at)")
+        with self._conn:
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(entries)")}
+            if "engine" not in columns:
+                self._migrate_blob_sizes()
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+    def get(self, url: str, *, engine: str | None = None) -> ScrapeResult | None:
+        """Return the cached result for *url* when present and not expired.
+
+        With *engine*, a result extracted by a different engine is a miss.
+        """
+
+        key = cache_key(url)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT title, text, word_count, engine FROM entries WHERE key = ? AND failed = 0 AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+            if row is None or (engine is not None and row[3] != engine):
+                return None
+            with self._conn:
+                self._conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+        return ScrapeResult(url=url, title=row[0], text=row[1], word_count=int(row[2]))
+
+    def recent_failure(self, url: str) -> str | None:
+        """Return the stored error message if *url* failed within the negative TTL."""
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT error FROM entries WHERE key = ? AND failed = 1 AND expires_at > ?",
+                (cache_key(url), time.time()),
+            ).fetchone()
+        return None if row is None else str(row[0] or "cached failure")
+
+    def raw_html(self, url: str) -> str | None:
+        """Return the stored markup for *url*, regardless of expiry."""
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT html_hash FROM entries WHERE key = ? AND failed = 0", (cache_key(url),)
+            ).fetchone()
+        if row is None or not row[0]:
+            return None
+        path = self._blob_path(row[0])
+        if not path.exists():
+            return None
+        return gzip.decompress(path.read_bytes()).decode("utf-8")
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+    def put(
+        self,
+        url: str,
+        result: ScrapeResult,
+        raw_html: str | None = None,
+        *,
+        ttl: float | None = None,
+        engine: str | None = None,
+    ) -> None:
+        """Store *result* (and optionally its markup) for ``ttl`` seconds.
+
+        *engine* records which extractor produced the text; see :meth:`get`.
+        """
+
+        now = time.time()
+        html_hash = None
+        compressed = b""
+        if raw_html is not None:
+            payload = raw_html.encode("utf-8")
+            html_hash = hashlib.sha256(payload).hexdigest()
+            compressed = gzip.compress(payload)
+        size = len(result.text.encode("utf-8"))
+
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            if html_hash is not None:
+                path = self._blob_path(html_hash)
+                if not path.exists():
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    path.write_bytes(compressed)
+            previous = self._conn.execute(
+                "SELECT html_hash FROM entries WHERE key = ?", (cache_key(url),)
+            ).fetchone()
+            previous_hash = previous[0] if previous else None
+            with self._conn:
+                if html_hash is not None and html_hash != previous_hash:
+                    self._conn.execute(
+                        """
+                        INSERT INTO blobs (html_hash, size, refs) VALUES (?, ?, 1)
+                        ON CONFLICT(html_hash) DO UPDATE SET refs = refs + 1
+                        """,
+                        (html_hash, len(compressed)),
+                    )
+                self._conn.execute(
+                    """
+                    INSERT OR REPLACE INTO entries
+                        (key, url, title, text, word_count, html_hash, engine, size, failed, error, expires_at, accessed_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0, NULL, ?, ?)
+                    """,
+                    (
+                        cache_key(url),
+                        canonical_url(url),
+                        result.title,
+                        result.text,
+                        result.word_count,
+                        html_hash,
+                        engine,
+                        size,
+                        expires_at,
+                        now,
+                    ),
+                )
+            if previous_hash and previous_hash != html_hash:
+                self._release_blob(previous_hash)
+            self._evict()
+
+    def mark_failed(self, url: str, error: str) -> None:
+        """Remember that *url* failed so retries are skipped for ``negative_ttl``."""
+
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO entries (key, url, failed, error, expires_at, accessed_at)
+                VALUES (?, ?, 1, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    failed = 1, error = excluded.error,
+                    expires_at = excluded.expires_at, accessed_at = excluded.accessed_at
+                """,
+                (cache_key(url), canonical_url(url), error[:500], now + self.negative_ttl, now),
+            )
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._total_bytes()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _blob_path(self, html_hash: str) -> Path:
+        return self.blob_dir / html_hash[:2] / f"{html_hash}.html.gz"
+
+    def _total_bytes(self) -> int:
+        row = self._conn.execute(
+            "SELECT (SELECT COALESCE(SUM(size), 0) FROM entries) + (SELECT COALESCE(SUM(size), 0) FROM blobs)"
+        ).fetchone()
+        return int(row[0])
+
+    def _release_blob(self, html_hash: str) -> int:
+        """Drop one reference to a blob; returns the bytes freed (0 while still shared)."""
+
+        with self._conn:
+            self._conn.execute("UPDATE blobs SET refs = refs - 1 WHERE html_hash = ?", (html_hash,))
+            row = self._conn.execute("SELECT size FROM blobs WHERE html_hash = ? AND refs <= 0", (html_hash,)).fetchone()
+            if row is None:
+                return 0
+            self._conn.execute("DELETE FROM blobs WHERE html_hash = ?", (html_hash,))
+        self._blob_path(html_hash).unlink(missing_ok=True)
+        return int(row[0])
+
+    def _migrate_blob_sizes(self) -> None:
+        # Older indexes charged each entry for the whole blob it shared; move
+        # blob sizes into the reference-counted table and keep text bytes only.
+        self._conn.execute("ALTER TABLE entries ADD COLUMN engine TEXT")
+        rows = self._conn.execute(
+            "SELECT html_hash, COUNT(*) FROM entries WHERE html_hash IS NOT NULL GROUP BY html_hash"
+        ).fetchall()
+        for html_hash, refs in rows:
+            path = self._blob_path(html_hash)
+            size = path.stat().st_size if path.exists() else 0
+            self._conn.execute(
+                "INSERT OR REPLACE INTO blobs (html_hash, size, refs) VALUES (?, ?, ?)", (html_hash, size, refs)
+            )
+        self._conn.execute("UPDATE entries SET size = COALESCE(LENGTH(CAST(text AS BLOB)), 0)")
+
+    def _evict(self) -> None:
+        expired = self._conn.execute(
+            "SELECT key, html_hash FROM entries WHERE failed = 1 AND expires_at <= ?", (time.time(),)
+        ).fetchall()
+        for key, html_hash in expired:
+            with self._conn:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            if html_hash:
+                self._release_blob(html_hash)
+        total = self._total_bytes()
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT key, html_hash, size FROM entries ORDER BY accessed_at ASC").fetchall()
+        for key, html_hash, size in rows:
+            if total <= self.max_bytes:
+                break
+            with self._conn:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= int(size or 0)
+            if html_hash:
+                total -= self._release_blob(html_hash)
+
+
+_default_cache: ScrapeCache | None = None
+_default_lock = threading.Lock()
+
+
+def default_scrape_cache() -> ScrapeCache:
+    """Return the shared cache under the memory directory, opening it on first use."""
+
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = ScrapeCache()
+        return _default_cache
+
+
+__all__ = ["ScrapeCache", "canonical_url", "default_scrape_cache"]
@@ -4,8 +4,16 @@ from __future__ import annotations
 
 import hashlib
 import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass
-from typing import Iterable, List, Sequence
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, List, Sequence
+
+from ..config.settings import settings
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .search_cache import SearchCache
 
 
 class SearchError(RuntimeError):
@@ -60,21 +68,82 @@ def _backend_cycle(preference: str | None) -> List[str]:
     return ordered
 
 
-def search(
-    query: str,
-    *,
-    max_results: int = 10,
-    backend_preference: str | None = None,
-) -> list[SearchResult]:
-    """Search across available backends, preferring the requested provider."""
+def _call_backend(backend: str, query: str, *, max_results: int) -> list[SearchResult]:
+    if backend == "tavily":
+        return _tavily(query, max_results=max_results)
+    if backend == "duckduckgo":
+        return _duckduckgo(query, max_results=max_results)
+    raise BackendUnavailable(f"Unknown search backend '{backend}'.")
+
+
+class LatencyTracker:
+    """Smoothed per-backend latency used to adapt the hedge delay.
+
+    Follows the TCP retransmission-timer recipe: an EWMA of the latency plus
+    four times the EWMA of its deviation approximates a high percentile.
+    """
+
+    def __init__(self, *, alpha: float = 0.125, beta: float = 0.25) -> None:
+        self.alpha = alpha
+        self.beta = beta
+        self._lock = threading.Lock()
+        self._stats: dict[str, tuple[float, float, int]] = {}
+
+    def record(self, backend: str, seconds: float) -> None:
+        with self._lock:
+            mean, deviation, count = self._stats.get(backend, (seconds, seconds / 2, 0))
+            if count:
+                deviation = (1 - self.beta) * deviation + self.beta * abs(seconds - mean)
+                mean = (1 - self.alpha) * mean + self.alpha * seconds
+            self._stats[backend] = (mean, deviation, count + 1)
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        with self._lock:
+            return {
+                name: {"mean": mean, "deviation": deviation, "samples": count}
+                for name, (mean, deviation, count) in self._stats.items()
+            }
+
+    def hedge_delay(self, backend: str, *, default: float) -> float:
+        """Return how long to wait on *backend* before firing the next one."""
+
+        with self._lock:
+            stats = self._stats.get(backend)
+        if stats is None:
+            return default
+        mean, deviation, _ = stats
+        config = settings.search
+        return min(max(mean + 4 * deviation, config.min_hedge_delay), config.max_hedge_delay)
 
+
+LATENCY = LatencyTracker()
+"""Process-wide latency observations shared by all hedged searches."""
+
+
+def _timed_call(backend: str, query: str, *, max_results: int, tracker: LatencyTracker) -> list[SearchResult]:
+    started = time.perf_counter()
+    results = _call_backend(backend, query, max_results=max_results)
+    tracker.record(backend, time.perf_counter() - started)
+    return results
+
+
+def _merge_results(batches: Iterable[list[SearchResult]], *, max_results: int) -> list[SearchResult]:
+    merged: list[SearchResult] = []
+    seen: set[str] = set()
+    for batch in batches:
+        for result in batch:
+            if result.url in seen:
+                continue
+            seen.add(result.url)
+            merged.append(result)
+    return merged[:max_results]
+
+
+def _search_backends(query: str, *, max_results: int, backend_preference: str | None) -> list[SearchResult]:
     errors: list[str] = []
     for backend in _backend_cycle(backend_preference):
         try:
-            if backend == "tavily":
-                return _tavily(query, max_results=max_results)
-            if backend == "duckduckgo":
-                return _duckduckgo(query, max_results=max_results)
+            return _timed_call(backend, query, max_results=max_results, tracker=LATENCY)
         except BackendUnavailable as exc:  # pragma: no cover - error path tested via notes
             errors.append(str(exc))
             continue
@@ -84,11 +153,188 @@ def search(
     )
 
 
+def _hedged_search(
+    query: str,
+    *,
+    max_results: int,
+    backend_preference: str | None,
+    delay: float | None,
+    merge: bool,
+    tracker: LatencyTracker,
+) -> list[SearchResult]:
+    """Fire backends in preference order, starting the next one whenever the
+    current one is slower than its hedge delay or fails.
+
+    The first successful answer wins unless ``merge`` is set, in which case
+    every backend already in flight is awaited and their hits are combined in
+    preference order, de-duplicated by URL. Late responses still feed the
+    latency tracker after this function returns.
+    """
+
+    order = _backend_cycle(backend_preference)
+    remaining = list(order)
+    errors: list[str] = []
+    in_flight: dict[Future[list[SearchResult]], str] = {}
+    succeeded: dict[str, list[SearchResult]] = {}
+    executor = ThreadPoolExecutor(max_workers=len(remaining), thread_name_prefix="hedged-search")
+
+    def _launch() -> str:
+        backend = remaining.pop(0)
+        in_flight[executor.submit(_timed_call, backend, query, max_results=max_results, tracker=tracker)] = backend
+        return backend
+
+    def _collect(finished: Iterable[Future[list[SearchResult]]]) -> None:
+        for future in finished:
+            name = in_flight.pop(future)
+            try:
+                succeeded[name] = future.result()
+            except BackendUnavailable as exc:
+                errors.append(str(exc))
+
+    try:
+        current = _launch()
+        while in_flight and not succeeded:
+            timeout = None
+            if remaining:
+                timeout = delay if delay is not None else tracker.hedge_delay(
+                    current, default=settings.search.hedge_delay
+                )
+            done, _ = wait(list(in_flight), timeout=timeout, return_when=FIRST_COMPLETED)
+            _collect(done)
+            # Either the hedge delay elapsed or a backend failed: fire the next one.
+            if not succeeded and remaining:
+                current = _launch()
+        if succeeded and merge and in_flight:
+            _collect(wait(list(in_flight)).done)
+    finally:
+        executor.shutdown(wait=False)
+
+    if not succeeded:
+        raise BackendUnavailable(
+            "; ".join(errors) or "No search backend could satisfy the request."
+        )
+    batches = [succeeded[name] for name in order if name in succeeded]
+    if not merge:
+        return batches[0]
+    return _merge_results(batches, max_results=max_results)
+
+
+def _loader(
+    query: str,
+    *,
+    max_results: int,
+    backend_preference: str | None,
+    hedge: bool | None,
+    hedge_delay: float | None,
+    merge: bool | None,
+) -> Callable[[], list[SearchResult]]:
+    """Bind one backend query, resolving hedging options against ``settings.search``."""
+
+    config = settings.search
+    use_hedge = config.hedge if hedge is None else hedge
+    use_merge = config.merge_hedged if merge is None else merge
+    if hedge_delay is None and not config.adaptive_hedge:
+        hedge_delay = config.hedge_delay
+
+    def _load() -> list[SearchResult]:
+        if use_hedge:
+            return _hedged_search(
+                query,
+                max_results=max_results,
+                backend_preference=backend_preference,
+                delay=hedge_delay,
+                merge=use_merge,
+                tracker=LATENCY,
+            )
+        return _search_backends(query, max_results=max_results, backend_preference=backend_preference)
+
+    return _load
+
+
+def search(
+    query: str,
+    *,
+    max_results: int = 10,
+    backend_preference: str | None = None,
+    cache: SearchCache | None = None,
+    hedge: bool | None = None,
+    hedge_delay: float | None = None,
+    merge: bool | None = None,
+) -> list[SearchResult]:
+    """Search across available backends, preferring the requested provider.
+
+    With ``hedge`` enabled (the default from ``settings.search``) a slow
+    preferred backend no longer blocks the fallback: see ``_hedged_search``.
+    ``hedge_delay`` pins the delay instead of adapting it to observed latency.
+    """
+
+    load = _loader(
+        query,
+        max_results=max_results,
+        backend_preference=backend_preference,
+        hedge=hedge,
+        hedge_delay=hedge_delay,
+        merge=merge,
+    )
+    if cache is None:
+        return load()
+    backend_key = (backend_preference or "auto").lower()
+    return cache.fetch(query, backend=backend_key, max_results=max_results, loader=load)
+
+
+def iter_search(
+    query: str,
+    *,
+    max_results: int = 10,
+    backend_preference: str | None = None,
+    cache: SearchCache | None = None,
+    hedge: bool | None = None,
+    hedge_delay: float | None = None,
+    merge: bool | None = None,
+) -> Iterator[SearchResult]:
+    """Lazily yield search hits so callers can start work on the first one.
+
+    Cached hits are replayed straight away. On a miss the backends are queried
+    exactly as ``search`` does, hedging and merging included, so both paths
+    return the same hits; they are written back to the cache before being
+    yielded.
+    """
+
+    load = _loader(
+        query,
+        max_results=max_results,
+        backend_preference=backend_preference,
+        hedge=hedge,
+        hedge_delay=hedge_delay,
+        merge=merge,
+    )
+    backend_key = (backend_preference or "auto").lower()
+    if cache is not None:
+        cached = cache.get(query, backend=backend_key, max_results=max_results, loader=load)
+        if cached is not None:
+            yield from cached
+            return
+
+    results = load()
+    if cache is not None:
+        cache.put(query, backend=backend_key, max_results=max_results, results=results)
+    yield from results
+
+
 def snippets(results: Iterable[SearchResult]) -> Sequence[str]:
     """Extract snippets from a collection of results."""
 
     return [result.snippet for result in results]
 
 
-__all__ = ["SearchResult", "search", "snippets", "BackendUnavailable", "SearchError"]
+__all__ = [
+    "LATENCY",
+    "LatencyTracker",
+    "SearchResult",
+    "iter_search",
+    "search",
+    "snippets",
+    "BackendUnavailable",
+    "SearchError",
+]
 
@@ -0,0 +1,183 @@
+"""Persistent SQLite cache for search results with stale-while-revalidate."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable
+
+from ..config.settings import settings
+from ..mcp.stores import DEFAULT_MEMORY_DIR
+from .search import SearchResult
+
+Loader = Callable[[], list[SearchResult]]
+
+
+@dataclass
+class SearchCacheStats:
+    """Counters describing how the cache served lookups."""
+
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    refreshes: int = 0
+
+    def summary(self) -> str:
+        return (
+            f"{self.hits} hit(s) · {self.stale_hits} stale · "
+            f"{self.misses} miss(es) · {self.refreshes} refresh(es)"
+        )
+
+
+class SearchCache:
+    """Cache keyed by ``(query, backend, max_results)``.
+
+    Entries younger than ``ttl`` are served directly. Older entries still
+    inside ``stale_ttl`` are served immediately when ``stale_while_revalidate``
+    is on, while a background thread reloads them; anything older is a miss.
+    """
+
+    def __init__(
+        self,
+        db_path: Path | str | None = None,
+        *,
+        ttl: float | None = None,
+        stale_ttl: float | None = None,
+        stale_while_revalidate: bool | None = None,
+    ) -> None:
+        self.db_path = Path(db_path) if db_path else DEFAULT_MEMORY_DIR / "search_cache.sqlite"
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = settings.cache.search_ttl if ttl is None else ttl
+        self.stale_ttl = settings.cache.search_stale_ttl if stale_ttl is None else stale_ttl
+        self.stale_while_revalidate = (
+            settings.cache.stale_while_revalidate if stale_while_revalidate is None else stale_while_revalidate
+        )
+        self.stats = SearchCacheStats()
+        self._lock = threading.Lock()
+        self._refreshing: dict[tuple[str, str, int], threading.Thread] = {}
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS searches (
+                query TEXT NOT NULL,
+                backend TEXT NOT NULL,
+                max_results INTEGER NOT NULL,
+                results TEXT NOT NULL,
+                stored_at REAL NOT NULL,
+                PRIMARY KEY (query, backend, max_results)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def fetch(self, query: str, *, backend: str, max_results: int, loader: Loader) -> list[SearchResult]:
+        """Return cached results for the key, calling *loader* on a miss."""
+
+        cached = self.get(query, backend=backend, max_results=max_results, loader=loader)
+        if cached is not None:
+            return cached
+        results = loader()
+        self.put(query, backend=backend, max_results=max_results, results=results)
+        return results
+
+    def get(self, query: str, *, backend: str, max_results: int, loader: Loader) -> list[SearchResult] | None:
+        """Return fresh or revalidating results, or ``None`` (counted as a miss).
+
+        *loader* is only used to refresh a stale entry in the background.
+        """
+
+        key = self._key(query, backend, max_results)
+        cached = self._read(key)
+        if cached is not None:
+            results, age = cached
+            if age <= self.ttl:
+                self._count("hits")
+                return results
+            if self.stale_while_revalidate and age <= self.stale_ttl:
+                self._count("stale_hits")
+                self._refresh_in_background(key, loader)
+                return results
+
+        self._count("misses")
+        return None
+
+    def put(self, query: str, *, backend: str, max_results: int, results: list[SearchResult]) -> None:
+        self._write(self._key(query, backend, max_results), results)
+
+    def wait_for_refreshes(self, timeout: float | None = None) -> None:
+        """Block until background refreshes started so far have finished."""
+
+        with self._lock:
+            threads = list(self._refreshing.values())
+        for thread in threads:
+            thread.join(timeout)
+
+    def close(self) -> None:
+        self.wait_for_refreshes()
+        self._conn.close()
+
+    @staticmethod
+    def _key(query: str, backend: str, max_results: int) -> tuple[str, str, int]:
+        return (" ".join(query.split()), backend, max_results)
+
+    def _count(self, field: str) -> None:
+        with self._lock:
+            setattr(self.stats, field, getattr(self.stats, field) + 1)
+
+    def _read(self, key: tuple[str, str, int]) -> tuple[list[SearchResult], float] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT results, stored_at FROM searches WHERE query = ? AND backend = ? AND max_results = ?",
+                key,
+            ).fetchone()
+        if row is None:
+            return None
+        results = [SearchResult(**item) for item in json.loads(row[0])]
+        return results, time.time() - float(row[1])
+
+    def _write(self, key: tuple[str, str, int], results: list[SearchResult]) -> None:
+        payload = json.dumps([asdict(result) for result in results])
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO searches (query, backend, max_results, results, stored_at) VALUES (?, ?, ?, ?, ?)",
+                (*key, payload, time.time()),
+            )
+
+    def _refresh_in_background(self, key: tuple[str, str, int], loader: Loader) -> None:
+        def _refresh() -> None:
+            try:
+                self._write(key, loader())
+                self._count("refreshes")
+            except Exception:  # pragma: no cover - keep serving the stale copy
+                pass
+            finally:
+                with self._lock:
+                    self._refreshing.pop(key, None)
+
+        with self._lock:
+            if key in self._refreshing:
+                return
+            thread = threading.Thread(target=_refresh, name="search-cache-refresh", daemon=True)
+            self._refreshing[key] = thread
+        thread.start()
+
+
+_default_cache: SearchCache | None = None
+_default_lock = threading.Lock()
+
+
+def default_search_cache() -> SearchCache:
+    """Return the shared cache under the memory directory, opening it on first use."""
+
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = SearchCache()
+        return _default_cache
+
+
+__all__ = ["SearchCache", "SearchCacheStats", "default_search_cache"]
@@ -0,0 +1,4 @@
+"""Micro-benchmarks for KeplerMind's hot paths.
+
+Each module is runnable on its own, e.g. ``python -m keplermind.benchmarks.extract``.
+"""
@@ -0,0 +1,86 @@
+"""Measure BM25 index build time, posting size and hybrid query latency."""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+from rich.console import Console
+from rich.table import Table
+
+from keplermind.app.tools.bm25 import BM25Builder
+from keplermind.app.tools.embed import DeterministicEmbedder
+from keplermind.app.tools.rag_index import RagIndex
+from keplermind.app.tools.retrieve import Retriever
+
+
+def _corpus(chunks: int, words: int, vocabulary: int, seed: int) -> list[str]:
+    rng = np.random.default_rng(seed)
+    # Zipf-distributed term ids give a realistic long tail of rare terms.
+    ids = np.minimum(rng.zipf(1.2, size=(chunks, words)), vocabulary) - 1
+    return [" ".join(f"term{term}" for term in row) for row in ids]
+
+
+def run(*, chunks: int, words: int, vocabulary: int, dimensions: int, queries: int) -> Table:
+    texts = _corpus(chunks, words, vocabulary, seed=0)
+    embedder = DeterministicEmbedder(dimensions=dimensions)
+    records = [
+        {"id": index, "text": text, "embedding": row}
+        for index, (text, row) in enumerate(zip(texts, embedder.embed_matrix([str(i) for i in range(chunks)])))
+    ]
+
+    table = Table(title=f"BM25 over {chunks:,} chunks × {words} words ({vocabulary:,}-term vocabulary)")
+    table.add_column("Step")
+    table.add_column("Time", justify="right")
+    table.add_column("Notes")
+
+    started = time.perf_counter()
+    index = RagIndex.from_records(records, meta={}, dimensions=dimensions)
+    vector_only = time.perf_counter() - started
+    table.add_row("Matrix pass only", f"{vector_only:.2f} s", "")
+
+    started = time.perf_counter()
+    builder = BM25Builder()
+    index = RagIndex.from_records(records, meta={}, dimensions=dimensions, lexical=builder)
+    bm25 = builder.build()
+    single_pass = time.perf_counter() - started
+    posting_bytes = bm25.offsets.nbytes + bm25.doc_ids.nbytes + bm25.tfs.nbytes + bm25.doc_lengths.nbytes
+    table.add_row(
+        "Matrix + BM25, one pass",
+        f"{single_pass:.2f} s",
+        f"{len(bm25.vocabulary):,} terms · {len(bm25.doc_ids):,} postings · {posting_bytes / 2**20:.1f} MiB",
+    )
+
+    retriever = Retriever(index.embeddings, index.chunks, embedder=embedder, bm25=bm25)
+    probes = _corpus(queries, 3, vocabulary, seed=1)
+    for label, hybrid in (("Vector query", False), ("Hybrid (RRF) query", True)):
+        retriever.search_many(probes[:1], top_k=10, hybrid=hybrid)
+        started = time.perf_counter()
+        retriever.search_many(probes, top_k=10, hybrid=hybrid)
+        elapsed = (time.perf_counter() - started) / queries * 1000
+        table.add_row(label, f"{elapsed:.2f} ms", "per query, top-10")
+    return table
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chunks", type=int, default=100_000)
+    parser.add_argument("--words", type=int, default=120)
+    parser.add_argument("--vocabulary", type=int, default=50_000)
+    parser.add_argument("--dimensions", type=int, default=12)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args(argv)
+    Console().print(
+        run(
+            chunks=args.chunks,
+            words=args.words,
+            vocabulary=args.vocabulary,
+            dimensions=args.dimensions,
+            queries=args.queries,
+        )
+    )
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI execution guard
+    main()
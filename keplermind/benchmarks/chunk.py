@@ -0,0 +1,81 @@
+"""Compare peak memory and time of list-based and streaming chunking."""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+import tracemalloc
+from typing import Callable
+
+from rich.console import Console
+from rich.table import Table
+
+from keplermind.app.tools.chunk import chunk_text, iter_chunks
+from keplermind.benchmarks.extract import WORDS
+
+
+def _legacy_chunk_text(text: str, *, chunk_size: int, overlap: int) -> list[tuple[str, int, int]]:
+    """The former split-everything-then-join implementation, kept as the baseline."""
+
+    words = text.split()
+    step = chunk_size - overlap
+    return [
+        (" ".join(words[index : index + chunk_size]), index, min(len(words), index + chunk_size))
+        for index in range(0, len(words), step)
+    ]
+
+
+def _measure(work: Callable[[], int]) -> tuple[float, float, int]:
+    tracemalloc.start()
+    started = time.perf_counter()
+    count = work()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1e6, count
+
+
+def run(*, megabytes: float, chunk_size: int, overlap: int) -> Table:
+    rng = random.Random(17)
+    pieces: list[str] = []
+    size = 0
+    while size < megabytes * 1e6:
+        word = rng.choice(WORDS)
+        pieces.append(word)
+        size += len(word) + 1
+    text = " ".join(pieces)
+    del pieces
+
+    def legacy() -> int:
+        return len(_legacy_chunk_text(text, chunk_size=chunk_size, overlap=overlap))
+
+    def listed() -> int:
+        return len(chunk_text(text, chunk_size=chunk_size, overlap=overlap, prefix="doc"))
+
+    def streamed() -> int:
+        count = 0
+        for span in iter_chunks(text, chunk_size=chunk_size, overlap=overlap, prefix="doc"):
+            count += span.end > span.start
+        return count
+
+    table = Table(title=f"Chunking a {len(text) / 1e6:.1f} MB document")
+    table.add_column("Method")
+    table.add_column("Chunks", justify="right")
+    table.add_column("Seconds", justify="right")
+    table.add_column("Peak MB", justify="right")
+    for name, work in (("split + join (legacy)", legacy), ("chunk_text", listed), ("iter_chunks", streamed)):
+        elapsed, peak, count = _measure(work)
+        table.add_row(name, f"{count:,}", f"{elapsed:.3f}", f"{peak:.1f}")
+    return table
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--megabytes", type=float, default=8.0)
+    args = parser.parse_args(argv)
+    Console().print(run(megabytes=args.megabytes, chunk_size=900, overlap=150))
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI execution guard
+    main()
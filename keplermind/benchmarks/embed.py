@@ -0,0 +1,69 @@
+"""Time the deterministic embedder over a large synthetic chunk set."""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import math
+import random
+import time
+
+from rich.console import Console
+from rich.table import Table
+
+from keplermind.app.tools.embed import DeterministicEmbedder
+
+WORDS = "orbit ellipse kepler planet focus period radius velocity sweep area law harmonic".split()
+
+
+def _legacy_embed(text: str, *, dimensions: int = 12) -> list[float]:
+    """The former per-text SHA-256 + pure-Python normalisation, kept as the baseline."""
+
+    digest = hashlib.sha256(text.encode("utf-8")).digest()
+    floats = [int.from_bytes(digest[i : i + 4], "big", signed=False) for i in range(0, 48, 4)][:dimensions]
+    vector = [value / 2**32 for value in floats]
+    norm = math.sqrt(sum(component**2 for component in vector)) or 1.0
+    return [round(component / norm, 6) for component in vector]
+
+
+def run(*, chunks: int, dimensions: list[int]) -> Table:
+    rng = random.Random(11)
+    corpus = [" ".join(rng.choice(WORDS) for _ in range(rng.randint(80, 160))) + f" #{index}" for index in range(chunks)]
+
+    table = Table(title=f"Embedding {chunks:,} chunks")
+    table.add_column("Method")
+    table.add_column("Dims", justify="right")
+    table.add_column("Seconds", justify="right")
+    table.add_column("Chunks/s", justify="right")
+    table.add_column("Speed-up", justify="right")
+
+    started = time.perf_counter()
+    for text in corpus:
+        _legacy_embed(text)
+    baseline = time.perf_counter() - started
+    table.add_row("per-text lists (legacy)", "12", f"{baseline:.3f}", f"{chunks / baseline:,.0f}", "1.0×")
+
+    for size in dimensions:
+        embedder = DeterministicEmbedder(dimensions=size)
+        started = time.perf_counter()
+        matrix = embedder.embed_matrix(corpus)
+        elapsed = time.perf_counter() - started
+        table.add_row(
+            f"embed_matrix ({matrix.nbytes / 1e6:.1f} MB)",
+            str(size),
+            f"{elapsed:.3f}",
+            f"{chunks / elapsed:,.0f}",
+            f"{baseline / elapsed:.1f}×",
+        )
+    return table
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chunks", type=int, default=100_000)
+    args = parser.parse_args(argv)
+    Console().print(run(chunks=args.chunks, dimensions=[12, 64, 384]))
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI execution guard
+    main()
@@ -0,0 +1,86 @@
+"""Measure EpisodicLog write throughput for per-event, buffered and batched writes."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from rich.console import Console
+from rich.table import Table
+
+from keplermind.app.mcp.stores import EpisodicLog
+
+
+def _payload(index: int) -> dict[str, object]:
+    return {"type": "anchor_fact", "score": 0.5, "metadata": {"skill": f"skill-{index % 50}"}}
+
+
+def _legacy(path: Path, events: int) -> float:
+    """The previous write path: rollback journal and one committed transaction per event."""
+
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE events (id INTEGER PRIMARY KEY AUTOINCREMENT, ts TEXT NOT NULL, session TEXT NOT NULL, "
+        "phase TEXT NOT NULL, payload TEXT NOT NULL)"
+    )
+    started = time.perf_counter()
+    for index in range(events):
+        with conn:
+            conn.execute(
+                "INSERT INTO events (ts, session, phase, payload) VALUES (?, ?, ?, ?)",
+                (datetime.utcnow().isoformat(timespec="seconds"), "bench", "memorize", json.dumps(_payload(index))),
+            )
+    elapsed = time.perf_counter() - started
+    conn.close()
+    return elapsed
+
+
+def run(*, events: int, legacy_events: int, buffer_size: int) -> Table:
+    table = Table(title=f"EpisodicLog · {events:,} events")
+    table.add_column("Write path")
+    table.add_column("Events", justify="right")
+    table.add_column("Seconds", justify="right")
+    table.add_column("Events / s", justify="right")
+
+    def add_row(label: str, count: int, elapsed: float) -> None:
+        table.add_row(label, f"{count:,}", f"{elapsed:.2f}", f"{count / elapsed:,.0f}")
+
+    with tempfile.TemporaryDirectory() as scratch:
+        scratch_dir = Path(scratch)
+        add_row("Rollback journal, commit per event", legacy_events, _legacy(scratch_dir / "legacy.sqlite", legacy_events))
+
+        for label, name, size in (
+            ("WAL, record() per event", "wal.sqlite", 0),
+            (f"WAL, record() with a {buffer_size:,}-event buffer", "buffered.sqlite", buffer_size),
+        ):
+            log = EpisodicLog(db_path=scratch_dir / name, buffer_size=size)
+            started = time.perf_counter()
+            for index in range(events):
+                log.record(session="bench", phase="memorize", payload=_payload(index))
+            log.close()
+            add_row(label, events, time.perf_counter() - started)
+
+        log = EpisodicLog(db_path=scratch_dir / "batched.sqlite")
+        started = time.perf_counter()
+        log.record_many(("bench", "memorize", _payload(index)) for index in range(events))
+        log.close()
+        add_row("WAL, one record_many()", events, time.perf_counter() - started)
+    return table
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--legacy-events", type=int, default=2_000, help="the per-event fsync path is slow")
+    parser.add_argument("--buffer-size", type=int, default=1_000)
+    args = parser.parse_args(argv)
+    Console().print(run(events=args.events, legacy_events=args.legacy_events, buffer_size=args.buffer_size))
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI execution guard
+    main()
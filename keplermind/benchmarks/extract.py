@@ -0,0 +1,66 @@
+"""Compare HTML-to-text extraction engines over a synthetic corpus."""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from rich.console import Console
+from rich.table import Table
+
+from keplermind.app.tools.scrape import _resolve_engine, extract_text
+
+WORDS = "orbit ellipse kepler planet focus period radius velocity sweep area law harmonic".split()
+
+
+def synthetic_page(rng: random.Random, *, paragraphs: int) -> str:
+    body = []
+    for index in range(paragraphs):
+        sentence = " ".join(rng.choice(WORDS) for _ in range(rng.randint(20, 60)))
+        body.append(f"<div class='c{index % 7}'><p>{sentence} <a href='/x{index}'>link</a> <b>bold</b>.</p></div>")
+        if index % 10 == 0:
+            body.append("<script>window.track && window.track({event: 'view', id: %d});</script>" % index)
+    nav = "<nav><ul>" + "".join(f"<li><a href='/{w}'>{w}</a></li>" for w in WORDS) + "</ul></nav>"
+    styles = "<style>" + "p { margin: 0 }" * 50 + "</style>"
+    return (
+        f"<html><head><title>Synthetic {paragraphs}</title>{styles}</head>"
+        f"<body>{nav}{''.join(body)}<footer>© KeplerMind</footer></body></html>"
+    )
+
+
+def run(*, pages: int, paragraphs: int, engines: list[str]) -> Table:
+    rng = random.Random(7)
+    corpus = [synthetic_page(rng, paragraphs=paragraphs) for _ in range(pages)]
+    size_mb = sum(len(page) for page in corpus) / 1e6
+
+    table = Table(title=f"Extraction over {pages} pages ({size_mb:.1f} MB)")
+    table.add_column("Engine")
+    table.add_column("Seconds", justify="right")
+    table.add_column("MB/s", justify="right")
+    table.add_column("Speed-up", justify="right")
+
+    baseline = None
+    for engine in engines:
+        if _resolve_engine(engine) != engine:
+            table.add_row(engine, "unavailable", "-", "-")
+            continue
+        started = time.perf_counter()
+        for page in corpus:
+            extract_text(page, engine=engine)
+        elapsed = time.perf_counter() - started
+        baseline = baseline or elapsed
+        table.add_row(engine, f"{elapsed:.3f}", f"{size_mb / elapsed:.1f}", f"{baseline / elapsed:.1f}×")
+    return table
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--paragraphs", type=int, default=150)
+    args = parser.parse_args(argv)
+    Console().print(run(pages=args.pages, paragraphs=args.paragraphs, engines=["readability", "html.parser", "lxml"]))
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI execution guard
+    main()
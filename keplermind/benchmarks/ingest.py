@@ -0,0 +1,49 @@
+"""Measure process-pool ingestion (extract → chunk → embed) as workers scale."""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import time
+
+from rich.console import Console
+from rich.table import Table
+
+from keplermind.app.tools.ingest import IngestJob, iter_ingest
+from keplermind.benchmarks.extract import synthetic_page
+
+
+def run(*, sources: int, paragraphs: int, workers: list[int], engine: str) -> Table:
+    rng = random.Random(13)
+    jobs = [IngestJob(html=synthetic_page(rng, paragraphs=paragraphs), engine=engine) for _ in range(sources)]
+
+    table = Table(title=f"Ingesting {sources} sources with the {engine} engine")
+    table.add_column("Workers", justify="right")
+    table.add_column("Seconds", justify="right")
+    table.add_column("Chunks", justify="right")
+    table.add_column("Speed-up", justify="right")
+
+    baseline = None
+    for count in workers:
+        started = time.perf_counter()
+        chunks = sum(len(document) for document in iter_ingest(jobs, chunk_size=900, overlap=150, workers=count))
+        elapsed = time.perf_counter() - started
+        baseline = baseline or elapsed
+        table.add_row(str(count), f"{elapsed:.2f}", f"{chunks:,}", f"{baseline / elapsed:.1f}×")
+    return table
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sources", type=int, default=500)
+    parser.add_argument("--paragraphs", type=int, default=150)
+    parser.add_argument("--engine", default="readability")
+    args = parser.parse_args(argv)
+    cores = os.cpu_count() or 1
+    counts = sorted({1, 2, 4, cores} & set(range(1, cores + 1)))
+    Console().print(run(sources=args.sources, paragraphs=args.paragraphs, workers=counts, engine=args.engine))
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI execution guard
+    main()
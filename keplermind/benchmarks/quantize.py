@@ -0,0 +1,94 @@
+"""Compare float32, int8 and product-quantized stores under a fixed RAM budget."""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+from rich.console import Console
+from rich.table import Table
+
+from keplermind.app.tools.quantize import Int8Vectors, PQVectors, QuantizedVectors
+from keplermind.app.tools.retrieve import select_top_k
+
+
+def _corpus(count: int, dimensions: int, seed: int) -> np.ndarray:
+    """Clustered unit vectors; uniform random vectors would make every method look equally bad."""
+
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(max(1, count // 250), dimensions))
+    vectors = centres[rng.integers(0, len(centres), size=count)] + 0.5 * rng.normal(size=(count, dimensions))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def _recall(found: np.ndarray, truth: np.ndarray) -> float:
+    return float(np.mean([len(set(row) & set(expected)) / truth.shape[1] for row, expected in zip(found.tolist(), truth.tolist())]))
+
+
+def run(*, chunks: int, dimensions: int, budget_mib: int, queries: int, top_k: int, rerank: int) -> Table:
+    vectors = _corpus(chunks, dimensions, seed=0)
+    rng = np.random.default_rng(1)
+    probes = vectors[rng.choice(chunks, size=queries, replace=False)] + 0.05 * rng.normal(size=(queries, dimensions))
+    probes = probes.astype(np.float32)
+    truth = np.argsort(-(probes @ vectors.T), axis=1)[:, :top_k]
+    budget = budget_mib * 2**20
+
+    table = Table(title=f"{chunks:,} × {dimensions} dims · recall@{top_k} · {budget_mib} MiB RAM budget")
+    table.add_column("Store")
+    table.add_column("Bytes / vector", justify="right")
+    table.add_column("Vectors in budget", justify="right")
+    table.add_column("Recall", justify="right")
+    table.add_column(f"Recall + re-rank {rerank}", justify="right")
+    table.add_column("ms / query", justify="right")
+
+    started = time.perf_counter()
+    exact, _ = select_top_k(probes @ vectors.T, top_k)
+    elapsed = (time.perf_counter() - started) / queries * 1000
+    table.add_row("float32", str(4 * dimensions), f"{budget // (4 * dimensions):,}", f"{_recall(exact, truth):.3f}", "—", f"{elapsed:.3f}")
+
+    stores: list[tuple[str, QuantizedVectors]] = [("int8 + scale", Int8Vectors.from_vectors(vectors))]
+    for subspaces in (dimensions // 4, dimensions // 8):
+        stores.append((f"PQ {subspaces}×8 bit", PQVectors.from_vectors(vectors, subspaces=subspaces)))
+    for label, store in stores:
+        # Codebooks are a fixed cost; per-vector cost is what scales with the corpus.
+        fixed = store.nbytes - int(store.codes.nbytes) - (store.scales.nbytes if isinstance(store, Int8Vectors) else 0)
+        per_vector = (store.nbytes - fixed) / len(store)
+        started = time.perf_counter()
+        approximate, _ = store.search(probes, top_k=top_k)
+        elapsed = (time.perf_counter() - started) / queries * 1000
+        reranked, _ = store.search(probes, top_k=top_k, exact=vectors, rerank=rerank)
+        table.add_row(
+            label,
+            f"{per_vector:.0f}",
+            f"{int((budget - fixed) // per_vector):,}",
+            f"{_recall(approximate, truth):.3f}",
+            f"{_recall(reranked, truth):.3f}",
+            f"{elapsed:.3f}",
+        )
+    return table
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chunks", type=int, default=50_000)
+    parser.add_argument("--dimensions", type=int, default=128)
+    parser.add_argument("--budget-mib", type=int, default=256)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--rerank", type=int, default=100)
+    args = parser.parse_args(argv)
+    Console().print(
+        run(
+            chunks=args.chunks,
+            dimensions=args.dimensions,
+            budget_mib=args.budget_mib,
+            queries=args.queries,
+            top_k=args.top_k,
+            rerank=args.rerank,
+        )
+    )
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI execution guard
+    main()
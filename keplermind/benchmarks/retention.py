@@ -0,0 +1,79 @@
+"""Measure retention eviction cost as the number of tracked memories grows."""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from rich.console import Console
+from rich.table import Table
+
+from keplermind.app.mcp.retention import Budget, IndexedHeap, Retained, RetentionEngine
+
+HALF_LIFE = 30 * 24 * 3600.0
+
+
+def _sorted_eviction(entries: list[Retained], now: float) -> Retained:
+    """The baseline: rank every entry by its decayed score on each eviction."""
+
+    return sorted(entries, key=lambda entry: entry.decayed_score(now, HALF_LIFE))[0]
+
+
+def run(*, sizes: list[int], commits: int) -> Table:
+    rng = random.Random(0)
+    table = Table(title=f"RetentionEngine · {commits} commits at capacity")
+    table.add_column("Memories", justify="right")
+    table.add_column("Sort per eviction µs", justify="right")
+    table.add_column("Heap evict µs", justify="right")
+    table.add_column("Engine track + evict µs", justify="right")
+
+    for size in sizes:
+        entries = [
+            Retained(f"doc_{index}", "anchor_fact", rng.random(), 100, rng.uniform(0, HALF_LIFE))
+            for index in range(size)
+        ]
+        now = HALF_LIFE
+
+        baseline_entries = list(entries)
+        started = time.perf_counter()
+        for commit in range(min(commits, 20)):
+            baseline_entries.append(Retained(f"new_{commit}", "anchor_fact", rng.random(), 100, now))
+            baseline_entries.remove(_sorted_eviction(baseline_entries, now))
+        baseline = (time.perf_counter() - started) / min(commits, 20) * 1e6
+
+        heap = IndexedHeap()
+        for entry in entries:
+            heap.set(entry.key, entry.priority(HALF_LIFE))
+        started = time.perf_counter()
+        for commit in range(commits):
+            heap.set(f"new_{commit}", Retained(f"new_{commit}", "anchor_fact", rng.random(), 100, now).priority(HALF_LIFE))
+            heap.pop()
+        heap_only = (time.perf_counter() - started) / commits * 1e6
+
+        with tempfile.TemporaryDirectory() as scratch:
+            engine = RetentionEngine(Path(scratch) / "retention.sqlite", budgets={}, default_budget=Budget(max_items=size))
+            engine.track(((entry.key, entry.type, entry.score, entry.size) for entry in entries), now=0.0)
+            started = time.perf_counter()
+            for commit in range(commits):
+                engine.track([(f"new_{commit}", "anchor_fact", rng.random(), 100)], now=now)
+                engine.evict(now=now)
+            tracked = (time.perf_counter() - started) / commits * 1e6
+            engine.close()
+
+        table.add_row(f"{size:,}", f"{baseline:,.0f}", f"{heap_only:.1f}", f"{tracked:,.0f}")
+    return table
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--commits", type=int, default=500)
+    args = parser.parse_args(argv)
+    Console().print(run(sizes=args.sizes, commits=args.commits))
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI execution guard
+    main()
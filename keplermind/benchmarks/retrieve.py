@@ -0,0 +1,49 @@
+"""Measure top-k retrieval latency over a large synthetic RAG index."""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from rich.console import Console
+from rich.table import Table
+
+from keplermind.app.tools.embed import DeterministicEmbedder
+from keplermind.app.tools.retrieve import Retriever
+
+
+def run(*, chunks: int, dimensions: int, top_k: int, repeats: int) -> Table:
+    embedder = DeterministicEmbedder(dimensions=dimensions)
+    matrix = embedder.embed_matrix([f"chunk {index}" for index in range(chunks)])
+    retriever = Retriever(matrix, [{"id": index} for index in range(chunks)], embedder=embedder)
+
+    table = Table(title=f"Top-{top_k} retrieval over {chunks:,} chunks × {dimensions} dims")
+    table.add_column("Queries per call", justify="right")
+    table.add_column("Mode")
+    table.add_column("ms / call", justify="right")
+    table.add_column("ms / query", justify="right")
+
+    for batch in (1, 16, 128):
+        for mode, options in (("top-k", {}), ("mmr", {"diversity": 0.5})):
+            queries = embedder.embed_matrix([f"query {batch} {index}" for index in range(batch)])
+            retriever.search_vectors(queries, top_k=top_k, **options)
+            started = time.perf_counter()
+            for _ in range(repeats):
+                retriever.search_vectors(queries, top_k=top_k, **options)
+            elapsed = (time.perf_counter() - started) / repeats * 1000
+            table.add_row(str(batch), mode, f"{elapsed:.2f}", f"{elapsed / batch:.3f}")
+    return table
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chunks", type=int, default=100_000)
+    parser.add_argument("--dimensions", type=int, default=12)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args(argv)
+    Console().print(run(chunks=args.chunks, dimensions=args.dimensions, top_k=args.top_k, repeats=args.repeats))
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI execution guard
+    main()
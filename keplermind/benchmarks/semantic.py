@@ -0,0 +1,110 @@
+"""Measure semantic store lookups and duplicate checks as the number of memories grows."""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from rich.console import Console
+from rich.table import Table
+
+from keplermind.app.mcp.stores import PersistentSemanticStore, SemanticDocument, SemanticStore
+from keplermind.benchmarks.extract import WORDS
+
+
+def _legacy_search(documents: list[SemanticDocument], query: str, top_k: int) -> list[SemanticDocument]:
+    """The former scan-and-sort implementation, kept as the baseline."""
+
+    def _score(text: str) -> int:
+        query_tokens = set(query.lower().split())
+        return sum(1 for token in query_tokens if token in text.lower())
+
+    return sorted(documents, key=lambda doc: _score(doc.content), reverse=True)[:top_k]
+
+
+def _vocabulary(size: int) -> list[str]:
+    return WORDS + [f"term{index}" for index in range(size)]
+
+
+def _memories(count: int, vocabulary: list[str], rng: random.Random) -> list[str]:
+    # Zipf-like weights: a few very common words and a long tail.
+    weights = [1.0 / (rank + 1) for rank in range(len(vocabulary))]
+    skills = [f"skill{index}" for index in range(max(1, count // 50))]
+    return [
+        f"Explanation for {rng.choice(skills)}: " + " ".join(rng.choices(vocabulary, weights, k=rng.randint(8, 24)))
+        for _ in range(count)
+    ]
+
+
+def run(*, sizes: list[int], queries: int, top_k: int) -> Table:
+    rng = random.Random(23)
+    table = Table(title=f"SemanticStore.similarity_search · top-{top_k}")
+    table.add_column("Memories", justify="right")
+    table.add_column("Legacy scan ms / query", justify="right")
+    table.add_column("Inverted index ms / query", justify="right")
+    table.add_column("Vector ms / query", justify="right")
+    table.add_column("Dedupe insert ms", justify="right")
+    table.add_column("FTS5 bulk insert s", justify="right")
+    table.add_column("FTS5 ms / query", justify="right")
+
+    for size in sizes:
+        # Bulk-load without the duplicate check, which costs one scan per insert.
+        store = SemanticStore(dedupe_threshold=float("inf"))
+        vocabulary = _vocabulary(20_000)
+        memories = _memories(size, vocabulary, rng)
+        store.add_many((content, None) for content in memories)
+        probes = [f"skill{rng.randrange(max(1, size // 50))} {rng.choice(vocabulary)}" for _ in range(queries)]
+
+        started = time.perf_counter()
+        for probe in probes:
+            store.similarity_search(probe, top_k=top_k)
+        indexed = (time.perf_counter() - started) / queries * 1000
+
+        started = time.perf_counter()
+        for probe in probes:
+            store.vector_search(probe, top_k=top_k)
+        vector = (time.perf_counter() - started) / queries * 1000
+
+        store.dedupe_threshold = 0.9
+        started = time.perf_counter()
+        for content in memories[:queries]:
+            store.add(content)
+        dedupe = (time.perf_counter() - started) / queries * 1000
+
+        documents = list(store.all())
+        legacy_probes = probes[: max(1, queries // 20)]
+        started = time.perf_counter()
+        for probe in legacy_probes:
+            _legacy_search(documents, probe, top_k)
+        legacy = (time.perf_counter() - started) / len(legacy_probes) * 1000
+
+        with tempfile.TemporaryDirectory() as scratch:
+            persistent = PersistentSemanticStore(Path(scratch) / "semantic.sqlite", dedupe_threshold=float("inf"))
+            started = time.perf_counter()
+            persistent.add_many((content, {"type": "anchor_fact"}) for content in memories)
+            inserted = time.perf_counter() - started
+            started = time.perf_counter()
+            for probe in probes:
+                persistent.similarity_search(probe, top_k=top_k)
+            fts = (time.perf_counter() - started) / queries * 1000
+            persistent.close()
+        table.add_row(
+            f"{size:,}", f"{legacy:.2f}", f"{indexed:.3f}", f"{vector:.3f}", f"{dedupe:.3f}", f"{inserted:.2f}", f"{fts:.3f}"
+        )
+    return table
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=5)
+    args = parser.parse_args(argv)
+    Console().print(run(sizes=args.sizes, queries=args.queries, top_k=args.top_k))
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI execution guard
+    main()
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from typing import Iterator
+
+import pytest
+
+from keplermind.app.tools import chunk_store as chunk_store_module
+from keplermind.app.tools import embed_cache as embed_cache_module
+from keplermind.app.tools import scrape_cache as scrape_cache_module
+from keplermind.app.tools import search_cache as search_cache_module
+from keplermind.app.tools.chunk_store import ChunkStore
+from keplermind.app.tools.embed_cache import EmbeddingCache
+from keplermind.app.tools.scrape_cache import ScrapeCache
+from keplermind.app.tools.search_cache import SearchCache
+
+
+@pytest.fixture(autouse=True)
+def isolated_default_stores(tmp_path_factory, monkeypatch) -> Iterator[None]:
+    """Point the shared persistent stores at a per-test directory instead of the package."""
+
+    root = tmp_path_factory.mktemp("defaults")
+    defaults = [
+        ChunkStore(root / "chunks.sqlite"),
+        ScrapeCache(root / "scrape_cache"),
+        SearchCache(root / "search_cache.sqlite"),
+        EmbeddingCache(root / "embedding_cache"),
+    ]
+    monkeypatch.setattr(chunk_store_module, "_default_store", defaults[0])
+    monkeypatch.setattr(scrape_cache_module, "_default_cache", defaults[1])
+    monkeypatch.setattr(search_cache_module, "_default_cache", defaults[2])
+    monkeypatch.setattr(embed_cache_module, "_default_cache", defaults[3])
+    yield
+    for default in defaults:
+        default.close()
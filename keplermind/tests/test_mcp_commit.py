@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import random
+import sqlite3
+
 from keplermind.app.mcp.controller import MemoryController
-from keplermind.app.mcp.stores import EpisodicLog, PreferenceStore, SemanticStore
+from keplermind.app.mcp.retention import Budget, IndexedHeap, RetentionEngine
+from keplermind.app.mcp.stores import EpisodicLog, PersistentSemanticStore, PreferenceStore, SemanticStore
 
 
 def test_memory_commit_persists_candidates(tmp_path) -> None:
@@ -43,3 +47,202 @@ def test_memory_commit_persists_candidates(tmp_path) -> None:
 
     events = controller.episodic_log.fetch_all()
     assert len(events) == 2
+
+
+def test_semantic_store_ranks_through_the_inverted_index() -> None:
+    store = SemanticStore()
+    store.add("Orbital period and radius")
+    store.add("Kepler's third law relates period to radius; period squared.")
+    store.add("Velocity along an ellipse")
+    store.add("Period of a pendulum")
+
+    ranked = [document.doc_id for document in store.similarity_search("PERIOD radius", top_k=3)]
+    # Two tokens matched beats one; more occurrences break the tie; then insertion order.
+    assert ranked == ["doc_2", "doc_1", "doc_4"]
+    assert [document.doc_id for document in store.similarity_search("ellipse", top_k=3)] == ["doc_3", "doc_1", "doc_2"]
+    assert store.similarity_search("unknown", top_k=0) == []
+
+    for index in range(50):
+        store.add(f"period note {index}")
+    tied = [document.doc_id for document in store.similarity_search("note", top_k=3)]
+    assert tied == ["doc_5", "doc_6", "doc_7"]
+
+
+def test_persistent_semantic_store_survives_reopening(tmp_path) -> None:
+    path = tmp_path / "semantic.sqlite"
+    store = PersistentSemanticStore(path)
+    assert not path.exists()
+
+    ids = store.add_many(
+        [
+            ("Kepler's third law relates period to radius; period squared.", {"skill": "Orbits"}),
+            ("Velocity along an ellipse", {"skill": "Orbits", "type": "anchor_fact"}),
+            ("Period of a pendulum", None),
+        ]
+    )
+    assert ids == ["doc_1", "doc_2", "doc_3"]
+    store.close()
+
+    reopened = PersistentSemanticStore(path)
+    documents = reopened.all()
+    assert len(documents) == 3 and documents[1].metadata == {"skill": "Orbits", "type": "anchor_fact"}
+    assert [document.doc_id for document in documents] == ids
+
+    ranked = [document.doc_id for document in reopened.similarity_search("period radius", top_k=2)]
+    assert ranked == ["doc_1", "doc_3"]
+    assert [document.doc_id for document in reopened.similarity_search("ellipse", top_k=2)] == ["doc_2", "doc_1"]
+
+    controller = MemoryController(
+        episodic_log=EpisodicLog(db_path=tmp_path / "events.sqlite"),
+        semantic_store=reopened,
+        preference_store=PreferenceStore(json_path=tmp_path / "prefs.json"),
+    )
+    assert [memory["id"] for memory in controller.retrieve(limit=1, query="pendulum")] == ["doc_3"]
+    assert [memory["id"] for memory in controller.retrieve(limit=2)] == ["doc_1", "doc_2"]
+
+
+def test_semantic_memory_merges_near_duplicates_on_insert(tmp_path) -> None:
+    path = tmp_path / "semantic.sqlite"
+    for store in (SemanticStore(), PersistentSemanticStore(path)):
+        first = store.add("Explanation for Foundations: Kepler orbits are ellipses.", metadata={"skill": "Foundations"})
+        again = store.add_many(
+            [
+                ("Explanation for Foundations: Kepler orbits are ellipses!", {"session": "s2"}),
+                ("Gap for Algebra: 0.40", {"skill": "Algebra"}),
+                ("explanation for foundations kepler orbits are ellipses", {"session": "s3"}),
+            ]
+        )
+        assert again[0] == again[2] == first and again[1] != first
+
+        documents = list(store.all())
+        assert len(documents) == 2
+        assert documents[0].count == 3
+        assert documents[0].metadata == {"skill": "Foundations", "session": "s3"}
+        assert [document.doc_id for document in store.vector_search("kepler ellipses", top_k=5)] == [first]
+
+    # Embeddings persist, and stores written before they existed are backfilled.
+    reopened = PersistentSemanticStore(path)
+    assert reopened.add("Gap for Algebra: 0.40") == "doc_2"
+    assert reopened.all()[1].count == 2
+
+    legacy = tmp_path / "legacy.sqlite"
+    PersistentSemanticStore(legacy).add("Period of a pendulum")
+    with sqlite3.connect(legacy) as conn:
+        # The layout before embeddings were stored.
+        conn.execute("ALTER TABLE documents DROP COLUMN embedding")
+        conn.execute("ALTER TABLE documents DROP COLUMN count")
+    upgraded = PersistentSemanticStore(legacy)
+    assert upgraded.vector_search("pendulum") == []
+    assert upgraded.backfill_embeddings() == 1
+    assert upgraded.add("period of a pendulum") == "doc_1"
+    assert [document.doc_id for document in upgraded.vector_search("pendulum")] == ["doc_1"]
+    assert [document.doc_id for document in upgraded.similarity_search("pendulum", top_k=1)] == ["doc_1"]
+
+
+def test_indexed_heap_pops_in_priority_order_after_updates_and_removals() -> None:
+    rng = random.Random(0)
+    heap = IndexedHeap()
+    expected: dict[str, float] = {}
+    for index in range(300):
+        key = f"k{rng.randrange(120)}"
+        if key in heap and index % 5 == 0:
+            heap.remove(key)
+            del expected[key]
+        else:
+            expected[key] = rng.random()
+            heap.set(key, expected[key])
+    popped = [heap.pop() for _ in range(len(heap))]
+    assert popped == sorted(expected.items(), key=lambda item: item[1])
+
+
+def test_retention_evicts_lowest_decayed_scores_and_logs_them(tmp_path) -> None:
+    day = 24 * 3600.0
+    engine = RetentionEngine(
+        tmp_path / "retention.sqlite",
+        budgets={"preference": Budget(max_items=1)},
+        default_budget=Budget(max_items=2, max_bytes=40),
+        half_life=day,
+    )
+    engine.track([("doc_1", "anchor_fact", 0.9, 10), ("doc_2", "anchor_fact", 0.5, 10)], now=0.0)
+    # Two days later 0.9 has decayed to 0.225, below a fresh 0.3.
+    engine.track([("doc_3", "anchor_fact", 0.3, 10)], now=2 * day)
+    evicted = engine.evict(now=2 * day)
+    assert [(eviction.key, eviction.reason) for eviction in evicted] == [("doc_2", "items")]
+    assert evicted[0].score == 0.125
+
+    engine.track([("doc_4", "anchor_fact", 0.8, 35)], now=2 * day)
+    assert [(eviction.key, eviction.reason) for eviction in engine.evict(now=2 * day)] == [
+        ("doc_1", "items"),
+        ("doc_3", "bytes"),
+    ]
+    engine.close()
+    reopened = RetentionEngine(tmp_path / "retention.sqlite", default_budget=Budget(max_items=2))
+    assert len(reopened) == 1 and "doc_4" in reopened
+
+    controller = MemoryController(
+        episodic_log=EpisodicLog(db_path=tmp_path / "events.sqlite"),
+        semantic_store=SemanticStore(),
+        preference_store=PreferenceStore(json_path=tmp_path / "prefs.json"),
+        retention=RetentionEngine(
+            tmp_path / "controller.sqlite", budgets={"preference": Budget(max_items=1)}, default_budget=Budget(max_items=1)
+        ),
+    )
+    for session, (style, usefulness) in enumerate([("bullet", 0.9), ("narrative", 0.2)]):
+        controller.propose(
+            [
+                {
+                    "type": "preference",
+                    "content": f"Preferred explanation style: {style}",
+                    "metadata": {"key": f"style_{style}"},
+                    "scores": {"usefulness": usefulness},
+                },
+                {
+                    "type": "anchor_fact",
+                    "content": f"Orbit fact {session}: period {style} squared",
+                    "metadata": {},
+                    "scores": {"usefulness": usefulness},
+                },
+            ]
+        )
+        controller.review(limit=2)
+        controller.commit(f"session-{session}")
+
+    assert list(controller.preference_store.as_dict()) == ["style_bullet"]
+    assert [document.doc_id for document in controller.semantic_store.all()] == ["doc_1"]
+    assert controller.semantic_store.vector_search("orbit fact narrative", top_k=5)[0].doc_id == "doc_1"
+    evictions = [event.payload for event in controller.episodic_log.fetch_all() if event.phase == "evict"]
+    assert {(event["id"], event["type"]) for event in evictions} == {("pref:style_narrative", "preference"), ("doc_2", "anchor_fact")}
+
+
+def test_persistent_semantic_store_deletes_from_index_and_fts(tmp_path) -> None:
+    store = PersistentSemanticStore(tmp_path / "semantic.sqlite")
+    ids = store.add_many([("Period of a pendulum", None), ("Velocity along an ellipse", None)])
+    assert store.delete_many([ids[0], "doc_99"]) == 1
+    assert [document.doc_id for document in store.all()] == [ids[1]]
+    assert store.vector_search("pendulum period") == []
+    assert [document.doc_id for document in store.similarity_search("pendulum", top_k=2)] == [ids[1]]
+    assert store.add("Period of a pendulum") == "doc_3"
+
+
+def test_episodic_log_batches_and_buffers_writes(tmp_path) -> None:
+    path = tmp_path / "events.sqlite"
+    log = EpisodicLog(db_path=path)
+    assert log.record(session="s", phase="plan", payload={}) == 1
+    assert log.record_many([("s", "memorize", {"n": index}) for index in range(3)]) == [2, 3, 4]
+    assert log.record_many([]) == []
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    log.close()
+
+    buffered = EpisodicLog(db_path=path, buffer_size=3)
+    assert buffered.record(session="s", phase="a", payload={}) is None
+    assert buffered.record(session="s", phase="b", payload={}) is None
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM events").fetchone()[0] == 4
+    # A batch goes out together with whatever was buffered before it.
+    assert buffered.record_many([("s", "c", {})]) == [7]
+    buffered.record(session="s", phase="d", payload={})
+    assert [event.phase for event in buffered.fetch_all()][-4:] == ["a", "b", "c", "d"]
+    buffered.record(session="s", phase="e", payload={})
+    buffered.close()
+    assert [event.phase for event in EpisodicLog(db_path=path).fetch_all()][-1] == "e"
@@ -1,11 +1,22 @@
 from __future__ import annotations
 
 import json
+import random
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+import numpy as np
 from rich.console import Console
 
-from keplermind.app.nodes import build_rag, intake, research
+from keplermind.app.nodes import build_rag, intake, pipeline, research
+from keplermind.app.tools.chunk import _word_bounds, chunk_text, iter_chunks
+from keplermind.app.tools.chunk_store import ChunkStore
+from keplermind.app.tools.embed import DeterministicEmbedder, HashingEmbedder
+from keplermind.app.tools.embed_cache import CachedEmbedder, EmbeddingCache, EmbeddingSpace
+from keplermind.app.tools.ingest import IngestJob, iter_ingest
+from keplermind.app.tools.rag_index import RagIndex
+from keplermind.app.tools.scrape_cache import ScrapeCache
+from keplermind.app.tools.search_cache import SearchCache
 
 
 def test_research_and_rag_pipeline(tmp_path) -> None:
@@ -17,7 +28,12 @@ def test_research_and_rag_pipeline(tmp_path) -> None:
     }
 
     state = intake.run(state, console=console)
-    state = research.run(state, console=console)
+    state = research.run(
+        state,
+        console=console,
+        cache=ScrapeCache(tmp_path / "scrape_cache"),
+        search_cache=SearchCache(tmp_path / "search_cache.sqlite"),
+    )
 
     assert len(state["sources"]) >= 8
     assert state["notes"]
@@ -28,15 +44,331 @@ def test_research_and_rag_pipeline(tmp_path) -> None:
         stored = json.load(handle)
     assert stored[0]["title"].startswith("Quantum Tunneling")
 
-    state = build_rag.run(state, console=console)
+    state = build_rag.run(
+        state,
+        console=console,
+        embedding_cache=EmbeddingCache(tmp_path / "embedding_cache"),
+        chunk_store=ChunkStore(tmp_path / "chunks.sqlite"),
+    )
     rag = state["rag"]
     assert rag["vector_ready"] is True
     assert rag["chunks"], "RAG builder should emit chunks"
 
-    chunk = rag["chunks"][0]
-    assert len(chunk["embedding"]) == 12
+    assert rag["embeddings"].shape == (len(rag["chunks"]), 12)
+    assert rag["embeddings"].dtype == np.float32
 
     rag_path = Path(state["artifacts"]["rag_index"]["path"])
     assert rag_path.exists()
-    payload = json.loads(rag_path.read_text(encoding="utf-8"))
-    assert payload["meta"]["chunk_size"] >= 900
+    manifest = json.loads(rag_path.read_text(encoding="utf-8"))
+    assert manifest["chunk_size"] >= 900
+
+    index = RagIndex.load(rag_path)
+    assert isinstance(index.embeddings, np.memmap)
+    assert index.chunks == rag["chunks"] and np.array_equal(index.embeddings, rag["embeddings"])
+    exported = RagIndex.load(index.export_json(tmp_path / "debug.json"))
+    assert exported.chunks == index.chunks
+    assert np.allclose(exported.embeddings, index.embeddings, atol=1e-6)
+
+
+def test_research_merges_near_duplicate_sources(tmp_path) -> None:
+    rng = random.Random(3)
+    vocabulary = [f"term{index}" for index in range(500)]
+    articles = [" ".join(rng.choice(vocabulary) for _ in range(200)) for _ in range(3)]
+
+    def fetcher(url: str) -> str:
+        position = int(url.rsplit("/", 1)[-1], 16) % 3
+        return f"<html><head><title>Mirror</title></head><body><p>{articles[position]}</p></body></html>"
+
+    state = {
+        "session_id": "dedupe",
+        "topic": "Syndicated News",
+        "search_backend": "duckduckgo",
+        "artifacts": {"output_dir": {"path": str(tmp_path)}},
+    }
+    state = research.run(
+        state,
+        console=Console(quiet=True),
+        fetcher=fetcher,
+        cache=ScrapeCache(tmp_path / "scrape_cache"),
+        search_cache=SearchCache(tmp_path / "search_cache.sqlite"),
+    )
+
+    sources = state["sources"]
+    assert len(sources) == len({source["content"] for source in sources}) <= 3
+    merged = [url for source in sources for url in source.get("merged_urls", [])]
+    assert len(sources) + len(merged) >= 8
+    assert [note.split("]")[0] for note in state["notes"]] == [f"[{index}" for index in range(1, len(sources) + 1)]
+
+
+def test_pipeline_matches_batch_research_and_rag(tmp_path) -> None:
+    def fetcher(url: str) -> str:
+        words = " ".join(f"{url.rsplit('/', 1)[-1]}-{index}" for index in range(400))
+        return f"<html><head><title>Page</title></head><body><p>{words}</p></body></html>"
+
+    def fresh_state(name: str) -> dict:
+        output_dir = tmp_path / name
+        output_dir.mkdir()
+        return {
+            "session_id": name,
+            "topic": "Stellar Parallax",
+            "search_backend": "duckduckgo",
+            "artifacts": {"output_dir": {"path": str(output_dir)}},
+        }
+
+    console = Console(quiet=True)
+    cache = ScrapeCache(tmp_path / "scrape_cache")
+    search_cache = SearchCache(tmp_path / "search_cache.sqlite")
+    embedding_cache = EmbeddingCache(tmp_path / "embedding_cache")
+    batch = research.run(fresh_state("batch"), console=console, fetcher=fetcher, cache=cache, search_cache=search_cache)
+    batch = build_rag.run(
+        batch,
+        console=console,
+        embedding_cache=embedding_cache,
+        chunk_store=ChunkStore(tmp_path / "batch.sqlite"),
+    )
+    streamed = pipeline.run(
+        fresh_state("streamed"),
+        console=console,
+        fetcher=fetcher,
+        cache=cache,
+        search_cache=search_cache,
+        embedding_cache=embedding_cache,
+        chunk_store=ChunkStore(tmp_path / "streamed.sqlite"),
+        queue_size=1,
+    )
+
+    def strip(sources: list[dict]) -> list[dict]:
+        return [{key: value for key, value in source.items() if key != "retrieved_at"} for source in sources]
+
+    assert strip(streamed["sources"]) == strip(batch["sources"])
+    assert streamed["notes"] == batch["notes"]
+    assert streamed["rag"]["chunks"] == batch["rag"]["chunks"]
+    assert np.array_equal(streamed["rag"]["embeddings"], batch["rag"]["embeddings"])
+    assert Path(streamed["artifacts"]["rag_index"]["path"]).exists()
+
+    limited = pipeline.run(
+        fresh_state("limited"),
+        console=console,
+        fetcher=fetcher,
+        cache=cache,
+        search_cache=search_cache,
+        embedding_cache=embedding_cache,
+        chunk_store=ChunkStore(tmp_path / "limited.sqlite"),
+        max_sources=2,
+    )
+    assert len(limited["sources"]) == 2
+    assert {chunk["source"] for chunk in limited["rag"]["chunks"]} <= {source["url"] for source in limited["sources"]}
+
+
+def test_embedder_matrix_is_float32_unit_rows_of_any_dimension() -> None:
+    texts = ["alpha", "beta", "alpha", ""]
+    for dimensions in (12, 100):
+        embedder = DeterministicEmbedder(dimensions=dimensions)
+        matrix = embedder.embed_matrix(texts)
+        assert matrix.shape == (4, dimensions) and matrix.dtype == np.float32
+        assert matrix.flags.c_contiguous
+        assert np.allclose(np.linalg.norm(matrix, axis=1), 1.0, atol=1e-6)
+        assert np.array_equal(matrix[0], matrix[2]) and not np.array_equal(matrix[0], matrix[1])
+        assert embedder.embed("beta") == embedder.embed_batch(texts)[1]
+    assert DeterministicEmbedder().embed_matrix([]).shape == (0, 12)
+
+
+def test_embedding_cache_skips_known_texts_and_evicts_lru(tmp_path) -> None:
+    texts = [f"chunk {index}" for index in range(1500)]
+    embedder = CachedEmbedder(DeterministicEmbedder(dimensions=16), EmbeddingCache(tmp_path / "emb"))
+    first = embedder.embed_matrix(texts)
+    assert (embedder.hits, embedder.misses) == (0, 1500)
+    embedder.cache.close()
+
+    reopened = CachedEmbedder(DeterministicEmbedder(dimensions=16), EmbeddingCache(tmp_path / "emb"))
+    again = reopened.embed_matrix(texts[:10] + ["new text"])
+    assert (reopened.hits, reopened.misses) == (10, 1)
+    assert np.array_equal(again[:10], first[:10])
+    assert np.array_equal(again[10], DeterministicEmbedder(dimensions=16).embed_matrix(["new text"])[0])
+
+    other_space = EmbeddingSpace("deterministic", "2", 8)
+    found, _ = reopened.cache.get_many(other_space, texts[:3])
+    assert not found.any()
+
+    small = EmbeddingCache(tmp_path / "small", max_bytes=64 * 10)
+    space = EmbeddingSpace("deterministic", "2", 16)
+    vectors = DeterministicEmbedder(dimensions=16).embed_matrix(texts[:30])
+    small.put_many(space, texts[:10], vectors[:10])
+    small.get_many(space, texts[:2])
+    small.put_many(space, texts[10:15], vectors[10:15])
+    assert len(small) == 10 and small.total_bytes() <= 640
+    found, stored = small.get_many(space, texts[:2] + texts[7:15])
+    assert found.all() and np.array_equal(stored, vectors[[0, 1, *range(7, 15)]])
+    assert not small.get_many(space, texts[2:7])[0].any()
+    small.put_many(space, texts[15:20], vectors[15:20])
+    assert small._path(space).stat().st_size == 1024 * 64
+
+
+def _fill_embedding_cache(root: Path, prefix: str) -> None:
+    cache = EmbeddingCache(root)
+    embedder = DeterministicEmbedder(dimensions=16)
+    space = EmbeddingSpace.of(embedder)
+    for batch in range(100):
+        # Every process also writes the shared texts, racing on the same digests.
+        texts = [f"{name}-{batch}-{index}" for name in ("shared", prefix) for index in range(3)]
+        cache.put_many(space, texts, embedder.embed_matrix(texts))
+    cache.close()
+
+
+def test_embedding_cache_allocates_distinct_slots_across_processes(tmp_path) -> None:
+    prefixes = ["a", "b", "c", "d"]
+    with ProcessPoolExecutor(max_workers=len(prefixes)) as executor:
+        list(executor.map(_fill_embedding_cache, [tmp_path / "emb"] * len(prefixes), prefixes))
+
+    cache = EmbeddingCache(tmp_path / "emb")
+    embedder = DeterministicEmbedder(dimensions=16)
+    texts = [f"{name}-{batch}-{index}" for name in ["shared", *prefixes] for batch in range(100) for index in range(3)]
+    found, vectors = cache.get_many(EmbeddingSpace.of(embedder), texts)
+    assert found.all() and len(cache) == len(texts)
+    assert np.array_equal(vectors, embedder.embed_matrix(texts))
+    (distinct,) = cache._conn.execute("SELECT COUNT(DISTINCT slot) FROM vectors").fetchone()
+    assert distinct == len(texts)
+
+
+def test_process_pool_ingestion_matches_inline_chunking(tmp_path) -> None:
+    rng = random.Random(5)
+    sources = [
+        {"url": f"https://example.com/{index}", "title": f"Doc {index}", "content": " ".join(
+            rng.choice(["kepler", "orbit", "ellipse", "focus", "sweep"]) + f"{rng.randint(0, 99)}"
+            for _ in range(rng.randint(0, 3000))
+        )}
+        for index in range(6)
+    ]
+    keyed = list(zip(build_rag.assign_keys(sources), sources))
+    embedder = build_rag.make_embedder(EmbeddingCache(tmp_path / "inline"))
+    inline = [chunk for key, source in keyed for chunk in build_rag.chunk_source(key, source, embedder)]
+    pooled_embedder = build_rag.make_embedder(EmbeddingCache(tmp_path / "pooled"))
+    built = build_rag._chunk_sources_in_pool(keyed, pooled_embedder, workers=2)
+    pooled = RagIndex.from_records([chunk for key, _ in keyed for chunk in built[key]], meta={}, dimensions=12)
+    expected = RagIndex.from_records(inline, meta={}, dimensions=12)
+    assert pooled.chunks == expected.chunks
+    assert np.array_equal(pooled.embeddings, expected.embeddings)
+    assert len(pooled_embedder.cache) == len({chunk["text"] for chunk in inline})
+
+    warm = build_rag.make_embedder(EmbeddingCache(tmp_path / "inline"))
+    rebuilt = build_rag._chunk_sources_in_pool(keyed, warm, workers=2)
+    replayed = RagIndex.from_records([chunk for key, _ in keyed for chunk in rebuilt[key]], meta={}, dimensions=12)
+    assert replayed.chunks == expected.chunks and np.array_equal(replayed.embeddings, expected.embeddings)
+    assert warm.misses == 0 and warm.hits == len(inline)
+
+    hashing = CachedEmbedder(HashingEmbedder(dimensions=32), EmbeddingCache(tmp_path / "hashing"))
+    hashed = build_rag._chunk_sources_in_pool(keyed, hashing, workers=2)
+    expected_vectors = HashingEmbedder(dimensions=32).embed_matrix([chunk["text"] for chunk in inline])
+    assert np.array_equal(np.stack([chunk["embedding"] for key, _ in keyed for chunk in hashed[key]]), expected_vectors)
+
+    class RemoteEmbedder(DeterministicEmbedder):
+        name = "remote"
+
+    remote = CachedEmbedder(RemoteEmbedder(), EmbeddingCache(tmp_path / "remote"))
+    assert build_rag._chunk_sources_in_pool(keyed, remote, workers=2) == {}
+
+    html = "<html><head><title>Laws</title></head><body><p>" + "area " * 50 + "</p></body></html>"
+    documents = list(iter_ingest([IngestJob(html=html), IngestJob(text="")], chunk_size=20, overlap=5, workers=2))
+    assert documents[0].title == "Laws" and documents[0].word_count == 50
+    assert documents[0].offsets[:, :2].tolist() == [[0, 20], [15, 35], [30, 50], [45, 50]]
+    assert documents[0].chunk(3) == "area area area area area"
+    assert documents[0].vectors.dtype == np.float32 and len(documents[1]) == 0
+
+
+def test_iter_chunks_yields_character_offsets_matching_chunk_text() -> None:
+    text = "  Kepler\tfound\n\nthat planets\u3000sweep equal areas in equal times.  "
+    spans = list(iter_chunks(text, chunk_size=4, overlap=1, prefix="doc"))
+    chunks = chunk_text(text, chunk_size=4, overlap=1, prefix="doc")
+
+    assert [(span.word_start, span.word_end) for span in spans] == [(chunk.start, chunk.end) for chunk in chunks]
+    assert [" ".join(span.text.split()) for span in spans] == [chunk.text for chunk in chunks]
+    assert spans[0].text == "Kepler\tfound\n\nthat planets"
+    assert text[spans[-1].start : spans[-1].end] == "times."
+
+    bounds = [(int(start), int(end)) for starts, ends in _word_bounds(text, block=3) for start, end in zip(starts, ends)]
+    assert [text[start:end] for start, end in bounds] == text.split()
+
+
+def test_chunking_tolerates_lone_surrogates() -> None:
+    text = "abc \ud800 def"
+    chunks = chunk_text(text, chunk_size=2, overlap=0, prefix="p")
+    assert [chunk.text for chunk in chunks] == ["abc \ud800", "def"]
+
+
+def test_incremental_rag_rebuild_reuses_unchanged_sources(tmp_path, monkeypatch) -> None:
+    def source(name: str, words: int) -> dict:
+        return {"url": f"https://example.com/{name}", "title": name, "content": " ".join(f"{name}{i}" for i in range(words))}
+
+    console = Console(quiet=True)
+    cache = EmbeddingCache(tmp_path / "emb")
+    store = ChunkStore(tmp_path / "chunks.sqlite")
+    state = {"session_id": "inc", "artifacts": {"output_dir": {"path": str(tmp_path)}}}
+    state["sources"] = [source("alpha", 2000), source("beta", 1200)]
+    first = build_rag.run(state, console=console, embedding_cache=cache, chunk_store=store)
+    first_ids = [chunk["id"] for chunk in first["rag"]["chunks"]]
+
+    moved = dict(first)
+    moved["sources"] = [source("gamma", 300), *first["sources"]]
+    moved["sources"][2] = {**moved["sources"][2], "title": "Beta (renamed)"}
+    second = build_rag.run(moved, console=console, embedding_cache=cache, chunk_store=store)
+
+    chunks = second["rag"]["chunks"]
+    assert [chunk["id"] for chunk in chunks][-len(first_ids):] == first_ids
+    assert chunks[0]["id"].startswith(build_rag.source_key(moved["sources"][0]))
+    assert {chunk["title"] for chunk in chunks if chunk["source_key"] == first["rag"]["chunks"][-1]["source_key"]} == {
+        "Beta (renamed)"
+    }
+    assert len(cache) == len({chunk["text"] for chunk in chunks})
+
+    # A fresh state only carrying the artifact path still finds the previous index on disk.
+    reloaded = {"artifacts": second["artifacts"], "sources": moved["sources"]}
+    def fail(*args, **kwargs):
+        raise AssertionError("unchanged sources must not be re-chunked")
+
+    monkeypatch.setattr(build_rag, "ingest_document", fail)
+    third = build_rag.run(reloaded, console=console, embedding_cache=cache, chunk_store=store)
+    assert third["rag"]["chunks"] == chunks
+
+
+def test_chunk_store_shares_sources_across_sessions(tmp_path, monkeypatch) -> None:
+    def source(name: str) -> dict:
+        return {"url": f"https://example.com/{name}", "title": name, "content": " ".join(f"{name}{i}" for i in range(1500))}
+
+    console = Console(quiet=True)
+    store = ChunkStore(tmp_path / "chunks.sqlite")
+    cache = EmbeddingCache(tmp_path / "emb")
+    first = build_rag.run(
+        {"session_id": "a", "artifacts": {"output_dir": {"path": str(tmp_path / "a")}}, "sources": [source("x"), source("y")]},
+        console=console,
+        embedding_cache=cache,
+        chunk_store=store,
+    )
+    assert len(store) == len(first["rag"]["chunks"])
+    assert first["rag"]["chunk_ids"] == [chunk["id"] for chunk in first["rag"]["chunks"]]
+
+    ingested: list[str] = []
+    original = build_rag.ingest_document
+
+    def counting(job, **kwargs):
+        ingested.append(job.text[:2])
+        return original(job, **kwargs)
+
+    monkeypatch.setattr(build_rag, "ingest_document", counting)
+    second = build_rag.run(
+        {"session_id": "b", "artifacts": {"output_dir": {"path": str(tmp_path / "b")}}, "sources": [source("y"), source("z"), source("y")]},
+        console=console,
+        embedding_cache=cache,
+        chunk_store=store,
+    )
+    assert ingested == ["z0"]
+    y_chunks = [chunk for chunk in first["rag"]["chunks"] if chunk["title"] == "y"]
+    reused = second["rag"]["chunks"][: len(y_chunks)]
+    assert [chunk["id"] for chunk in reused] == [chunk["id"] for chunk in y_chunks]
+    assert np.array_equal(second["rag"]["embeddings"][: len(y_chunks)], first["rag"]["embeddings"][len(y_chunks) :])
+    assert second["rag"]["chunk_ids"][-1].startswith(build_rag.source_key(source("y")) + "-1_")
+
+    # A later session carrying only chunk ids resolves them through the store.
+    embedder = build_rag.make_embedder(cache)
+    slim = {"rag": {"chunk_ids": second["rag"]["chunk_ids"], "meta": second["rag"]["meta"]}}
+    grouped = build_rag.previous_chunks(slim, embedder, store=store)
+    assert sum(len(records) for records in grouped.values()) == len(second["rag"]["chunk_ids"])
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+from dataclasses import replace
+
+import numpy as np
+import pytest
+from rich.console import Console
+
+from keplermind.app.config.settings import settings
+from keplermind.app.mcp.controller import MemoryController
+from keplermind.app.mcp.stores import EpisodicLog, PreferenceStore, SemanticStore
+from keplermind.app.nodes import build_rag, explain
+from keplermind.app.tools.ann import IVFIndex
+from keplermind.app.tools.bm25 import BM25Index, reciprocal_rank_fusion
+from keplermind.app.tools.chunk_store import ChunkStore
+from keplermind.app.tools.embed import DeterministicEmbedder
+from keplermind.app.tools.embed_cache import EmbeddingCache
+from keplermind.app.tools.quantize import Int8Vectors, PQVectors, QuantizedVectors, load_quantized
+from keplermind.app.tools.retrieve import Retriever, load_ann, load_bm25, select_top_k
+
+
+def _unit(rows: np.ndarray) -> np.ndarray:
+    return (rows / np.linalg.norm(rows, axis=1, keepdims=True)).astype(np.float32)
+
+
+def test_batched_top_k_matches_brute_force_and_mmr_diversifies() -> None:
+    rng = np.random.default_rng(0)
+    embeddings = _unit(rng.normal(size=(500, 16)))
+    retriever = Retriever(embeddings, [{"id": f"c{row}"} for row in range(500)])
+    queries = _unit(rng.normal(size=(7, 16)))
+
+    hits = retriever.search_vectors(queries, top_k=5)
+    expected = np.argsort(-(queries @ embeddings.T), axis=1)[:, :5]
+    assert [[hit.row for hit in row] for row in hits] == expected.tolist()
+    assert all(row[0].score >= row[-1].score for row in hits)
+
+    indices, _ = select_top_k(np.array([[0.1, 0.9, 0.5]]), 10)
+    assert indices.tolist() == [[1, 2, 0]]
+
+    # Ten copies of the best match: plain top-k returns them all, MMR keeps one.
+    duplicated = np.vstack([np.repeat(queries[:1], 10, axis=0), embeddings])
+    dup_retriever = Retriever(duplicated, [{"id": row} for row in range(len(duplicated))])
+    plain = [hit.row for hit in dup_retriever.search_vectors(queries[:1], top_k=3)[0]]
+    diverse = [hit.row for hit in dup_retriever.search_vectors(queries[:1], top_k=3, diversity=0.7)[0]]
+    assert all(row < 10 for row in plain)
+    assert sum(row < 10 for row in diverse) == 1 and diverse[0] < 10
+
+
+def test_nodes_and_memory_controller_use_the_rag_index(tmp_path) -> None:
+    console = Console(quiet=True)
+    state = {
+        "session_id": "retrieve",
+        "artifacts": {"output_dir": {"path": str(tmp_path)}},
+        "sources": [
+            {"url": f"https://example.com/{name}", "title": f"Paper {name}", "content": f"{name} " * 300}
+            for name in ("A", "B", "C", "D")
+        ],
+        "profile": {"skills": [{"name": "Foundations", "gap": 0.2, "summary": "solid"}]},
+    }
+    state = build_rag.run(
+        state,
+        console=console,
+        embedding_cache=EmbeddingCache(tmp_path / "embedding_cache"),
+        chunk_store=ChunkStore(tmp_path / "chunks.sqlite"),
+    )
+
+    reopened = Retriever.from_state({"artifacts": state["artifacts"]})
+    assert reopened is not None and len(reopened) == len(state["rag"]["chunks"])
+    query_hits = reopened.search("Foundations solid", top_k=2)
+    assert [hit.row for hit in query_hits] == [hit.row for hit in Retriever.from_state(state).search("Foundations solid", top_k=2)]
+
+    explained = explain.run(state, console=console)
+    cited = explained["explanations"]["Foundations"].rsplit("Sources ", 1)[1]
+    assert query_hits[0].chunk["title"] in cited
+
+    controller = MemoryController(
+        episodic_log=EpisodicLog(db_path=tmp_path / "events.sqlite"),
+        semantic_store=SemanticStore(),
+        preference_store=PreferenceStore(json_path=tmp_path / "prefs.json"),
+    )
+    memories = controller.retrieve(limit=3, query="Foundations", retriever=reopened)
+    assert len(memories) == 3
+    assert {memory["metadata"]["type"] for memory in memories} == {"rag"}
+
+
+def test_ivf_index_recall_incremental_add_and_persistence(tmp_path) -> None:
+    rng = np.random.default_rng(1)
+    centres = _unit(rng.normal(size=(20, 32)))
+    vectors = _unit(centres[rng.integers(0, 20, size=4000)] + 0.3 * rng.normal(size=(4000, 32)))
+    queries = _unit(centres[rng.integers(0, 20, size=50)] + 0.3 * rng.normal(size=(50, 32)))
+    exact = np.argsort(-(queries @ vectors.T), axis=1)[:, :10]
+
+    index = IVFIndex.build(vectors[:3000], nlist=32, nprobe=4)
+    index.add(vectors[3000:])
+    assert len(index) == 4000
+
+    full, _ = index.search(queries, top_k=10, nprobe=index.nlist)
+    assert np.array_equal(full, exact)
+    approx, _ = index.search(queries, top_k=10)
+    recall = np.mean([len(set(a) & set(b)) / 10 for a, b in zip(approx, exact)])
+    assert recall > 0.8
+
+    index.save(tmp_path / "rag_index" / "ivf")
+    (tmp_path / "rag_index" / "manifest.json").write_text("{}", encoding="utf-8")
+    reopened = load_ann(tmp_path / "rag_index" / "manifest.json")
+    assert reopened is not None and isinstance(reopened._vectors, np.memmap)
+    assert np.array_equal(reopened.search(queries, top_k=10)[0], approx)
+
+    retriever = Retriever(vectors, [{"id": row} for row in range(4000)], ann=reopened, nprobe=index.nlist)
+    assert [hit.row for hit in retriever.search_vectors(queries[:1], top_k=10)[0]] == exact[0].tolist()
+
+
+def test_ivf_over_deterministic_embeddings_pads_missing_results() -> None:
+    vectors = DeterministicEmbedder(dimensions=16).embed_matrix([f"text {index}" for index in range(300)])
+    index = IVFIndex.build(vectors, nlist=30, nprobe=1)
+    ids, scores = index.search(vectors[:2], top_k=200)
+    assert ids[0, 0] == 0 and ids[1, 0] == 1
+    assert (ids == -1).any() and np.isneginf(scores[ids == -1]).all()
+
+
+def test_bm25_postings_scoring_and_persistence(tmp_path) -> None:
+    texts = [
+        "gradient descent converges slowly",
+        "stochastic gradient descent with momentum and gradient clipping",
+        "transformers use attention",
+        "",
+    ]
+    index = BM25Index.from_texts(texts)
+    assert index.offsets[-1] == len(index.doc_ids) == len(index.tfs)
+    gradient = index.vocabulary["gradient"]
+    start, end = index.offsets[gradient], index.offsets[gradient + 1]
+    assert index.doc_ids[start:end].tolist() == [0, 1] and index.tfs[start:end].tolist() == [1, 2]
+
+    ids, scores = index.search("Gradient clipping", top_k=5)
+    assert ids.tolist() == [1, 0] and scores[0] > scores[1] > 0
+    assert index.search("unknown words", top_k=5)[0].size == 0
+
+    index.save(tmp_path / "bm25")
+    reopened = load_bm25(tmp_path)
+    assert reopened is not None
+    assert np.array_equal(reopened.scores("gradient attention"), index.scores("gradient attention"))
+
+    assert reciprocal_rank_fusion([[3, 1, 2], [1, 4]], k=60)[0][0] == 1
+
+
+def test_hybrid_search_fuses_lexical_and_vector_rankings(tmp_path) -> None:
+    console = Console(quiet=True)
+    state = {
+        "session_id": "hybrid",
+        "artifacts": {"output_dir": {"path": str(tmp_path)}},
+        "sources": [
+            {"url": f"https://example.com/{name}", "title": name, "content": f"{name} filler " * 40}
+            for name in ("alpha", "beta", "gamma", "delta", "epsilon")
+        ],
+    }
+    state = build_rag.run(
+        state,
+        console=console,
+        embedding_cache=EmbeddingCache(tmp_path / "embedding_cache"),
+        chunk_store=ChunkStore(tmp_path / "chunks.sqlite"),
+    )
+    assert (tmp_path / "rag_index" / "bm25" / "manifest.json").exists()
+    assert len(state["rag"]["bm25"]) == len(state["rag"]["chunks"])
+
+    reopened = Retriever.from_state({"artifacts": state["artifacts"]})
+    assert reopened is not None and reopened.bm25 is not None
+
+    # Hash embeddings know nothing about words; BM25 pulls the lexical match up.
+    hybrid = reopened.search("gamma", top_k=3)
+    assert hybrid[0].chunk["title"] == "gamma"
+    vector_only = reopened.search("gamma", top_k=3, hybrid=False)
+    assert [hit.row for hit in vector_only] == [hit.row for hit in reopened.search_vectors(reopened.embedder.embed_matrix(["gamma"]), top_k=3)[0]]
+
+    diverse = reopened.search("gamma filler", top_k=3, diversity=0.5)
+    assert len({hit.row for hit in diverse}) == 3
+
+
+def test_quantized_stores_shrink_vectors_and_rerank_exactly(tmp_path) -> None:
+    rng = np.random.default_rng(3)
+    centres = rng.normal(size=(40, 32))
+    embeddings = _unit(centres[rng.integers(0, 40, size=4000)] + 0.4 * rng.normal(size=(4000, 32)))
+    queries = _unit(embeddings[:20] + 0.05 * rng.normal(size=(20, 32)))
+    truth = np.argsort(-(queries @ embeddings.T), axis=1)[:, :10]
+
+    def recall(ids: np.ndarray) -> float:
+        return float(np.mean([len(set(row) & set(expected)) / 10 for row, expected in zip(ids.tolist(), truth.tolist())]))
+
+    int8 = Int8Vectors.from_vectors(embeddings)
+    pq = PQVectors.from_vectors(embeddings, subspaces=8)
+    assert int8.nbytes < embeddings.nbytes / 3 and pq.codes.nbytes == 8 * len(embeddings)
+    assert np.abs(int8.decode() - embeddings).max() < 0.01
+
+    assert recall(int8.search(queries, top_k=10)[0]) >= 0.9
+    reranked, scores = pq.search(queries, top_k=10, exact=embeddings, rerank=200)
+    assert recall(reranked) > recall(pq.search(queries, top_k=10)[0])
+    assert recall(reranked) >= 0.9
+    assert np.allclose(scores, np.take_along_axis(queries @ embeddings.T, reranked, axis=1), atol=1e-5)
+
+    pq.save(tmp_path / "pq")
+    reopened = load_quantized(tmp_path / "pq")
+    assert isinstance(reopened, PQVectors) and np.array_equal(reopened.search(queries, top_k=10)[0], pq.search(queries, top_k=10)[0])
+
+    retriever = Retriever(embeddings, [{"id": row} for row in range(len(embeddings))], quantized=int8)
+    hits = retriever.search_vectors(queries[:1], top_k=3)[0]
+    assert [hit.row for hit in hits] == truth[0, :3].tolist()
+
+
+def test_quantized_store_subclasses_must_implement_scoring() -> None:
+    class Partial(QuantizedVectors):
+        kind = "partial"
+
+        def add(self, vectors: np.ndarray) -> None:
+            pass
+
+    with pytest.raises(TypeError):
+        Partial(8)
+
+
+def test_build_rag_persists_quantized_codes_when_enabled(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(build_rag, "settings", replace(settings, rag=replace(settings.rag, quantization="int8")))
+    state = {
+        "session_id": "quantized",
+        "artifacts": {"output_dir": {"path": str(tmp_path)}},
+        "sources": [{"url": "https://example.com/q", "title": "Q", "content": "word " * 2000}],
+    }
+    state = build_rag.run(
+        state,
+        console=Console(quiet=True),
+        embedding_cache=EmbeddingCache(tmp_path / "embedding_cache"),
+        chunk_store=ChunkStore(tmp_path / "chunks.sqlite"),
+    )
+    assert isinstance(state["rag"]["quantized"], Int8Vectors)
+
+    reopened = Retriever.from_state({"artifacts": state["artifacts"]})
+    assert reopened is not None and isinstance(reopened.quantized, Int8Vectors)
+    assert len(reopened.quantized) == len(state["rag"]["chunks"])
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import codecs
+import hashlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from keplermind.app.tools import scrape as scrape_module
+from keplermind.app.tools.fetch import HttpFetcher
+from keplermind.app.tools.scrape import (
+    ScrapeResult,
+    _make_extractor,
+    _resolve_engine,
+    extract_text,
+    scrape,
+    scrape_many,
+)
+from keplermind.app.tools.scrape_cache import ScrapeCache
+
+
+def test_scrape_many_preserves_order_and_host_limit() -> None:
+    lock = threading.Lock()
+    active: dict[str, int] = {}
+    peak: dict[str, int] = {}
+
+    def fetcher(url: str) -> str:
+        host = url.split("/")[2]
+        with lock:
+            active[host] = active.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), active[host])
+        # Later URLs finish first so completion order differs from input order.
+        time.sleep(0.005 * (10 - int(url.rsplit("/", 1)[-1])))
+        with lock:
+            active[host] -= 1
+        return f"<html><body><p>Document {url}</p></body></html>"
+
+    targets = [(f"https://host{index % 2}.example.com/{index}", None) for index in range(10)]
+
+    sequential = scrape_many(targets, fetcher=fetcher, max_workers=1)
+    concurrent = scrape_many(targets, fetcher=fetcher, max_workers=8, per_host=2)
+
+    assert [result.url for result in concurrent] == [url for url, _ in targets]
+    assert concurrent == sequential
+    assert max(peak.values()) <= 2
+
+
+def _serve(pages: dict[str, str | bytes]):
+    log: list[tuple[str, int, int]] = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:  # noqa: N802 - http.server naming
+            page = pages[self.path]
+            # Raw bytes are served without a charset so the fetcher has to sniff it.
+            body = page if isinstance(page, bytes) else page.encode("utf-8")
+            etag = '"' + hashlib.sha256(body).hexdigest()[:12] + '"'
+            status = 304 if self.headers.get("If-None-Match") == etag else 200
+            log.append((self.path, status, self.client_address[1]))
+            self.send_response(status)
+            self.send_header("ETag", etag)
+            content_type = "application/pdf" if self.path.endswith(".pdf") else "text/html; charset=utf-8"
+            if isinstance(page, bytes):
+                content_type = "text/html"
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", "0" if status == 304 else str(len(body)))
+            self.end_headers()
+            if status == 200:
+                self.wfile.write(body)
+
+        def log_message(self, *args: object) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, log
+
+
+def test_http_fetcher_reuses_connection_and_revalidates() -> None:
+    server, log = _serve({"/page": "<html><head><title>Orbit</title></head><body><p>Kepler laws</p></body></html>"})
+    url = f"http://127.0.0.1:{server.server_address[1]}/page"
+    fetcher = HttpFetcher()
+    try:
+        first = scrape(url, fetcher=fetcher)
+        second = scrape(url, fetcher=fetcher)
+    finally:
+        fetcher.close()
+        server.shutdown()
+
+    assert first == second
+    assert "Kepler laws" in first.text
+    assert [status for _, status, _ in log] == [200, 304]
+    assert len({port for _, _, port in log}) == 1
+
+
+def test_http_fetcher_sniffs_charset_when_header_has_none() -> None:
+    prose = "Le café où Kepler étudiait les orbites elliptiques était très fréquenté. " * 20
+    body = f"<html><body><p>{prose}</p></body></html>"
+    declared = body.replace("<body>", '<head><meta charset="windows-1252"><title>Été</title></head><body>')
+    server, _ = _serve(
+        {
+            "/meta": declared.encode("cp1252"),
+            "/bare": body.encode("latin-1"),
+            "/bom": codecs.BOM_UTF8 + body.encode("utf-8"),
+        }
+    )
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    fetcher = HttpFetcher(chunk_bytes=256)
+    try:
+        pages = {path: fetcher(f"{base}{path}") for path in ("/meta", "/bare", "/bom")}
+    finally:
+        fetcher.close()
+        server.shutdown()
+
+    for text in pages.values():
+        assert "café où Kepler étudiait" in text and "\ufffd" not in text
+    assert "<title>Été</title>" in pages["/meta"]
+    assert pages["/bom"].startswith("<html>")
+
+
+def test_scrape_cache_serves_repeats_and_remembers_failures(tmp_path) -> None:
+    cache = ScrapeCache(tmp_path / "cache", negative_ttl=60)
+    calls: list[str] = []
+
+    def fetcher(url: str) -> str:
+        calls.append(url)
+        if "broken" in url:
+            raise OSError("connection refused")
+        return "<html><head><title>Orbits</title></head><body><p>Ellipses everywhere</p></body></html>"
+
+    first = scrape("https://Example.com/page?utm_source=x#top", fetcher=fetcher, cache=cache)
+    second = scrape("https://example.com:443/page", fetcher=fetcher, cache=cache)
+    assert calls == ["https://Example.com/page?utm_source=x#top"]
+    assert second.text == first.text == "Ellipses everywhere"
+    assert "Ellipses" in (cache.raw_html("https://example.com/page") or "")
+
+    for _ in range(2):
+        fallback = scrape("https://example.com/broken", fetcher=fetcher, cache=cache, fallback_text="snippet")
+        assert fallback.text == "snippet"
+    assert calls.count("https://example.com/broken") == 1
+    assert cache.get("https://example.com/broken") is None
+
+
+def test_scrape_cache_evicts_least_recently_used(tmp_path) -> None:
+    cache = ScrapeCache(tmp_path / "cache", max_bytes=250)
+    for index in range(3):
+        text = f"{index} " + "x" * 100
+        cache.put(f"https://example.com/{index}", ScrapeResult(f"https://example.com/{index}", "t", text, 2))
+        if index == 1:
+            assert cache.get("https://example.com/0") is not None
+
+    assert cache.get("https://example.com/1") is None
+    assert cache.get("https://example.com/0") is not None
+    assert cache.get("https://example.com/2") is not None
+    assert cache.total_bytes() <= 250
+
+    cache.put("https://example.com/short", ScrapeResult("https://example.com/short", "t", "gone", 1), ttl=-1)
+    assert cache.get("https://example.com/short") is None
+
+
+def test_scrape_cache_counts_shared_blobs_once_and_keys_by_engine(tmp_path) -> None:
+    cache = ScrapeCache(tmp_path / "cache")
+    markup = "<html><body><p>" + " ".join(f"orbit{index}" for index in range(400)) + "</p></body></html>"
+    for index in range(3):
+        url = f"https://mirror{index}.example.com/page"
+        cache.put(url, ScrapeResult(url, "t", "text", 1), markup, engine="lxml")
+    blobs = list((tmp_path / "cache" / "blobs").rglob("*.gz"))
+    assert len(blobs) == 1
+    assert cache.total_bytes() == 3 * len("text") + blobs[0].stat().st_size
+
+    cache.put("https://mirror0.example.com/page", ScrapeResult("https://mirror0.example.com/page", "t", "text", 1))
+    assert blobs[0].exists() and cache.total_bytes() == 3 * len("text") + blobs[0].stat().st_size
+
+    assert cache.get("https://mirror1.example.com/page", engine="lxml") is not None
+    assert cache.get("https://mirror1.example.com/page", engine="readability") is None
+    assert cache.get("https://mirror1.example.com/page") is not None
+
+    for index in (1, 2):
+        url = f"https://mirror{index}.example.com/page"
+        cache.put(url, ScrapeResult(url, "t", "text", 1))
+    assert not blobs[0].exists() and cache.total_bytes() == 3 * len("text")
+
+
+def test_streaming_fetch_caps_bytes_and_rejects_binary() -> None:
+    filler = "".join(f"<p>word{index}</p>" for index in range(5000))
+    page = f"<html><head><title>Big Page</title><script>var x = 1;</script></head><body>{filler}</body></html>"
+    server, _ = _serve({"/big": page, "/paper.pdf": "%PDF-1.4"})
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    fetcher = HttpFetcher(max_bytes=4096, chunk_bytes=512)
+    try:
+        result = scrape(f"{base}/big", fetcher=fetcher)
+        fallback = scrape(f"{base}/paper.pdf", fetcher=fetcher, fallback_text="pdf snippet")
+    finally:
+        fetcher.close()
+        server.shutdown()
+
+    assert result.title == "Big Page"
+    assert result.text.startswith("word0 word1")
+    assert "var x" not in result.text
+    assert 0 < result.word_count < 5000
+    assert fallback.text == "pdf snippet"
+
+
+def test_extraction_engines_skip_boilerplate_and_stitch_chunks() -> None:
+    page = (
+        "<html><head><title>Kepler  Laws</title><style>p { color: red }</style></head><body>"
+        "<nav>Home About</nav><p>Planets move in ellipses</p><script>track()</script>"
+        "<p>Equal areas &amp; times</p><footer>Copyright</footer></body></html>"
+    )
+
+    assert extract_text(page, engine="lxml") == ("Kepler Laws", "Planets move in ellipses Equal areas & times")
+    title, text = extract_text(page, engine="html.parser")
+    assert title == "Kepler Laws"
+    assert "track" not in text and "color" not in text and "Equal areas & times" in text
+
+    for engine in ("lxml", "html.parser"):
+        extractor = _make_extractor(engine)
+        for offset in range(0, len(page), 7):
+            extractor.feed(page[offset : offset + 7])
+        extractor.close()
+        assert "Planets move in ellipses" in extractor.text()
+
+
+def test_auto_engine_prefers_readability_when_installed(monkeypatch) -> None:
+    monkeypatch.setattr(scrape_module, "Document", object)
+    assert _resolve_engine("auto") == _resolve_engine("readability") == "readability"
+    assert _resolve_engine("lxml") == "lxml"
+
+    monkeypatch.setattr(scrape_module, "Document", None)
+    assert _resolve_engine("auto") == _resolve_engine("readability") == "lxml"
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import time
+
+from keplermind.app.tools import search as search_module
+from keplermind.app.tools.search import LatencyTracker, SearchResult, iter_search, search
+from keplermind.app.tools.search_cache import SearchCache
+
+
+def test_search_cache_hits_and_revalidates_stale_entries(tmp_path, monkeypatch) -> None:
+    calls: list[str] = []
+
+    def fake_duckduckgo(query: str, *, max_results: int) -> list[SearchResult]:
+        calls.append(query)
+        return [
+            SearchResult(title=f"{query} v{len(calls)}", url=f"https://ddg.example.com/{index}", snippet="s", backend="duckduckgo")
+            for index in range(max_results)
+        ]
+
+    monkeypatch.setattr(search_module, "_duckduckgo", fake_duckduckgo)
+
+    cache = SearchCache(tmp_path / "search.sqlite", ttl=60)
+    first = search("Orbital Mechanics", max_results=3, backend_preference="duckduckgo", cache=cache)
+    second = search("Orbital  Mechanics", max_results=3, backend_preference="duckduckgo", cache=cache)
+    assert second == first
+    assert len(calls) == 1
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+    cache.ttl = 0
+    stale = search("Orbital Mechanics", max_results=3, backend_preference="duckduckgo", cache=cache)
+    assert stale == first
+    cache.wait_for_refreshes(timeout=5)
+    assert len(calls) == 2
+    assert cache.stats.stale_hits == 1 and cache.stats.refreshes == 1
+
+    cache.ttl = 60
+    refreshed = search("Orbital Mechanics", max_results=3, backend_preference="duckduckgo", cache=cache)
+    assert refreshed[0].title.endswith("v2")
+    cache.close()
+
+
+def _slow_backends(monkeypatch, delays: dict[str, float]) -> None:
+    def make(name: str):
+        def backend(query: str, *, max_results: int) -> list[SearchResult]:
+            time.sleep(delays[name])
+            # Index 0 is served by both backends so merging has something to de-duplicate.
+            return [
+                SearchResult(
+                    title=f"{name} {index}",
+                    url=f"https://shared.example.com/{name if index else 'common'}/{index}",
+                    snippet="s",
+                    backend=name,
+                )
+                for index in range(max_results)
+            ]
+
+        return backend
+
+    monkeypatch.setenv("TAVILY_API_KEY", "test")
+    monkeypatch.setattr(search_module, "_tavily", make("tavily"))
+    monkeypatch.setattr(search_module, "_duckduckgo", make("duckduckgo"))
+
+
+def test_hedged_search_fires_fallback_when_preferred_is_slow(monkeypatch) -> None:
+    _slow_backends(monkeypatch, {"tavily": 0.5, "duckduckgo": 0.01})
+    tracker = LatencyTracker()
+    monkeypatch.setattr(search_module, "LATENCY", tracker)
+
+    started = time.perf_counter()
+    results = search("Kepler", max_results=3, backend_preference="tavily", hedge=True, hedge_delay=0.05)
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.4
+    assert {result.backend for result in results} == {"duckduckgo"}
+
+    merged = search("Kepler", max_results=5, backend_preference="tavily", hedge=True, hedge_delay=0.05, merge=True)
+    urls = [result.url for result in merged]
+    assert merged[0].backend == "tavily"
+    assert len(urls) == len(set(urls)) == 5
+
+    time.sleep(0.6)
+    snapshot = tracker.snapshot()
+    assert snapshot["tavily"]["samples"] >= 1 and snapshot["duckduckgo"]["samples"] >= 1
+    assert tracker.hedge_delay("duckduckgo", default=1.0) < 1.0
+
+
+def test_iter_search_hedges_and_merges_like_search(tmp_path, monkeypatch) -> None:
+    _slow_backends(monkeypatch, {"tavily": 0.5, "duckduckgo": 0.01})
+    monkeypatch.setattr(search_module, "LATENCY", LatencyTracker())
+
+    started = time.perf_counter()
+    streamed = list(iter_search("Kepler", max_results=3, backend_preference="tavily", hedge=True, hedge_delay=0.05))
+    assert time.perf_counter() - started < 0.4
+    assert {result.backend for result in streamed} == {"duckduckgo"}
+
+    options = {"max_results": 5, "backend_preference": "tavily", "hedge": True, "hedge_delay": 0.05, "merge": True}
+    cache = SearchCache(tmp_path / "search.sqlite", ttl=60)
+    merged = list(iter_search("Kepler", cache=cache, **options))
+    assert merged == search("Kepler", **options)
+    assert list(iter_search("Kepler", cache=cache, **options)) == merged